@@ -0,0 +1,422 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("razorpayx-benchmark-webhooks")
+@click.option(
+    "--config", "razorpayx_config", required=True, help="RazorpayX Configuration"
+)
+@click.option(
+    "--event",
+    "events",
+    multiple=True,
+    help="Webhook event to replay (Ex. payout.processed). Can be repeated.",
+)
+@click.option("--iterations", default=100, help="Payloads replayed per event")
+@click.option("--payment-entry", help="Payment Entry referred in the payloads")
+@click.option(
+    "--via-queue",
+    is_flag=True,
+    default=False,
+    help="Process in background workers to measure queue lag",
+)
+@click.option("--output", type=click.Path(), help="Save results as JSON")
+@click.option("--baseline", type=click.Path(exists=True), help="Baseline JSON")
+@click.option(
+    "--threshold",
+    default=0.2,
+    help="Allowed p95 slowdown against the baseline (0.2 = 20%)",
+)
+@pass_context
+def benchmark_webhooks(
+    context,
+    razorpayx_config,
+    events,
+    iterations,
+    payment_entry,
+    via_queue,
+    output,
+    baseline,
+    threshold,
+):
+    """
+    Benchmark RazorpayX webhook ingestion on a test site.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.benchmarks.webhook import (
+        WebhookBenchmark,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+
+    try:
+        results = WebhookBenchmark(
+            razorpayx_config,
+            events,
+            iterations,
+            payment_entry=payment_entry,
+            via_queue=via_queue,
+        ).run()
+    finally:
+        frappe.destroy()
+
+    report_results(results, output, baseline, threshold)
+
+
+def print_results(results: dict):
+    for group, stages in results.items():
+        click.secho(group, fg="blue", bold=True)
+
+        for stage, summary in stages.items():
+            values = " | ".join(
+                f"{key}: {value}" for key, value in summary.items() if key != "count"
+            )
+            click.echo(f"  {stage:<20} n={summary.get('count', 0):<6} {values}")
+
+
+@click.command("razorpayx-benchmark-party-names")
+@click.option("--iterations", default=10_000, help="Party names to sanitize")
+@click.option("--unique", default=500, help="Unique party names among them")
+@click.option("--output", type=click.Path(), help="Save results as JSON")
+@click.option("--baseline", type=click.Path(exists=True), help="Baseline JSON")
+@click.option(
+    "--threshold",
+    default=0.2,
+    help="Allowed p95 slowdown against the baseline (0.2 = 20%)",
+)
+def benchmark_party_names(iterations, unique, output, baseline, threshold):
+    """
+    Benchmark party name sanitization for RazorpayX contacts.
+    """
+    from razorpayx_integration.razorpayx_integration.benchmarks.party_name import (
+        benchmark_sanitize_party_name,
+    )
+
+    results = benchmark_sanitize_party_name(iterations, unique)
+    report_results(results, output, baseline, threshold)
+
+
+def report_results(results: dict, output: str, baseline: str, threshold: float):
+    from razorpayx_integration.razorpayx_integration.benchmarks.utils import (
+        find_regressions,
+        load_results,
+        save_results,
+    )
+
+    print_results(results)
+
+    if output:
+        save_results(output, results)
+
+    if not baseline:
+        return
+
+    if regressions := find_regressions(results, load_results(baseline), threshold):
+        click.secho("Regressions found:", fg="bright_red")
+
+        for regression in regressions:
+            click.secho(f"  - {regression}", fg="red")
+
+        raise SystemExit(1)
+
+    click.secho("No regressions found.", fg="green")
+
+
+@click.command("razorpayx-replay-failed-webhooks")
+@click.option("--event", help="Replay only given event (Ex. payout.processed)")
+@click.option("--error-class", help="Replay only webhooks failed with given error")
+@click.option("--max-parallel-jobs", default=8, help="Jobs replaying concurrently")
+@pass_context
+def replay_failed_webhooks(context, event, error_class, max_parallel_jobs):
+    """
+    Replay failed RazorpayX webhooks from the dead-letter queue.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.doctype.razorpayx_failed_webhook.razorpayx_failed_webhook import (
+        replay_failed_webhooks,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        count = replay_failed_webhooks(
+            event=event,
+            error_class=error_class,
+            max_parallel_jobs=max_parallel_jobs,
+        )
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+    click.secho(f"{count} webhooks are queued for replay.", fg="green")
+
+
+@click.command("razorpayx-register-fund-accounts")
+@click.option(
+    "--config", "razorpayx_config", required=True, help="RazorpayX Configuration"
+)
+@click.option(
+    "--party-type",
+    "party_types",
+    multiple=True,
+    help="Party Type to register (Default: Supplier and Employee). Can be repeated.",
+)
+@click.option("--max-parallel-jobs", default=4, help="Jobs registering concurrently")
+@click.option(
+    "--requests-per-second", default=10.0, help="RazorpayX API requests per second"
+)
+@pass_context
+def register_fund_accounts(
+    context, razorpayx_config, party_types, max_parallel_jobs, requests_per_second
+):
+    """
+    Register parties' contacts and fund accounts in RazorpayX ahead of payouts.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.utils.fund_account import (
+        register_party_fund_accounts,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        count = register_party_fund_accounts(
+            razorpayx_config,
+            party_types=list(party_types) or None,
+            max_parallel_jobs=max_parallel_jobs,
+            requests_per_second=requests_per_second,
+        )
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+    click.secho(f"{count} accounts are queued for registration.", fg="green")
+
+
+@click.command("razorpayx-sync-fund-accounts")
+@click.option(
+    "--config", "razorpayx_config", required=True, help="RazorpayX Configuration"
+)
+@click.option(
+    "--from-date", help="Created on or after (Default: creation of configuration)"
+)
+@click.option("--to-date", help="Created on or before (Default: today)")
+@pass_context
+def sync_fund_accounts(context, razorpayx_config, from_date, to_date):
+    """
+    Sync contacts and fund accounts in RazorpayX to RazorpayX Party Fund Accounts.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.utils.fund_account import (
+        sync_fund_accounts,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        result = sync_fund_accounts(razorpayx_config, from_date, to_date)
+    finally:
+        frappe.destroy()
+
+    click.secho(
+        "{synced} accounts are synced ({inserted} new, {updated} updated, "
+        "{removed} removed) from {contacts} contacts and {fund_accounts} "
+        "fund accounts.".format(
+            **{key: value for key, value in result.items() if key != "duplicates"}
+        ),
+        fg="green",
+    )
+
+    if result["duplicates"]:
+        click.secho(
+            "Duplicate fund accounts (older ones of the same party account): "
+            + ", ".join(result["duplicates"]),
+            fg="yellow",
+        )
+
+
+@click.command("razorpayx-rebuild-payout-summary")
+@click.option("--company", help="Rebuild summaries of given company only")
+@click.option("--from-date", help="Starting posting date (YYYY-MM-DD)")
+@click.option("--to-date", help="Ending posting date (YYYY-MM-DD)")
+@pass_context
+def rebuild_payout_summary(context, company, from_date, to_date):
+    """
+    Rebuild RazorpayX Payout Summaries from Payment Entries.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+        rebuild_payout_summary,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        rebuild_payout_summary(company, from_date, to_date)
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+    click.secho("RazorpayX Payout Summaries are rebuilt.", fg="green")
+
+
+@click.command("razorpayx-stub-server")
+@click.option("--host", default="localhost", help="Host to bind")
+@click.option("--port", default=8787, help="Port to bind")
+@click.option("--fixtures", type=click.Path(exists=True), help="Fixtures JSON")
+@click.option("--generate", default=0, help="Synthetic items per collection")
+@click.option("--latency", default=0.0, help="Mean latency per request (ms)")
+@click.option("--error-rate", default=0.0, help="Fraction of requests to fail")
+@click.option("--seed", default=0, help="Seed for ids, latency and errors")
+def stub_server(host, port, fixtures, generate, latency, error_rate, seed):
+    """
+    Run the offline RazorpayX API stub server.
+    """
+    from razorpayx_integration.razorpayx_integration.benchmarks.stub_server import (
+        DEFAULT_FIXTURES,
+        StubServer,
+        StubState,
+    )
+
+    server = StubServer(
+        StubState.from_fixtures(fixtures or DEFAULT_FIXTURES, generate, seed),
+        host=host,
+        port=port,
+        latency=latency,
+        error_rate=error_rate,
+    )
+
+    click.secho(f"RazorpayX stub server is running at {server.base_url}", fg="green")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+@click.command("razorpayx-record-stub-fixtures")
+@click.option(
+    "--config", "razorpayx_config", required=True, help="RazorpayX Configuration"
+)
+@click.option("--output", required=True, type=click.Path(), help="Fixtures JSON")
+@click.option("--count", default=100, help="Items to record per collection")
+@pass_context
+def record_stub_fixtures(context, razorpayx_config, output, count):
+    """
+    Record the latest RazorpayX account data as stub server fixtures.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.benchmarks.stub_server import (
+        record_fixtures,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        record_fixtures(razorpayx_config, output, count)
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+    click.secho(f"Fixtures are recorded in {output}.", fg="green")
+
+
+@click.command("razorpayx-benchmark-api")
+@click.option(
+    "--config", "razorpayx_config", required=True, help="RazorpayX Configuration"
+)
+@click.option("--iterations", default=10, help="Runs per stage")
+@click.option("--fixtures", type=click.Path(exists=True), help="Fixtures JSON")
+@click.option("--generate", default=1000, help="Synthetic items per collection")
+@click.option("--latency", default=50.0, help="Mean stub latency per request (ms)")
+@click.option("--error-rate", default=0.0, help="Fraction of requests to fail")
+@click.option("--output", type=click.Path(), help="Save results as JSON")
+@click.option("--baseline", type=click.Path(exists=True), help="Baseline JSON")
+@click.option(
+    "--threshold",
+    default=0.2,
+    help="Allowed p95 slowdown against the baseline (0.2 = 20%)",
+)
+@pass_context
+def benchmark_api(
+    context,
+    razorpayx_config,
+    iterations,
+    fixtures,
+    generate,
+    latency,
+    error_rate,
+    output,
+    baseline,
+    threshold,
+):
+    """
+    Benchmark RazorpayX API classes against the in-process stub server.
+    """
+    import frappe
+
+    from razorpayx_integration.razorpayx_integration.benchmarks.api import (
+        APIBenchmark,
+    )
+    from razorpayx_integration.razorpayx_integration.benchmarks.stub_server import (
+        DEFAULT_FIXTURES,
+        run_stub_server,
+    )
+
+    server = run_stub_server(
+        fixtures or DEFAULT_FIXTURES,
+        port=0,
+        latency=latency,
+        error_rate=error_rate,
+        generate=generate,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    try:
+        results = APIBenchmark(razorpayx_config, iterations, server.base_url).run()
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+        server.shutdown()
+
+    report_results(results, output, baseline, threshold)
+
+
+commands = [
+    benchmark_webhooks,
+    benchmark_party_names,
+    replay_failed_webhooks,
+    register_fund_accounts,
+    sync_fund_accounts,
+    rebuild_payout_summary,
+    stub_server,
+    record_stub_fixtures,
+    benchmark_api,
+]
@@ -1,5 +1,8 @@
 BUG_REPORT_URL = "https://github.com/resilient-tech/razorpayx_integration/issues/new"
 
 RAZORPAYX_CONFIG = "RazorpayX Configuration"
+RAZORPAYX_FAILED_WEBHOOK = "RazorpayX Failed Webhook"
+RAZORPAYX_PARTY_FUND_ACCOUNT = "RazorpayX Party Fund Account"
+RAZORPAYX_PAYOUT_SUMMARY = "RazorpayX Payout Summary"
 
 PAYMENTS_PROCESSOR_APP = "payments_processor"
@@ -21,6 +21,10 @@ doctype_js = {
     "Bank Reconciliation Tool": "razorpayx_integration/client_overrides/form/bank_reconciliation_tool.js",
 }
 
+doctype_list_js = {
+    "Payment Entry": "razorpayx_integration/client_overrides/list/payment_entry_list.js",
+}
+
 
 doc_events = {
     "Payment Entry": {
@@ -33,9 +37,19 @@ doc_events = {
 }
 
 scheduler_events = {
+    "all": [
+        "razorpayx_integration.razorpayx_integration.utils.payout_reconciliation.reconcile_payouts_periodically",
+        "razorpayx_integration.razorpayx_integration.utils.bulk_payout.release_held_payouts",
+        "razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary.update_stale_payout_summaries",
+        "razorpayx_integration.razorpayx_integration.utils.fee_journal_entry.create_pending_fee_journal_entries",
+    ],
     "daily": [
-        "razorpayx_integration.razorpayx_integration.utils.bank_transaction.sync_transactions_periodically"
-    ]
+        "razorpayx_integration.razorpayx_integration.utils.bank_transaction.sync_transactions_periodically",
+        "razorpayx_integration.razorpayx_integration.utils.fee_journal_entry.retry_failed_fee_journal_entries",
+    ],
+    "daily_long": [
+        "razorpayx_integration.razorpayx_integration.utils.integration_request.apply_integration_request_retention"
+    ],
 }
 
 payment_integration_fields = [
@@ -43,4 +57,5 @@ payment_integration_fields = [
     "razorpayx_payout_status",
     "razorpayx_payout_id",
     "razorpayx_payout_link_id",
+    "razorpayx_payout_held",
 ]
@@ -0,0 +1,291 @@
+"""
+Async variant of the RazorpayX API classes.
+
+API classes mirror the sync ones and share the request mapping, validations,
+logging and error handling. Only sending the request and pagination are async.
+
+Note: Requires `httpx` to be installed.
+
+---
+Example Usage:
+```py
+async with httpx.AsyncClient() as client:
+    payout = AsyncRazorpayXCompositePayout(RAZORPAYX_CONFIG_NAME, client=client)
+
+    responses = await asyncio.gather(
+        *(payout.pay(details) for details in payout_details)
+    )
+```
+
+Listing of Contacts and Fund Accounts can be split into creation date windows
+fetched concurrently (See `AsyncRazorpayXAPIMixin.get_all_in_windows`).
+"""
+
+import asyncio
+import time
+from itertools import chain
+from math import ceil
+
+import frappe
+from frappe import _
+from frappe.utils import DateTimeLikeObject, add_days, date_diff, getdate, today
+
+from razorpayx_integration.razorpayx_integration.apis.base import (
+    PageCursor,
+    parse_json,
+)
+from razorpayx_integration.razorpayx_integration.apis.contact import (
+    RazorpayXContact,
+)
+from razorpayx_integration.razorpayx_integration.apis.fund_account import (
+    RazorpayXFundAccount,
+)
+from razorpayx_integration.razorpayx_integration.apis.payout import (
+    RazorpayXCompositePayout,
+    RazorpayXLinkPayout,
+    RazorpayXPayout,
+)
+from razorpayx_integration.razorpayx_integration.apis.transaction import (
+    RazorpayXTransaction,
+)
+from razorpayx_integration.razorpayx_integration.utils.metrics import (
+    record_pages_fetched,
+)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_WINDOWS = 16
+MAX_CONCURRENT_WINDOWS = 4
+
+
+class AsyncRazorpayXAPIMixin:
+    """
+    Make HTTP requests of the RazorpayX API class with `httpx` asynchronously.
+
+    HTTP methods (`get`, `post`, etc.) and the API methods using them return
+    awaitables.
+
+    :param config: RazorpayX Configuration name.
+    :param client: `httpx.AsyncClient` to share connections among the requests.
+        If not given, a new client is used per request.
+
+    ---
+    Note:
+    - Request is prepared when the API method is called, so one instance
+      can be used for concurrent requests.
+    - Always mix before the sync API class.
+    """
+
+    def __init__(self, config: str, *args, client=None, **kwargs):
+        if httpx is None:
+            frappe.throw(
+                msg=_("Please install <strong>httpx</strong> to use async APIs."),
+                title=_("Missing Dependency"),
+            )
+
+        self.client = client
+
+        super().__init__(config, *args, **kwargs)
+
+    ### BASES ###
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str = "",
+        params: dict | None = None,
+        headers: dict | None = None,
+        json: dict | None = None,
+        lean: bool = False,
+    ):
+        request_args, ir_log = self._prepare_request(
+            method, endpoint, params, headers, json
+        )
+
+        return self._send_request(method.upper(), request_args, ir_log, lean)
+
+    async def _send_request(
+        self,
+        method: str,
+        request_args: frappe._dict,
+        ir_log: frappe._dict,
+        lean: bool = False,
+    ):
+        response = response_json = None
+        start = time.perf_counter()
+
+        try:
+            self._before_request(request_args)
+
+            if self.client:
+                response = await self.client.request(method, **request_args)
+            else:
+                async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
+                    response = await client.request(method, **request_args)
+
+            response_json = (
+                parse_json(response.content)
+                if lean
+                else response.json(object_hook=frappe._dict)
+            )
+
+            self._process_response(response.status_code, response_json)
+
+            # Raise HTTPError for other HTTP codes
+            response.raise_for_status()
+
+            return response_json
+
+        except Exception as e:
+            ir_log.error = str(e)
+            raise e
+        finally:
+            self._record_request_metrics(
+                method,
+                ir_log,
+                response.status_code if response is not None else None,
+                time.perf_counter() - start,
+                len(response.content) if response is not None else 0,
+            )
+            self._log_request(ir_log, response_json, lean)
+
+    async def _fetch(self, params: dict) -> list:
+        response = await self.get(params=params, lean=self.LEAN_LISTING)
+        return response.get("items", [])
+
+    async def _fetch_all(
+        self, filters: dict, count: int | None = None, page_size: int | None = None
+    ) -> list[dict]:
+        cursor = PageCursor(filters, count, page_size)
+
+        while not cursor.done:
+            cursor.add_page(await self._fetch(cursor.get_params()))
+
+        record_pages_fetched(self.__class__.__name__, cursor.pages)
+
+        return cursor.items
+
+    ### APIs ###
+    async def get_all_in_windows(
+        self,
+        from_date: DateTimeLikeObject,
+        to_date: DateTimeLikeObject | None = None,
+        filters: dict | None = None,
+        windows: int = DEFAULT_WINDOWS,
+        page_size: int | None = None,
+    ) -> list[dict]:
+        """
+        Get all items created between the dates by listing date windows concurrently.
+
+        - Date range is split into `windows` ranges of whole days.
+        - At most `MAX_CONCURRENT_WINDOWS` windows are fetched at a time.
+        - Items are merged by id and sorted latest first, like `get_all`.
+
+        :param from_date: Items created on or after this date.
+        :param to_date: Items created on or before this date (Default: today).
+        :param filters: Other filters of `get_all` (`from` and `to` are replaced).
+        :param windows: Number of date windows.
+        :param page_size: Items per request (Max and default: 100).
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_WINDOWS)
+
+        async def fetch(window: tuple[str, str]) -> list[dict]:
+            async with semaphore:
+                return await self.get_all(
+                    {**(filters or {}), "from": window[0], "to": window[1]},
+                    page_size=page_size,
+                )
+
+        results = await asyncio.gather(
+            *(
+                fetch(window)
+                for window in get_date_windows(from_date, to_date or today(), windows)
+            )
+        )
+
+        return merge_by_id(results)
+
+
+class AsyncRazorpayXPayout(AsyncRazorpayXAPIMixin, RazorpayXPayout):
+    async def get_by_id(
+        self,
+        id: str,
+        *,
+        data: str | None = None,
+        source_doctype: str | None = None,
+        source_docname: str | None = None,
+    ) -> dict:
+        response = await super().get_by_id(
+            id,
+            data=None,
+            source_doctype=source_doctype,
+            source_docname=source_docname,
+        )
+
+        if not data or not response:
+            return response
+
+        return response.get(data)
+
+
+class AsyncRazorpayXCompositePayout(AsyncRazorpayXPayout, RazorpayXCompositePayout):
+    pass
+
+
+class AsyncRazorpayXLinkPayout(AsyncRazorpayXPayout, RazorpayXLinkPayout):
+    pass
+
+
+class AsyncRazorpayXContact(AsyncRazorpayXAPIMixin, RazorpayXContact):
+    pass
+
+
+class AsyncRazorpayXFundAccount(AsyncRazorpayXAPIMixin, RazorpayXFundAccount):
+    pass
+
+
+class AsyncRazorpayXTransaction(AsyncRazorpayXAPIMixin, RazorpayXTransaction):
+    pass
+
+
+###### UTILITIES ######
+def get_date_windows(
+    from_date: DateTimeLikeObject, to_date: DateTimeLikeObject, windows: int
+) -> list[tuple[str, str]]:
+    """
+    Split the date range into consecutive windows of whole days.
+
+    ---
+    Example: `2024-01-01` to `2024-01-05` in 2 windows
+    `[("2024-01-01", "2024-01-03"), ("2024-01-04", "2024-01-05")]`
+    """
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    days = date_diff(to_date, from_date) + 1
+
+    if days <= 0:
+        return []
+
+    size = ceil(days / max(int(windows), 1))
+    date_windows = []
+
+    while from_date <= to_date:
+        end = min(getdate(add_days(from_date, size - 1)), to_date)
+        date_windows.append((str(from_date), str(end)))
+        from_date = getdate(add_days(end, 1))
+
+    return date_windows
+
+
+def merge_by_id(results: list[list[dict]]) -> list[dict]:
+    items = {}
+
+    for item in chain.from_iterable(results):
+        items.setdefault(item["id"], item)
+
+    return sorted(
+        items.values(), key=lambda item: item.get("created_at") or 0, reverse=True
+    )
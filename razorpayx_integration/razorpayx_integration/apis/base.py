@@ -1,4 +1,6 @@
 import re
+import time
+from functools import lru_cache
 from urllib.parse import urljoin
 
 import frappe
@@ -19,9 +21,27 @@ from razorpayx_integration.constants import (
 from razorpayx_integration.razorpayx_integration.doctype.razorpayx_configuration.razorpayx_configuration import (
     RazorpayXConfiguration,
 )
+from razorpayx_integration.razorpayx_integration.utils.metrics import (
+    record_api_request,
+    record_pages_fetched,
+)
+
+try:
+    from orjson import loads as parse_json
+except ImportError:
+    from json import loads as parse_json
 
 RAZORPAYX_BASE_API_URL = "https://api.razorpay.com/v1/"
 
+# maximum items per page supported by RazorpayX APIs
+MAX_FETCH_LIMIT = 100
+
+# `skip` offset after which pages are fetched by `to` (creation time) window
+MAX_SKIP_OFFSET = 1000
+
+UNSUPPORTED_PARTY_NAME_CHARS = re.compile(r"[^a-zA-Z0-9\s'._/()-]")
+PARTY_NAME_EDGE_CHARS = re.compile(r"^[^a-zA-Z0-9]+|[^a-zA-Z0-9.]+$")
+
 
 class SUPPORTED_HTTP_METHOD(BaseEnum):
     GET = "GET"
@@ -43,6 +63,9 @@ class BaseRazorpayXAPI:
     ### CLASS ATTRIBUTES ###
     BASE_PATH = ""
 
+    # parse listing pages into plain dicts and log only the item ids
+    LEAN_LISTING = False
+
     ### SETUP ###
     def __init__(self, config: str, *args, **kwargs):
         """
@@ -66,6 +89,7 @@ class BaseRazorpayXAPI:
         self.default_log_values = {}  # Show value in Integration Request Log
         self.ir_service_set = False  # Service details in IR log has been set or not
         self.sensitive_infos = ()  # Sensitive info to mask in Integration Request Log
+        self.last_error = None  # `error` of the last failed API response
         self.place_holder = "************"
 
         self.setup(*args, **kwargs)
@@ -139,16 +163,18 @@ class BaseRazorpayXAPI:
     ### API WRAPPERS ###
     # TODO: should add `skip` in filters (Handle pagination + if not given fetch all) (Change in sub class)
     def get_all(
-        self, filters: dict | None = None, count: int | None = None
+        self,
+        filters: dict | None = None,
+        count: int | None = None,
+        page_size: int | None = None,
     ) -> list[dict] | None:
         """
         Fetches all data of given RazorpayX account for specific API.
 
         :param filters: Filters for fetching filtered response.
         :param count: Total number of item to be fetched.If not given fetches all.
+        :param page_size: Items per request (Max and default: `MAX_FETCH_LIMIT`).
         """
-        MAX_LIMIT = 100
-
         if filters:
             self._clean_request(filters)
             self._set_epoch_time_for_date_filters(filters)
@@ -163,38 +189,28 @@ class BaseRazorpayXAPI:
                 title=_("Invalid Count To Fetch Data"),
             )
 
-        if count and count <= MAX_LIMIT:
-            filters["count"] = count
-            return self._fetch(filters)
-
-        if count is None:
-            FETCH_ALL_ITEMS = True
-        else:
-            FETCH_ALL_ITEMS = False
-
-        result = []
-        filters["count"] = MAX_LIMIT
-        filters["skip"] = 0
-
-        while True:
-            items = self._fetch(filters)
+        if isinstance(page_size, int) and page_size <= 0:
+            frappe.throw(
+                _("Page size can't be {0}").format(frappe.bold(page_size)),
+                title=_("Invalid Page Size To Fetch Data"),
+            )
 
-            if items and isinstance(items, list):
-                result.extend(items)
-            else:
-                break
+        return self._fetch_all(filters, count, page_size)
 
-            if len(items) < MAX_LIMIT:
-                break
+    def _fetch_all(
+        self, filters: dict, count: int | None = None, page_size: int | None = None
+    ) -> list[dict]:
+        """
+        Fetch items page by page till `count` items are fetched (all if not given).
+        """
+        cursor = PageCursor(filters, count, page_size)
 
-            if not FETCH_ALL_ITEMS:
-                count -= len(items)
-                if count <= 0:
-                    break
+        while not cursor.done:
+            cursor.add_page(self._fetch(cursor.get_params()))
 
-            filters["skip"] += MAX_LIMIT
+        record_pages_fetched(self.__class__.__name__, cursor.pages)
 
-        return result
+        return cursor.items
 
     ### BASES ###
     def _make_request(
@@ -204,11 +220,69 @@ class BaseRazorpayXAPI:
         params: dict | None = None,
         headers: dict | None = None,
         json: dict | None = None,
+        lean: bool = False,
     ):
         """
         Base for making HTTP request.
 
         Process headers,params and data then make request and return processed response.
+
+        :param lean: Parse the response into plain dicts with the fast JSON decoder
+            and log only the summary of the response. Used for bulk listings.
+        """
+        request_args, ir_log = self._prepare_request(
+            method, endpoint, params, headers, json
+        )
+
+        response = response_json = None
+        start = time.perf_counter()
+
+        try:
+            self._before_request(request_args)
+
+            response = requests.request(method.upper(), **request_args)
+            response_json = (
+                parse_json(response.content)
+                if lean
+                else response.json(object_hook=frappe._dict)
+            )
+
+            self._process_response(response.status_code, response_json)
+
+            # Raise HTTPError for other HTTP codes
+            response.raise_for_status()
+
+            return response_json
+
+        except Exception as e:
+            ir_log.error = str(e)
+            raise e
+        finally:
+            self._record_request_metrics(
+                method,
+                ir_log,
+                response.status_code if response is not None else None,
+                time.perf_counter() - start,
+                len(response.content) if response is not None else 0,
+            )
+            self._log_request(ir_log, response_json, lean)
+
+    def _prepare_request(
+        self,
+        method: str,
+        endpoint: str = "",
+        params: dict | None = None,
+        headers: dict | None = None,
+        json: dict | None = None,
+    ) -> tuple[frappe._dict, frappe._dict]:
+        """
+        Prepare request arguments and Integration Request Log for the HTTP request.
+
+        Note: Shared by the sync and async clients. Source and service details
+        are captured here, before the request is sent.
+
+        ---
+        Returns tuple of request arguments and Integration Request Log.
         """
         method = method.upper()
         if method not in SUPPORTED_HTTP_METHOD.values():
@@ -247,41 +321,63 @@ class BaseRazorpayXAPI:
                     "body": copied_json,
                 }
 
-        response_json = None
-
-        try:
-            self._before_request(request_args)
+        return request_args, ir_log
 
-            response = requests.request(method, **request_args)
-            response_json = response.json(object_hook=frappe._dict)
+    def _process_response(self, status_code: int, response_json: dict | None):
+        """
+        Handle failed API response by status code.
+        """
+        if status_code >= 400:
+            self.last_error = (response_json or {}).get("error")
+            self._handle_failed_api_response(response_json)
 
-            if response.status_code >= 400:
-                self._handle_failed_api_response(response_json)
+    def _log_request(
+        self, ir_log: dict, response_json: dict | None = None, lean: bool = False
+    ):
+        """
+        Mask sensitive information and enqueue the Integration Request Log.
 
-            # Raise HTTPError for other HTTP codes
-            response.raise_for_status()
+        :param lean: Log only the summary (entity, count and item ids) of the response.
+        """
+        if response_json:
+            ir_log.output = (
+                get_response_summary(response_json) if lean else response_json.copy()
+            )
 
-            return response_json
+        self._mask_sensitive_info(ir_log)
 
-        except Exception as e:
-            ir_log.error = str(e)
-            raise e
-        finally:
-            if response_json:
-                ir_log.output = response_json.copy()
+        if not ir_log.integration_request_service:
+            ir_log.integration_request_service = "RazorpayX Integration"
 
-            self._mask_sensitive_info(ir_log)
+        enqueue_integration_request(**ir_log)
 
-            if not ir_log.integration_request_service:
-                ir_log.integration_request_service = "RazorpayX Integration"
+    def _record_request_metrics(
+        self,
+        method: str,
+        ir_log: dict,
+        status_code: int | None,
+        duration: float,
+        response_bytes: int,
+    ):
+        """
+        Record latency, status code and response size of the request.
 
-            enqueue_integration_request(**ir_log)
+        Note: Shared by the sync and async clients.
+        """
+        record_api_request(
+            api=self.__class__.__name__,
+            service=ir_log.integration_request_service or "RazorpayX Integration",
+            method=method.upper(),
+            status_code=status_code,
+            duration=duration,
+            response_bytes=response_bytes,
+        )
 
     def _fetch(self, params: dict) -> list:
         """
         Fetches `items` from the API response based on the given parameters.
         """
-        response = self.get(params=params)
+        response = self.get(params=params, lean=self.LEAN_LISTING)
         return response.get("items", [])
 
     ### API HELPERS ###
@@ -300,7 +396,7 @@ class BaseRazorpayXAPI:
             path_segments.insert(0, self.BASE_PATH)
 
         return urljoin(
-            RAZORPAYX_BASE_API_URL,
+            get_base_api_url(),
             "/".join(segment.strip("/") for segment in path_segments),
         )
 
@@ -352,13 +448,7 @@ class BaseRazorpayXAPI:
         ---
         - Supported characters: `a-z`, `A-Z`, `0-9`, `space`, `'` , `-` , `_` , `/` , `(` , `)` and `.`
         """
-        # replace unsupported characters with `-`
-        party_name = re.sub(r"[^a-zA-Z0-9\s'._/()-]", "-", party_name)
-
-        # remove special characters from the start and end
-        party_name = re.sub(r"^[^a-zA-Z0-9]+|[^a-zA-Z0-9.]+$", "", party_name.strip())
-
-        return party_name[:50].ljust(3, ".")
+        return sanitize_party_name(party_name)
 
     ### LOGGING ###
     def _set_service_details_to_ir_log(
@@ -475,3 +565,122 @@ class BaseRazorpayXAPI:
             title = _("RazorpayX API Failed")
 
         frappe.throw(title=title, msg=error_msg)
+
+
+class PageCursor:
+    """
+    Page parameters and collected items of the paginated listing.
+
+    - Last page asks only for the remaining `count` items.
+    - RazorpayX lists the latest items first, so after `MAX_SKIP_OFFSET` items
+      the `to` filter is moved to the oldest fetched item's creation time and
+      `skip` restarts, avoiding slow deep offsets.
+    - Items are merged by id, as the items created in the same second as the
+      window's edge can be returned again.
+
+    :param filters: Listing filters (`to` is changed when the window moves).
+    :param count: Total items to fetch. If not given, fetches all.
+    :param page_size: Items per page (capped to `MAX_FETCH_LIMIT`).
+    """
+
+    def __init__(
+        self, filters: dict, count: int | None = None, page_size: int | None = None
+    ):
+        self.filters = filters
+        self.count = count
+        self.page_size = min(page_size or MAX_FETCH_LIMIT, MAX_FETCH_LIMIT)
+
+        self.items = []
+        self.ids = set()
+        self.skip = 0
+        self.limit = self.page_size
+        self.pages = 0
+        self.done = False
+
+    def get_params(self) -> dict:
+        self.limit = self.page_size
+
+        if self.count is not None:
+            self.limit = min(self.page_size, self.count - len(self.items))
+
+        return {**self.filters, "count": self.limit, "skip": self.skip}
+
+    def add_page(self, items: list | None):
+        self.pages += 1
+
+        if not items or not isinstance(items, list):
+            self.done = True
+            return
+
+        new_items = [item for item in items if item.get("id") not in self.ids]
+        self.ids.update(item.get("id") for item in new_items)
+        self.items.extend(new_items)
+
+        if (
+            not new_items
+            or len(items) < self.limit
+            or (self.count is not None and len(self.items) >= self.count)
+        ):
+            self.done = True
+            return
+
+        self.skip += len(items)
+
+        if self.skip >= MAX_SKIP_OFFSET:
+            self.move_window(items[-1].get("created_at"))
+
+    def move_window(self, created_at: int | None):
+        if not created_at:
+            return
+
+        self.filters["to"] = created_at
+
+        # items of the edge second are fetched again, skip the known ones
+        self.skip = sum(
+            1 for item in self.items if item.get("created_at") == created_at
+        )
+
+
+def get_base_api_url() -> str:
+    """
+    RazorpayX API URL, can be overridden with `razorpayx_base_api_url` site config.
+
+    Example: `http://localhost:8787/v1/` for the stub server (See `benchmarks/stub_server.py`).
+    """
+    base_url = frappe.conf.get("razorpayx_base_api_url") or RAZORPAYX_BASE_API_URL
+
+    return base_url if base_url.endswith("/") else f"{base_url}/"
+
+
+@lru_cache(maxsize=4096)
+def sanitize_party_name(party_name: str) -> str:
+    """
+    Convert the given ERPNext party name to a valid RazorpayX Contact Name.
+
+    Memoized, as same party names are sanitized repeatedly in bulk payouts.
+
+    :param party_name: ERPNext party name.
+    """
+    # replace unsupported characters with `-`
+    party_name = UNSUPPORTED_PARTY_NAME_CHARS.sub("-", party_name)
+
+    # remove special characters from the start and end
+    party_name = PARTY_NAME_EDGE_CHARS.sub("", party_name.strip())
+
+    return party_name[:50].ljust(3, ".")
+
+
+def get_response_summary(response_json: dict) -> dict:
+    """
+    Summary of the listing response to log, instead of the whole response.
+    """
+    items = response_json.get("items")
+
+    if not isinstance(items, list):
+        return dict(response_json)
+
+    return {
+        "entity": response_json.get("entity"),
+        "count": response_json.get("count", len(items)),
+        "items": [item.get("id") for item in items if isinstance(item, dict)],
+    }
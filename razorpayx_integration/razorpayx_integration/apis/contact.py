@@ -23,6 +23,7 @@ class RazorpayXContact(BaseRazorpayXAPI):
 
     # * utility attributes
     BASE_PATH = "contacts"
+    LEAN_LISTING = True
 
     # * override base setup
     def setup(self, *args, **kwargs):
@@ -97,13 +98,17 @@ class RazorpayXContact(BaseRazorpayXAPI):
         return self.get(endpoint=id)
 
     def get_all(
-        self, filters: dict | None = None, count: int | None = None
+        self,
+        filters: dict | None = None,
+        count: int | None = None,
+        page_size: int | None = None,
     ) -> list[dict]:
         """
         Get all `Contacts` associate with given `RazorpayX` account if limit is not given.
 
         :param filters: Result will be filtered as given filters.
         :param count: The number of contacts to be retrieved.
+        :param page_size: Items per request (Max and default: 100).
 
         :raises ValueError: If `type` is not valid.
 
@@ -134,7 +139,7 @@ class RazorpayXContact(BaseRazorpayXAPI):
         ---
         Reference: https://razorpay.com/docs/api/x/contacts/fetch-all
         """
-        return super().get_all(filters, count)
+        return super().get_all(filters, count, page_size)
 
     def update(self, id: str, **kwargs):
         """
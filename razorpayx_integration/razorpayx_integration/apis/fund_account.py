@@ -24,6 +24,7 @@ class RazorpayXFundAccount(BaseRazorpayXAPI):
 
     # * utility attributes
     BASE_PATH = "fund_accounts"
+    LEAN_LISTING = True
 
     # * override base setup
     def setup(self, *args, **kwargs):
@@ -86,13 +87,17 @@ class RazorpayXFundAccount(BaseRazorpayXAPI):
         return self.get(endpoint=id)
 
     def get_all(
-        self, filters: dict | None = None, count: int | None = None
+        self,
+        filters: dict | None = None,
+        count: int | None = None,
+        page_size: int | None = None,
     ) -> list[dict]:
         """
         Get all `Fund Account` associate with given `RazorpayX` account if limit is not given.
 
         :param filters: Result will be filtered as given filters.
         :param count: The number of `Fund Account` to be retrieved.
+        :param page_size: Items per request (Max and default: 100).
 
         ---
         Example Usage:
@@ -116,7 +121,7 @@ class RazorpayXFundAccount(BaseRazorpayXAPI):
         ---
         Reference: https://razorpay.com/docs/api/x/fund-accounts/fetch-all
         """
-        return super().get_all(filters, count)
+        return super().get_all(filters, count, page_size)
 
     def activate(self, id: str) -> dict:
         """
@@ -1,5 +1,6 @@
 import frappe
 from frappe import _
+from frappe.utils import DateTimeLikeObject
 from payment_integration_utils.payment_integration_utils.constants.payments import (
     TRANSFER_METHOD as PAYOUT_MODE,
 )
@@ -114,7 +115,7 @@ class RazorpayXPayout(BaseRazorpayXAPI):
         self,
         id: str,
         *,
-        data: str | None,
+        data: str | None = None,
         source_doctype: str | None = None,
         source_docname: str | None = None,
     ) -> dict:
@@ -147,6 +148,47 @@ class RazorpayXPayout(BaseRazorpayXAPI):
 
         return response.get(data)
 
+    def get_all(
+        self,
+        *,
+        from_date: DateTimeLikeObject | None = None,
+        to_date: DateTimeLikeObject | None = None,
+        reference_id: str | None = None,
+        status: str | None = None,
+        count: int | None = None,
+        page_size: int | None = None,
+    ) -> list[dict] | None:
+        """
+        Fetch all `Payouts` of the RazorpayX account within the given time window.
+
+        :param from_date: The starting date for which payouts are to be fetched.
+        :param to_date: The ending date for which payouts are to be fetched.
+        :param reference_id: Reference Id of the payout (Ex. `Payment Entry-PE-0001`).
+        :param status: Status of the payouts (Ex. `processing`).
+        :param count: The number of `Payouts` to be retrieved. If not given fetches all.
+        :param page_size: Payouts per request (Max and default: 100).
+
+        ---
+        Note:
+        - `from` and `to` can be str,date,datetime (in YYYY-MM-DD).
+
+        ---
+        Reference: https://razorpay.com/docs/api/x/payouts/fetch-all
+        """
+        filters = {
+            "from": from_date,
+            "to": to_date,
+            "reference_id": reference_id,
+            "status": status,
+            # account number is mandatory
+            "account_number": self.razorpayx_account_number,
+        }
+
+        if not self.ir_service_set:
+            self._set_service_details_to_ir_log("Fetch All Payouts", False)
+
+        return super().get_all(filters=filters, count=count, page_size=page_size)
+
     def cancel(
         self,
         payout_id: str,
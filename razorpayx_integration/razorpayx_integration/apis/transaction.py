@@ -20,6 +20,7 @@ class RazorpayXTransaction(BaseRazorpayXAPI):
 
     # * utility attributes
     BASE_PATH = "transactions"
+    LEAN_LISTING = True
 
     # * override base setup
     def setup(self, *args, **kwargs):
@@ -55,6 +56,7 @@ class RazorpayXTransaction(BaseRazorpayXAPI):
         from_date: DateTimeLikeObject | None = None,
         to_date: DateTimeLikeObject | None = None,
         count: int | None = None,
+        page_size: int | None = None,
         source_doctype: str | None = None,
         source_docname: str | None = None,
     ) -> list[dict] | None:
@@ -64,6 +66,7 @@ class RazorpayXTransaction(BaseRazorpayXAPI):
         :param from_date: The starting date for which transactions are to be fetched.
         :param to_date: The ending date for which transactions are to be fetched.
         :param count: The number of `Transaction` to be retrieved.
+        :param page_size: Transactions per request (Max and default: 100).
         :param source_doctype: The source doctype of the transaction.
         :param source_docname: The source docname of the transaction
 
@@ -106,7 +109,7 @@ class RazorpayXTransaction(BaseRazorpayXAPI):
             self.source_doctype = source_doctype
             self.source_docname = source_docname
 
-        return super().get_all(filters=filters, count=count)
+        return super().get_all(filters=filters, count=count, page_size=page_size)
 
     def get_transactions_for_today(
         self,
@@ -0,0 +1,121 @@
+"""
+RazorpayX API layer benchmark.
+
+Runs the `apis/` classes against the stub server (See `stub_server.py`) and
+measures listing, fetching and concurrent fetching throughput.
+
+⚠️ Run only on a test site. Integration Requests are logged for every call.
+"""
+
+import asyncio
+
+import frappe
+
+from razorpayx_integration.razorpayx_integration.apis.async_api import (
+    AsyncRazorpayXPayout,
+    httpx,
+)
+from razorpayx_integration.razorpayx_integration.apis.contact import (
+    RazorpayXContact,
+)
+from razorpayx_integration.razorpayx_integration.apis.payout import RazorpayXPayout
+from razorpayx_integration.razorpayx_integration.apis.transaction import (
+    RazorpayXTransaction,
+)
+from razorpayx_integration.razorpayx_integration.benchmarks.stub_server import (
+    INJECTED_ERRORS,
+)
+from razorpayx_integration.razorpayx_integration.benchmarks.utils import Timer
+
+CONCURRENT_REQUESTS = 20
+
+
+class APIBenchmark:
+    """
+    :param razorpayx_config: RazorpayX Configuration name.
+    :param iterations: Runs per stage.
+    :param base_url: Stub server URL (Ex. `http://localhost:8787/v1/`).
+    """
+
+    def __init__(self, razorpayx_config: str, iterations: int, base_url: str):
+        self.razorpayx_config = razorpayx_config
+        self.iterations = iterations
+
+        # requests of this process only are sent to the stub
+        frappe.local.conf.razorpayx_base_api_url = base_url
+
+        self.timers = {}
+
+    def run(self) -> dict:
+        payout_ids = [
+            payout["id"]
+            for payout in RazorpayXPayout(self.razorpayx_config).get_all(
+                count=CONCURRENT_REQUESTS
+            )
+        ]
+
+        for _ in range(self.iterations):
+            self.measure(
+                "listing",
+                "transactions",
+                lambda: RazorpayXTransaction(self.razorpayx_config).get_all(),
+            )
+            self.measure(
+                "listing",
+                "contacts",
+                lambda: RazorpayXContact(self.razorpayx_config).get_all(),
+            )
+            self.measure(
+                "fetch",
+                "sequential",
+                lambda: [
+                    RazorpayXPayout(self.razorpayx_config).get_by_id(id, data=None)
+                    for id in payout_ids
+                ],
+            )
+
+            if httpx is not None:
+                self.measure(
+                    "fetch",
+                    "concurrent",
+                    lambda: asyncio.run(self.fetch_concurrently(payout_ids)),
+                )
+
+        return {
+            group: {stage: timer.summary() for stage, timer in stages.items()}
+            for group, stages in self.timers.items()
+        }
+
+    def measure(self, group: str, stage: str, fn):
+        """
+        Runs failed by the injected errors are measured separately.
+
+        Other errors are raised, as they are bugs of the benchmark or the API.
+        """
+        stages = self.timers.setdefault(group, {})
+
+        try:
+            with stages.setdefault(stage, Timer()).measure():
+                fn()
+        except Exception as e:
+            if not is_injected_error(e):
+                raise
+
+            # failed run's time is already added to the stage timer
+            timer = stages[stage]
+            stages.setdefault(f"{stage} (failed)", Timer()).add(timer.samples.pop())
+
+    async def fetch_concurrently(self, payout_ids: list[str]):
+        async with httpx.AsyncClient() as client:
+            payout = AsyncRazorpayXPayout(self.razorpayx_config, client=client)
+
+            await asyncio.gather(*(payout.get_by_id(id) for id in payout_ids))
+
+
+def is_injected_error(error: Exception) -> bool:
+    """
+    Injected errors of the stub server are raised with their descriptions.
+    """
+    return isinstance(error, frappe.ValidationError) and any(
+        description in str(error) for _status, _code, description in INJECTED_ERRORS
+    )
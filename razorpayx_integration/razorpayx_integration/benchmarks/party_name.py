@@ -0,0 +1,73 @@
+"""
+Party name sanitization micro-benchmark.
+
+Sanitizes synthetic party names (with repeats, like in bulk payout runs) and
+measures the uncached and memoized calls.
+"""
+
+import random
+import string
+
+from razorpayx_integration.razorpayx_integration.apis.base import (
+    sanitize_party_name,
+)
+from razorpayx_integration.razorpayx_integration.benchmarks.utils import Timer
+
+NAME_CHARS = string.ascii_letters + string.digits + " &.,-_/()'@#!"
+
+
+def get_sample_party_names(count: int, unique: int, seed: int = 0) -> list[str]:
+    """
+    Get synthetic party names.
+
+    :param count: Total names.
+    :param unique: Unique names among them (Ex. parties paid repeatedly).
+    :param seed: Seed to generate the same names in every run.
+    """
+    rng = random.Random(seed)
+
+    names = [
+        "".join(rng.choices(NAME_CHARS, k=rng.randint(2, 80)))
+        for _ in range(max(unique, 1))
+    ]
+
+    return [rng.choice(names) for _ in range(count)]
+
+
+def benchmark_sanitize_party_name(
+    iterations: int = 10_000, unique: int = 500, batch_size: int = 100
+) -> dict:
+    """
+    Benchmark `sanitize_party_name`.
+
+    Samples are measured per batch of `batch_size` names (in milliseconds).
+
+    - `uncached`: Sanitization without the memo.
+    - `memoized`: Memo is kept as in the bulk payouts.
+    """
+    names = get_sample_party_names(iterations, unique)
+    batches = [
+        names[idx : idx + batch_size] for idx in range(0, len(names), batch_size)
+    ]
+
+    uncached = Timer()
+    memoized = Timer()
+
+    for batch in batches:
+        with uncached.measure():
+            for name in batch:
+                sanitize_party_name.__wrapped__(name)
+
+    sanitize_party_name.cache_clear()
+
+    for batch in batches:
+        with memoized.measure():
+            for name in batch:
+                sanitize_party_name(name)
+
+    return {
+        "sanitize_party_name": {
+            "uncached": uncached.summary(),
+            "memoized": memoized.summary(),
+        }
+    }
@@ -0,0 +1,462 @@
+"""
+Offline RazorpayX API stub server.
+
+Emulates the endpoints used by the `apis/` classes from recorded fixtures, so
+the API layer can be exercised and benchmarked without RazorpayX.
+
+- Listing with `count` / `skip` (max 100 per page) and `from` / `to` filters.
+- Fetch by id, create and cancel payouts / payout links, create and update
+  contacts and fund accounts.
+- Payout idempotency with `X-Payout-Idempotency` header.
+- Configurable latency and error injection.
+
+Point the site to the stub with `razorpayx_base_api_url` site config
+(Ex. `http://localhost:8787/v1/`).
+
+Note: Only standard library is used, it can be run outside the bench.
+
+---
+Example Usage:
+```py
+server = StubServer(
+    StubState.from_fixtures(DEFAULT_FIXTURES, generate=10_000),
+    port=8787,
+    latency=50,
+    error_rate=0.01,
+)
+server.serve_forever()
+```
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from copy import deepcopy
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURES = os.path.join(
+    os.path.dirname(__file__), "fixtures", "razorpayx_stub.json"
+)
+
+API_PREFIX = "/v1/"
+MAX_FETCH_LIMIT = 100
+DEFAULT_FETCH_LIMIT = 10
+
+# collection: (entity, id prefix)
+COLLECTIONS = {
+    "payouts": ("payout", "pout"),
+    "payout-links": ("payout_link", "poutlk"),
+    "transactions": ("transaction", "txn"),
+    "contacts": ("contact", "cont"),
+    "fund_accounts": ("fund_account", "fa"),
+}
+
+# collection: status set on cancel
+CANCEL_STATUSES = {
+    "payouts": "cancelled",
+    "payout-links": "cancelled",
+}
+
+INJECTED_ERRORS = (
+    (HTTPStatus.TOO_MANY_REQUESTS, "BAD_REQUEST_ERROR", "Too many requests"),
+    (HTTPStatus.INTERNAL_SERVER_ERROR, "SERVER_ERROR", "Server Is Down"),
+    (HTTPStatus.SERVICE_UNAVAILABLE, "SERVER_ERROR", "Service Unavailable"),
+)
+
+
+###### STATE ######
+class StubState:
+    """
+    In-memory RazorpayX account data.
+
+    :param fixtures: `{collection: [items]}` (Ex. recorded with `record_fixtures`).
+    :param seed: Seed to generate the same ids and errors in every run.
+    """
+
+    def __init__(self, fixtures: dict, seed: int = 0):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.sequence = 0
+
+        self.items = {collection: {} for collection in COLLECTIONS}
+        self.idempotency_keys = {}  # key: (request body, response)
+
+        for collection, items in fixtures.items():
+            if collection not in COLLECTIONS:
+                continue
+
+            for item in items:
+                self.items[collection][item["id"]] = item
+
+    @classmethod
+    def from_fixtures(cls, path: str, generate: int = 0, seed: int = 0):
+        """
+        :param path: Fixtures JSON file.
+        :param generate: Synthetic items to add in each collection (for pagination).
+        """
+        with open(path) as f:
+            state = cls(json.load(f), seed=seed)
+
+        if generate:
+            state.generate(generate)
+
+        return state
+
+    def generate(self, count: int):
+        """
+        Add synthetic items cloned from the fixtures with new ids and creation times.
+        """
+        now = int(time.time())
+
+        for collection, items in self.items.items():
+            templates = list(items.values())
+
+            if not templates:
+                continue
+
+            for idx in range(count):
+                item = deepcopy(templates[idx % len(templates)])
+                item["id"] = self.new_id(collection)
+                # spread over the last 90 days
+                item["created_at"] = now - self.rng.randint(0, 90 * 24 * 60 * 60)
+                items[item["id"]] = item
+
+    def new_id(self, collection: str) -> str:
+        self.sequence += 1
+        return f"{COLLECTIONS[collection][1]}_stub{self.sequence:010d}"
+
+    ### APIs ###
+    def list(self, collection: str, params: dict) -> dict:
+        count = min(int(params.get("count", DEFAULT_FETCH_LIMIT)), MAX_FETCH_LIMIT)
+        skip = int(params.get("skip", 0))
+        from_time = int(params.get("from", 0))
+        to_time = int(params.get("to", 0)) or None
+
+        filters = {
+            key: value
+            for key, value in params.items()
+            if key not in ("count", "skip", "from", "to", "account_number")
+        }
+
+        with self.lock:
+            items = [
+                item
+                for item in self.items[collection].values()
+                if item.get("created_at", 0) >= from_time
+                and (to_time is None or item.get("created_at", 0) <= to_time)
+                and all(str(item.get(key)) == value for key, value in filters.items())
+            ]
+
+        # latest first, as RazorpayX
+        items.sort(
+            key=lambda item: (item.get("created_at", 0), item["id"]), reverse=True
+        )
+        page = items[skip : skip + count]
+
+        return {"entity": "collection", "count": len(page), "items": page}
+
+    def get(self, collection: str, id: str) -> dict | None:
+        return self.items[collection].get(id)
+
+    def create(self, collection: str, body: dict, idempotency_key: str | None = None):
+        """
+        ---
+        Returns tuple of HTTP status and response.
+        """
+        with self.lock:
+            if idempotency_key and idempotency_key in self.idempotency_keys:
+                request_body, response = self.idempotency_keys[idempotency_key]
+
+                if request_body != body:
+                    return HTTPStatus.BAD_REQUEST, get_error(
+                        "BAD_REQUEST_ERROR",
+                        "Different request body sent for the same Idempotency Header",
+                    )
+
+                return HTTPStatus.OK, response
+
+            item = {
+                **deepcopy(body),
+                "id": self.new_id(collection),
+                "entity": COLLECTIONS[collection][0],
+                "created_at": int(time.time()),
+            }
+
+            if collection == "payouts":
+                item.setdefault(
+                    "status",
+                    "queued" if body.get("queue_if_low_balance") else "processing",
+                )
+                item.setdefault("fees", 590)
+                item.setdefault("tax", 90)
+
+                # composite payout
+                if isinstance(fund_account := item.pop("fund_account", None), dict):
+                    item["fund_account_id"] = self.new_id("fund_accounts")
+                    item["fund_account"] = {
+                        **fund_account,
+                        "id": item["fund_account_id"],
+                    }
+
+            elif collection == "payout-links":
+                item.setdefault("status", "issued")
+
+            elif collection in ("contacts", "fund_accounts"):
+                item.setdefault("active", True)
+
+            self.items[collection][item["id"]] = item
+
+            if idempotency_key:
+                self.idempotency_keys[idempotency_key] = (body, item)
+
+            return HTTPStatus.OK, item
+
+    def update(self, collection: str, id: str, body: dict) -> dict | None:
+        with self.lock:
+            if not (item := self.items[collection].get(id)):
+                return
+
+            item.update(body)
+            return item
+
+    def cancel(self, collection: str, id: str):
+        with self.lock:
+            if not (item := self.items[collection].get(id)):
+                return HTTPStatus.NOT_FOUND, get_error(
+                    "BAD_REQUEST_ERROR", "The id provided does not exist"
+                )
+
+            if item.get("status") not in ("queued", "pending", "scheduled", "issued"):
+                return HTTPStatus.BAD_REQUEST, get_error(
+                    "BAD_REQUEST_ERROR",
+                    f"Payout cannot be cancelled in {item.get('status')} status",
+                )
+
+            item["status"] = CANCEL_STATUSES[collection]
+            return HTTPStatus.OK, item
+
+
+###### SERVER ######
+class StubServer(ThreadingHTTPServer):
+    """
+    :param state: Stub account data.
+    :param latency: Mean latency to add per request (ms), with ±50% jitter.
+    :param error_rate: Fraction of requests to fail with 429/5xx errors.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        state: StubState,
+        host: str = "localhost",
+        port: int = 8787,
+        latency: float = 0,
+        error_rate: float = 0,
+    ):
+        self.state = state
+        self.latency = latency
+        self.error_rate = error_rate
+
+        super().__init__((host, port), StubRequestHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def handle_request(self, method: str):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self.read_body()
+
+        self.add_latency()
+
+        if self.should_fail():
+            status, code, description = self.server.state.rng.choice(INJECTED_ERRORS)
+            return self.respond(status, get_error(code, description))
+
+        if not url.path.startswith(API_PREFIX):
+            return self.not_found()
+
+        path = url.path.removeprefix(API_PREFIX).strip("/")
+        collection, *segments = path.split("/")
+
+        if collection not in COLLECTIONS:
+            return self.not_found()
+
+        state = self.server.state
+
+        match (method, segments):
+            case ("GET", []):
+                return self.respond(HTTPStatus.OK, state.list(collection, params))
+
+            case ("GET", [id]):
+                item = state.get(collection, id)
+
+            case ("POST", []):
+                return self.respond(
+                    *state.create(
+                        collection, body, self.headers.get("X-Payout-Idempotency")
+                    )
+                )
+
+            case ("POST", [id, "cancel"]) if collection in CANCEL_STATUSES:
+                return self.respond(*state.cancel(collection, id))
+
+            case ("PATCH", [id]):
+                item = state.update(collection, id, body)
+
+            case _:
+                return self.not_found()
+
+        if not item:
+            return self.respond(
+                HTTPStatus.NOT_FOUND,
+                get_error("BAD_REQUEST_ERROR", "The id provided does not exist"),
+            )
+
+        self.respond(HTTPStatus.OK, item)
+
+    ### UTILITIES ###
+    def read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+
+        if not length:
+            return {}
+
+        return json.loads(self.rfile.read(length))
+
+    def add_latency(self):
+        if not self.server.latency:
+            return
+
+        jitter = self.server.state.rng.uniform(0.5, 1.5)
+        time.sleep(self.server.latency * jitter / 1000)
+
+    def should_fail(self) -> bool:
+        return bool(
+            self.server.error_rate
+            and self.server.state.rng.random() < self.server.error_rate
+        )
+
+    def not_found(self):
+        self.respond(
+            HTTPStatus.NOT_FOUND,
+            get_error(
+                "BAD_REQUEST_ERROR", "The requested URL was not found on the server."
+            ),
+        )
+
+    def respond(self, status: int, response: dict):
+        content = json.dumps(response).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # keep the benchmark output clean
+        pass
+
+
+###### UTILITIES ######
+def get_error(code: str, description: str) -> dict:
+    """
+    Error in the RazorpayX format.
+
+    Reference: https://razorpay.com/docs/errors/#sample-code
+    """
+    return {
+        "error": {
+            "code": code,
+            "description": description,
+            "source": "NA",
+            "step": "NA",
+            "reason": "NA",
+            "metadata": {},
+        }
+    }
+
+
+def run_stub_server(
+    fixtures: str = DEFAULT_FIXTURES,
+    host: str = "localhost",
+    port: int = 8787,
+    latency: float = 0,
+    error_rate: float = 0,
+    generate: int = 0,
+    seed: int = 0,
+) -> StubServer:
+    """
+    Start the stub server in a background thread.
+
+    ---
+    Returns the server, call `shutdown()` to stop it.
+    """
+    server = StubServer(
+        StubState.from_fixtures(fixtures, generate=generate, seed=seed),
+        host=host,
+        port=port,
+        latency=latency,
+        error_rate=error_rate,
+    )
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def record_fixtures(razorpayx_config: str, path: str, count: int = 100):
+    """
+    Record the latest items of the RazorpayX account as fixtures.
+
+    ⚠️ Recorded fixtures contain the account's data, keep them private.
+
+    :param razorpayx_config: RazorpayX Configuration name.
+    :param path: Fixtures JSON file to write.
+    :param count: Items to record per collection.
+    """
+    from razorpayx_integration.razorpayx_integration.apis.contact import (
+        RazorpayXContact,
+    )
+    from razorpayx_integration.razorpayx_integration.apis.fund_account import (
+        RazorpayXFundAccount,
+    )
+    from razorpayx_integration.razorpayx_integration.apis.payout import (
+        RazorpayXLinkPayout,
+        RazorpayXPayout,
+    )
+    from razorpayx_integration.razorpayx_integration.apis.transaction import (
+        RazorpayXTransaction,
+    )
+
+    fixtures = {
+        "payouts": RazorpayXPayout(razorpayx_config).get_all(count=count),
+        "payout-links": RazorpayXLinkPayout(razorpayx_config).get_all(count=count),
+        "transactions": RazorpayXTransaction(razorpayx_config).get_all(count=count),
+        "contacts": RazorpayXContact(razorpayx_config).get_all(count=count),
+        "fund_accounts": RazorpayXFundAccount(razorpayx_config).get_all(count=count),
+    }
+
+    with open(path, "w") as f:
+        json.dump(fixtures, f, indent=1)
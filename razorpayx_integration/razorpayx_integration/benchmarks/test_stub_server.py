@@ -0,0 +1,130 @@
+# Copyright (c) 2025, Resilient Tech and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils.password import set_encrypted_password
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.apis.base import get_base_api_url
+from razorpayx_integration.razorpayx_integration.apis.payout import RazorpayXPayout
+from razorpayx_integration.razorpayx_integration.benchmarks.stub_server import (
+    INJECTED_ERRORS,
+    run_stub_server,
+)
+
+CONFIG = "_Test RazorpayX Stub Config"
+GENERATED_PAYOUTS = 250
+
+
+def get_payout_details(**kwargs) -> dict:
+    return {
+        "amount": 100,
+        "mode": "NEFT",
+        "fund_account_id": "fa_stubFixture0001",
+        "source_doctype": "Payment Entry",
+        "source_docname": "_Test Stub PE 1",
+        "party_type": "Supplier",
+        "description": "Stub Test Payout",
+        **kwargs,
+    }
+
+
+class TestStubServer(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # port 0 picks a free port
+        cls.server = run_stub_server(port=0, generate=GENERATED_PAYOUTS)
+
+        # requests of this process only are sent to the stub
+        frappe.local.conf.razorpayx_base_api_url = cls.server.base_url
+
+        # rows only, RazorpayX credentials are not validated by the stub
+        frappe.get_doc(
+            {
+                "doctype": RAZORPAYX_CONFIG,
+                "name": CONFIG,
+                "key_id": "rzp_test_stub",
+                "key_secret": "*" * 8,
+                "webhook_secret": "*" * 8,
+                "account_number": "2323230000000001",
+            }
+        ).db_insert()
+        set_encrypted_password(RAZORPAYX_CONFIG, CONFIG, "stub_secret", "key_secret")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        frappe.local.conf.pop("razorpayx_base_api_url", None)
+
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.error_rate = 0
+
+    def test_base_api_url(self):
+        self.assertEqual(get_base_api_url(), self.server.base_url)
+
+    def test_get_all_paging(self):
+        payouts = RazorpayXPayout(CONFIG).get_all(count=150, page_size=40)
+
+        # 4 pages of 40, 40, 40 and 30 items
+        self.assertEqual(len(payouts), 150)
+        self.assertEqual(len({payout["id"] for payout in payouts}), 150)
+
+        created_at = [payout["created_at"] for payout in payouts]
+        self.assertEqual(created_at, sorted(created_at, reverse=True))
+
+        # all the payouts, the last page is partial
+        payouts = RazorpayXPayout(CONFIG).get_all()
+
+        self.assertGreater(len(payouts), GENERATED_PAYOUTS)
+        self.assertEqual(len(payouts), len(self.server.state.items["payouts"]))
+
+    def test_idempotent_payout(self):
+        payout = RazorpayXPayout(CONFIG).pay(get_payout_details())
+
+        # same request is replayed with the same payout
+        self.assertEqual(
+            RazorpayXPayout(CONFIG).pay(get_payout_details())["id"], payout["id"]
+        )
+
+        # changed request with the same idempotency key is rejected
+        with self.assertRaisesRegex(frappe.ValidationError, "pay with a new document"):
+            RazorpayXPayout(CONFIG).pay(get_payout_details(amount=200))
+
+        # another document creates another payout
+        self.assertNotEqual(
+            RazorpayXPayout(CONFIG).pay(
+                get_payout_details(source_docname="_Test Stub PE 2")
+            )["id"],
+            payout["id"],
+        )
+
+    def test_injected_error_is_logged(self):
+        self.server.error_rate = 1
+
+        with (
+            patch(
+                "razorpayx_integration.razorpayx_integration.apis.base.enqueue_integration_request"
+            ) as enqueue_integration_request,
+            self.assertRaises(frappe.ValidationError),
+        ):
+            RazorpayXPayout(CONFIG).get_by_id("pout_stubFixture0001")
+
+        ir_log = enqueue_integration_request.call_args.kwargs
+
+        self.assertEqual(
+            ir_log["integration_request_service"],
+            "RazorpayX - Fetch Single Payout Details",
+        )
+        self.assertIn(
+            ir_log["error"],
+            [description for _status, _code, description in INJECTED_ERRORS],
+        )
+        self.assertIn("error", ir_log["output"])
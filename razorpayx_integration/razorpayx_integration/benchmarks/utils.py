@@ -0,0 +1,143 @@
+import json
+import time
+from contextlib import contextmanager
+from statistics import mean, quantiles
+
+import frappe
+
+
+class Timer:
+    """
+    Collect elapsed times (in milliseconds) of the measured blocks.
+
+    ---
+    Example Usage:
+    ```py
+    timer = Timer()
+
+    with timer.measure():
+        do_something()
+
+    timer.summary()  # {"count": 1, "mean": 1.2, "p50": 1.2, "p95": 1.2, ...}
+    ```
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    @contextmanager
+    def measure(self):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.add((time.perf_counter() - start) * 1000)
+
+    def add(self, elapsed: float):
+        self.samples.append(elapsed)
+
+    def summary(self) -> dict:
+        return summarize(self.samples)
+
+
+class QueryCounter:
+    """
+    Count the DB queries executed within the measured blocks.
+
+    `frappe.db.sql` is wrapped only while the block runs, the same way
+    Frappe's recorder does.
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    @contextmanager
+    def measure(self):
+        count = 0
+        sql = frappe.db.sql
+
+        def counted_sql(*args, **kwargs):
+            nonlocal count
+            count += 1
+            return sql(*args, **kwargs)
+
+        frappe.db.sql = counted_sql
+
+        try:
+            yield
+        finally:
+            frappe.db.sql = sql
+            self.samples.append(count)
+
+    def summary(self) -> dict:
+        return summarize(self.samples)
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Get count, mean, p50, p95, p99 and max of the given samples.
+    """
+    if not samples:
+        return {"count": 0}
+
+    if len(samples) == 1:
+        p50 = p95 = p99 = samples[0]
+    else:
+        percentiles = quantiles(samples, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+
+    return {
+        "count": len(samples),
+        "mean": round(mean(samples), 3),
+        "p50": round(p50, 3),
+        "p95": round(p95, 3),
+        "p99": round(p99, 3),
+        "max": round(max(samples), 3),
+    }
+
+
+def find_regressions(
+    current: dict,
+    baseline: dict,
+    threshold: float,
+    metric: str = "p95",
+) -> list[str]:
+    """
+    Compare the benchmark results with the baseline.
+
+    :param current: Current results `{group: {stage: summary}}`.
+    :param baseline: Baseline results in the same format.
+    :param threshold: Allowed slowdown ratio (Ex. `0.2` for 20%).
+    :param metric: Summary metric to compare.
+
+    ---
+    Returns human readable regressions, empty if none.
+    """
+    regressions = []
+
+    for group, stages in current.items():
+        for stage, summary in stages.items():
+            base_value = baseline.get(group, {}).get(stage, {}).get(metric)
+            value = summary.get(metric)
+
+            if not base_value or value is None:
+                continue
+
+            if value > base_value * (1 + threshold):
+                regressions.append(
+                    f"{group} > {stage}: {metric} {value} vs baseline {base_value} "
+                    f"(+{round((value / base_value - 1) * 100, 1)}%)"
+                )
+
+    return regressions
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(path: str, results: dict):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,375 @@
+"""
+Webhook ingestion benchmark.
+
+Replays signed synthetic RazorpayX payloads against a (test) site and measures
+the listener, queue and processor stages per event.
+
+⚠️ Run only on a test site. Processors update the referenced Payment Entry.
+"""
+
+import json
+import time
+from hmac import new as hmac
+
+import frappe
+from frappe.utils import now_datetime
+from frappe.utils.password import get_decrypted_password
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.benchmarks.utils import (
+    QueryCounter,
+    Timer,
+)
+from razorpayx_integration.razorpayx_integration.constants.webhooks import (
+    PAYOUT_EVENT,
+    PAYOUT_LINK_EVENT,
+    TRANSACTION_EVENT,
+)
+from razorpayx_integration.razorpayx_integration.utils.webhook import (
+    authenticate_webhook_request,
+    get_webhook_payload,
+    is_unsupported_event,
+    log_webhook_request,
+    process_webhook,
+)
+
+WEBHOOK_PATH = (
+    "razorpayx_integration.razorpayx_integration.utils.webhook.webhook_listener"
+)
+RESULTS_KEY = "razorpayx_webhook_benchmark"
+
+DEFAULT_EVENTS = (
+    PAYOUT_EVENT.QUEUED.value,
+    PAYOUT_EVENT.INITIATED.value,
+    PAYOUT_EVENT.PROCESSED.value,
+    PAYOUT_EVENT.FAILED.value,
+    PAYOUT_LINK_EVENT.CANCELLED.value,
+    TRANSACTION_EVENT.CREATED.value,
+)
+
+
+###### PAYLOADS ######
+def get_sample_payload(
+    event: str,
+    account_id: str,
+    source_docname: str,
+    sequence: int = 0,
+) -> dict:
+    """
+    Get a synthetic webhook payload for the given event.
+
+    Shape follows the documented samples referred in
+    `RazorpayXWebhook.setup_respective_webhook_payload`.
+
+    :param event: Webhook event (Ex. `payout.processed`).
+    :param account_id: RazorpayX Account ID (Business ID).
+    :param source_docname: Payment Entry to be referred in `notes`.
+    :param sequence: Used to generate unique ids.
+    """
+    event_type, status = event.split(".", 1)
+    created_at = int(time.time())
+    notes = {
+        "source_doctype": "Payment Entry",
+        "source_docname": source_docname,
+        "description": "Benchmark",
+    }
+
+    if event_type == "payout_link":
+        entity = {
+            "id": f"poutlk_bench{sequence:08d}",
+            "entity": "payout_link",
+            "status": status,
+            "amount": 100000,
+            "currency": "INR",
+            "purpose": "payout",
+            "notes": notes,
+            "created_at": created_at,
+        }
+
+    elif event_type == "transaction":
+        entity = {
+            "id": f"txn_bench{sequence:08d}",
+            "entity": "transaction",
+            "amount": 100000,
+            "currency": "INR",
+            "credit": 100000,
+            "debit": 0,
+            "balance": 10000000,
+            "source": {
+                "id": f"rvrsl_bench{sequence:08d}",
+                "entity": "reversal",
+                "payout_id": f"pout_bench{sequence:08d}",
+                "amount": 100000,
+                "fee": 0,
+                "tax": 0,
+                "currency": "INR",
+                "utr": f"BENCH{sequence:010d}",
+                "notes": notes,
+                "created_at": created_at,
+            },
+            "created_at": created_at,
+        }
+
+    else:
+        entity = {
+            "id": f"pout_bench{sequence:08d}",
+            "entity": "payout",
+            "fund_account_id": f"fa_bench{sequence:08d}",
+            "amount": 100000,
+            "currency": "INR",
+            "fees": 590,
+            "tax": 90,
+            "fee_type": "free_payout" if sequence % 2 else None,
+            "status": "processing" if status == "initiated" else status,
+            "utr": f"BENCH{sequence:010d}",
+            "mode": "IMPS",
+            "purpose": "payout",
+            "reference_id": f"Payment Entry-{source_docname}",
+            "narration": "Benchmark",
+            "notes": notes,
+            "created_at": created_at,
+        }
+
+    return {
+        "entity": "event",
+        "account_id": f"acc_{account_id.removeprefix('acc_')}",
+        "event": event,
+        "contains": [event_type],
+        "payload": {event_type: {"entity": entity}},
+        "created_at": created_at,
+    }
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    return hmac(secret.encode(), body, "sha256").hexdigest()
+
+
+###### BENCHMARK ######
+class WebhookBenchmark:
+    """
+    Benchmark the RazorpayX webhook ingestion.
+
+    :param razorpayx_config: RazorpayX Configuration which receives the webhooks.
+    :param events: Events to be replayed.
+    :param iterations: Number of payloads replayed per event.
+    :param payment_entry: Payment Entry referred in payloads (Default: non existing one).
+    :param via_queue: Process webhooks in background workers to measure queue lag.
+
+    ---
+    Stages measured per event:
+    - `listener`: Authentication (HMAC), support check and Integration Request log.
+    - `queue_lag`: Enqueue to start of processing (only with `via_queue`).
+    - `processor`: `process_webhook` time.
+    - `listener_queries` / `processor_queries`: DB queries executed.
+    """
+
+    def __init__(
+        self,
+        razorpayx_config: str,
+        events: list[str] | tuple[str] | None = None,
+        iterations: int = 100,
+        *,
+        payment_entry: str | None = None,
+        via_queue: bool = False,
+    ):
+        self.razorpayx_config = razorpayx_config
+        self.events = events or DEFAULT_EVENTS
+        self.iterations = iterations
+        self.payment_entry = payment_entry or "BENCHMARK-PE-DOES-NOT-EXIST"
+        self.via_queue = via_queue
+
+        self.account_id = frappe.db.get_value(
+            RAZORPAYX_CONFIG, razorpayx_config, "account_id"
+        )
+        self.secret = get_decrypted_password(
+            RAZORPAYX_CONFIG, razorpayx_config, "webhook_secret", raise_exception=False
+        )
+
+        if not self.account_id or not self.secret:
+            frappe.throw(
+                f"Account ID and Webhook Secret must be set in {RAZORPAYX_CONFIG}: {razorpayx_config}"
+            )
+
+    def run(self) -> dict:
+        """
+        Replay the payloads and return the results.
+
+        ```py
+        {
+            "payout.processed": {
+                "listener": {"count": 100, "mean": 3.1, "p50": 2.9, "p95": 4.2, ...},
+                "processor": {...},
+                ...
+            }
+        }
+        ```
+        """
+        results = {}
+
+        for event in self.events:
+            results[event] = self.run_event(event)
+
+        return results
+
+    def run_event(self, event: str) -> dict:
+        listener = Timer()
+        listener_queries = QueryCounter()
+        processor = Timer()
+        processor_queries = QueryCounter()
+        enqueued = []
+
+        for sequence in range(self.iterations):
+            payload = get_sample_payload(
+                event, self.account_id, self.payment_entry, sequence
+            )
+            body = json.dumps(payload).encode()
+            self.set_request(body, f"evt_bench_{event}_{sequence}")
+
+            with listener.measure(), listener_queries.measure():
+                integration_request = self.listen()
+
+            if not integration_request:
+                continue
+
+            # `process_webhook` rolls back on failure, including the Integration Request
+            frappe.db.commit()
+
+            if self.via_queue:
+                enqueued.append(self.enqueue(payload, integration_request, sequence))
+                continue
+
+            with processor.measure(), processor_queries.measure():
+                process_webhook(payload, integration_request)
+
+            # keep the test site clean (processed changes only)
+            frappe.db.rollback()
+
+        result = {
+            "listener": listener.summary(),
+            "listener_queries": listener_queries.summary(),
+        }
+
+        if self.via_queue:
+            result.update(self.collect_queued_results(event, enqueued))
+        else:
+            result["processor"] = processor.summary()
+            result["processor_queries"] = processor_queries.summary()
+
+        return result
+
+    def set_request(self, body: bytes, event_id: str):
+        """
+        Set the request as it is received by the webhook listener.
+        """
+        environ = EnvironBuilder(
+            method="POST",
+            path=f"/api/method/{WEBHOOK_PATH}",
+            data=body,
+            content_type="application/json",
+            headers={
+                "X-Razorpay-Event-Id": event_id,
+                "X-Razorpay-Signature": sign_payload(body, self.secret),
+            },
+        ).get_environ()
+
+        frappe.local.request = Request(environ)
+        frappe.local.request_ip = "127.0.0.1"
+        frappe.local.form_dict = frappe._dict(json.loads(body), cmd=WEBHOOK_PATH)
+        frappe.flags.razorpayx_webhook_payload = None
+
+    def listen(self) -> str | None:
+        """
+        Same stages as `webhook_listener` without the rate limiter.
+        """
+        if not authenticate_webhook_request():
+            return
+
+        payload = get_webhook_payload()
+
+        if is_unsupported_event(payload):
+            return
+
+        return log_webhook_request(payload).name
+
+    def enqueue(self, payload: dict, integration_request: str, sequence: int) -> str:
+        job_id = f"{RESULTS_KEY}_{payload['event']}_{sequence}"
+
+        frappe.enqueue(
+            process_benchmarked_webhook,
+            payload=payload,
+            integration_request=integration_request,
+            enqueued_at=time.time(),
+            result_field=job_id,
+        )
+
+        return job_id
+
+    def collect_queued_results(
+        self, event: str, job_ids: list[str], timeout: int = 600
+    ) -> dict:
+        """
+        Wait for the queued webhooks to be processed and collect the results.
+        """
+        queue_lag = Timer()
+        processor = Timer()
+        processor_queries = QueryCounter()
+        pending = set(job_ids)
+        deadline = time.time() + timeout
+
+        while pending and time.time() < deadline:
+            for job_id in list(pending):
+                result = frappe.cache.hget(RESULTS_KEY, job_id)
+
+                if not result:
+                    continue
+
+                queue_lag.add(result["queue_lag"])
+                processor.add(result["processor"])
+                processor_queries.samples.append(result["queries"])
+
+                frappe.cache.hdel(RESULTS_KEY, job_id)
+                pending.discard(job_id)
+
+            if pending:
+                time.sleep(0.5)
+
+        if pending:
+            frappe.throw(
+                f"{len(pending)} {event} webhooks are not processed within {timeout} seconds. Are workers running?"
+            )
+
+        return {
+            "queue_lag": queue_lag.summary(),
+            "processor": processor.summary(),
+            "processor_queries": processor_queries.summary(),
+        }
+
+
+def process_benchmarked_webhook(
+    payload: dict,
+    integration_request: str,
+    enqueued_at: float,
+    result_field: str,
+):
+    """
+    Process the webhook in the background and save the measurements.
+    """
+    queue_lag = (time.time() - enqueued_at) * 1000
+    processor = Timer()
+    queries = QueryCounter()
+
+    with processor.measure(), queries.measure():
+        process_webhook(payload, integration_request)
+
+    frappe.cache.hset(
+        RESULTS_KEY,
+        result_field,
+        {
+            "queue_lag": queue_lag,
+            "processor": processor.samples[0],
+            "queries": queries.samples[0],
+            "processed_on": str(now_datetime()),
+        },
+    )
@@ -3,7 +3,23 @@ const PE_BASE_PATH = "razorpayx_integration.razorpayx_integration.server_overrid
 
 const TRANSFER_METHOD = payment_integration_utils.PAYMENT_TRANSFER_METHOD;
 
+const PAYOUT_RESULT_EVENT = "razorpayx_payout_result";
+
 frappe.ui.form.on("Payment Entry", {
+	setup: function (frm) {
+		// payout is made in background after submission
+		frappe.realtime.on(PAYOUT_RESULT_EVENT, (data) => {
+			if (data.docname !== frm.docname) return;
+
+			frappe.show_alert({
+				message: data.message,
+				indicator: data.success ? (data.update_pending ? "orange" : "green") : "red",
+			});
+
+			frm.reload_doc();
+		});
+	},
+
 	refresh: async function (frm) {
 		// permission checks
 		const permission = has_payout_permissions(frm);
@@ -61,8 +77,8 @@ frappe.ui.form.on("Payment Entry", {
 		if (!frm.__making_payout) return;
 
 		frappe.show_alert({
-			message: __("Payout has been made successfully."),
-			indicator: "green",
+			message: __("Payout is being made via RazorpayX."),
+			indicator: "blue",
 		});
 
 		delete frm.__making_payout;
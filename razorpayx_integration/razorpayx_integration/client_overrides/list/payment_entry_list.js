@@ -0,0 +1,175 @@
+// ############ CONSTANTS ############ //
+const PE_BASE_PATH = "razorpayx_integration.razorpayx_integration.server_overrides.doctype.payment_entry";
+const BULK_PAYOUT_PROGRESS_EVENT = "razorpayx_bulk_payout_progress";
+const BULK_CANCEL_RESULT_EVENT = "razorpayx_bulk_cancel_result";
+
+frappe.listview_settings["Payment Entry"] = frappe.listview_settings["Payment Entry"] || {};
+
+const original_onload = frappe.listview_settings["Payment Entry"].onload;
+
+frappe.listview_settings["Payment Entry"].onload = function (listview) {
+	if (original_onload) original_onload(listview);
+
+	if (!frappe.model.can_submit("Payment Entry")) return;
+
+	listview.page.add_actions_menu_item(__("Make Payout via RazorpayX"), () => make_bulk_payout(listview));
+
+	if (!frappe.model.can_cancel("Payment Entry")) return;
+
+	listview.page.add_actions_menu_item(__("Cancel Payout via RazorpayX"), () => cancel_bulk_payout(listview));
+	listview.page.add_actions_menu_item(__("Mark Payouts for Cancellation"), () =>
+		mark_payouts_for_cancellation(listview)
+	);
+};
+
+// ############ BULK PAYOUT HELPERS ############ //
+function make_bulk_payout(listview) {
+	const docnames = listview.get_checked_items(true);
+
+	if (!docnames.length) {
+		frappe.throw(__("Please select Payment Entries to make payout."));
+	}
+
+	payment_integration_utils.authenticate_payment_entries(docnames, async (auth_id) => {
+		const response = await frappe.call({
+			method: `${PE_BASE_PATH}.make_bulk_payout_with_razorpayx`,
+			args: { auth_id, docnames },
+			freeze: true,
+			freeze_message: __("Queuing Payouts ..."),
+		});
+
+		if (!response.message) return;
+
+		const { bulk_id, held } = response.message;
+
+		listview.clear_checked_items();
+
+		if (held) {
+			frappe.show_alert({
+				message: __(
+					"{0} payouts are held due to low account balance and will be made once the balance allows.",
+					[held]
+				),
+				indicator: "orange",
+			});
+		}
+
+		if (!bulk_id) {
+			listview.refresh();
+			return;
+		}
+
+		track_bulk_payout_progress(listview, bulk_id);
+	});
+}
+
+function track_bulk_payout_progress(listview, bulk_id) {
+	const handler = (data) => {
+		if (data.bulk_id !== bulk_id) return;
+
+		const processed = data.succeeded + data.failed;
+
+		frappe.show_progress(
+			__("Making Payouts via RazorpayX"),
+			processed,
+			data.total,
+			__("{0} of {1} processed ({2} failed)", [processed, data.total, data.failed]),
+			true
+		);
+
+		if (!data.completed) return;
+
+		frappe.realtime.off(BULK_PAYOUT_PROGRESS_EVENT, handler);
+		frappe.hide_progress();
+		listview.refresh();
+
+		frappe.show_alert({
+			message: __("{0} payouts made and {1} failed.", [data.succeeded, data.failed]),
+			indicator: data.failed ? "orange" : "green",
+		});
+	};
+
+	frappe.realtime.on(BULK_PAYOUT_PROGRESS_EVENT, handler);
+}
+
+// ############ BULK CANCEL HELPERS ############ //
+function cancel_bulk_payout(listview) {
+	const docnames = listview.get_checked_items(true);
+
+	if (!docnames.length) {
+		frappe.throw(__("Please select Payment Entries to cancel payout."));
+	}
+
+	frappe.confirm(
+		__(
+			"Queued payouts and issued payout links of {0} Payment Entries will be cancelled along with the Payment Entries. Continue?",
+			[docnames.length]
+		),
+		async () => {
+			const response = await frappe.call({
+				method: `${PE_BASE_PATH}.cancel_bulk_payout_with_razorpayx`,
+				args: { docnames },
+				freeze: true,
+				freeze_message: __("Queuing Cancellation ..."),
+			});
+
+			if (!response.message) return;
+
+			listview.clear_checked_items();
+			frappe.realtime.on(BULK_CANCEL_RESULT_EVENT, show_bulk_cancel_result);
+
+			function show_bulk_cancel_result(data) {
+				frappe.realtime.off(BULK_CANCEL_RESULT_EVENT, show_bulk_cancel_result);
+				listview.refresh();
+
+				frappe.show_alert({
+					message: __("{0} payouts cancelled, {1} failed and {2} skipped.", [
+						data.cancelled.length,
+						data.failed.length,
+						data.skipped.length,
+					]),
+					indicator: data.failed.length ? "orange" : "green",
+				});
+			}
+		}
+	);
+}
+
+function mark_payouts_for_cancellation(listview) {
+	const docnames = listview.get_checked_items(true);
+
+	if (!docnames.length) {
+		frappe.throw(__("Please select Payment Entries to mark payouts for cancellation."));
+	}
+
+	const dialog = new frappe.ui.Dialog({
+		title: __("Mark Payouts for Cancellation"),
+		fields: [
+			{
+				fieldname: "cancel_payout",
+				label: __("Cancel Payout"),
+				fieldtype: "Check",
+				default: 1,
+				description: __(
+					"Payouts will be cancelled along with the Payment Entries cancelled in the next 10 minutes if checked."
+				),
+			},
+		],
+		primary_action_label: __("Mark"),
+		primary_action: async (values) => {
+			dialog.hide();
+
+			await frappe.call({
+				method: `${PE_BASE_PATH}.mark_payouts_for_cancellation`,
+				args: { docnames, cancel: values.cancel_payout },
+			});
+
+			frappe.show_alert({
+				message: __("{0} Payment Entries marked. Cancel them to proceed.", [docnames.length]),
+				indicator: "blue",
+			});
+		},
+	});
+
+	dialog.show();
+}
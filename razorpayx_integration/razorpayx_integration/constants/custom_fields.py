@@ -100,6 +100,17 @@ CUSTOM_FIELDS = {
             "permlevel": PERMISSION_LEVEL.SEVEN.value,
             "no_copy": 1,
         },
+        {
+            "fieldname": "razorpayx_payout_held",
+            "label": "RazorpayX Payout Held For Balance",
+            "fieldtype": "Check",
+            "insert_after": "razorpayx_payout_link_id",
+            "read_only": 1,
+            "hidden": 1,
+            "print_hide": 1,
+            "permlevel": PERMISSION_LEVEL.SEVEN.value,
+            "no_copy": 1,
+        },
         #### PAYMENT SECTION END ####
     ],
 }
@@ -0,0 +1,22 @@
+"""
+Database indexes on the standard DocTypes' tables.
+
+Format: `{doctype: {index_name: [fields]}}`
+"""
+
+INDEXES = {
+    "Payment Entry": {
+        # filters and keyset pagination (`posting_date`, `name`) of the payout report
+        "razorpayx_payout_report_index": [
+            "company",
+            "integration_doctype",
+            "make_bank_online_payment",
+            "posting_date",
+            "name",
+        ],
+    },
+    "Journal Entry": {
+        # existence checks of the fees and reversal JEs by Payout ID / Reversal ID
+        "razorpayx_cheque_no_index": ["cheque_no"],
+    },
+}
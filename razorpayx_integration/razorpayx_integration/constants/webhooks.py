@@ -83,3 +83,6 @@ SUPPORTED_EVENTS = (
 
 # payload > source > entity
 SUPPORTED_TRANSACTION_TYPES = (TRANSACTION_TYPE.REVERSAL.value,)
+
+# request headers logged in the Integration Request
+WEBHOOK_LOG_HEADERS = ("X-Razorpay-Event-Id", "Content-Type", "User-Agent")
@@ -61,6 +61,16 @@ frappe.ui.form.on("RazorpayX Configuration", {
 		frm.add_custom_button(__("Sync Transactions"), () => {
 			prompt_transactions_sync_date(frm);
 		});
+
+		frm.add_custom_button(__("Register Fund Accounts"), () => {
+			register_fund_accounts(frm);
+		});
+
+		if (frm.doc.automate_fees_accounting) {
+			frm.add_custom_button(__("Retry Failed Fees JEs"), () => {
+				retry_failed_fee_journal_entries();
+			});
+		}
 	},
 
 	after_save: function (frm) {
@@ -73,6 +83,38 @@ frappe.ui.form.on("RazorpayX Configuration", {
 	},
 });
 
+function register_fund_accounts(frm) {
+	frappe.confirm(
+		__(
+			"Contacts and Fund Accounts of all Suppliers and Employees will be registered in RazorpayX in background. Do you want to continue?"
+		),
+		() => {
+			frappe.call({
+				method: "razorpayx_integration.razorpayx_integration.utils.fund_account.register_party_fund_accounts",
+				args: { config: frm.docname },
+				callback: function (r) {
+					frappe.show_alert({
+						message: __("{0} accounts are queued for registration.", [r.message || 0]),
+						indicator: "blue",
+					});
+				},
+			});
+		}
+	);
+}
+
+function retry_failed_fee_journal_entries() {
+	frappe.call({
+		method: "razorpayx_integration.razorpayx_integration.utils.fee_journal_entry.retry_failed_fee_journal_entries",
+		callback: function (r) {
+			frappe.show_alert({
+				message: __("{0} fees Journal Entries are queued for creation.", [r.message || 0]),
+				indicator: "blue",
+			});
+		},
+	});
+}
+
 function prompt_transactions_sync_date(frm) {
 	const default_range = [frm.doc.last_sync_on || frappe.datetime.month_start(), frappe.datetime.now_date()];
 	const dialog = new frappe.ui.Dialog({
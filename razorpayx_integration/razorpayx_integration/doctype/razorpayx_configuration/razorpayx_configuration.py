@@ -26,6 +26,7 @@ class RazorpayXConfiguration(Document):
         create_je_on_reversal: DF.Check
         creditors_account: DF.Link | None
         disabled: DF.Check
+        enable_profiling: DF.Check
         ifsc_code: DF.Data | None
         key_id: DF.Data
         key_secret: DF.Password
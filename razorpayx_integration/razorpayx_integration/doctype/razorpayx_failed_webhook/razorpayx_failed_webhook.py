@@ -0,0 +1,255 @@
+# Copyright (c) 2025, Resilient Tech and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+from razorpayx_integration.constants import RAZORPAYX_FAILED_WEBHOOK
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_LINK_ORDERS,
+    PAYOUT_ORDERS,
+    PAYOUT_STATUS,
+)
+from razorpayx_integration.razorpayx_integration.constants.webhooks import (
+    EVENTS_TYPE,
+)
+
+REPLAYABLE_STATUSES = ("Pending", "Failed")
+
+
+class RazorpayXFailedWebhook(Document):
+    # begin: auto-generated types
+    # This code is auto-generated. Do not modify anything in this block.
+
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from frappe.types import DF
+
+        error: DF.Code | None
+        error_class: DF.Data | None
+        event: DF.Data | None
+        integration_request: DF.Link
+        last_replayed_on: DF.Datetime | None
+        payload: DF.Code | None
+        razorpayx_config: DF.Link | None
+        reference_id: DF.Data | None
+        replay_count: DF.Int
+        replay_order: DF.Int
+        status: DF.Literal["Pending", "Failed", "Replayed"]
+    # end: auto-generated types
+
+    def replay(self) -> bool:
+        """
+        Replay the failed webhook with the same processor as `process_webhook`.
+
+        - Each replay is a separate transaction.
+        - Already replayed webhook is skipped (idempotent).
+
+        ---
+        Note: ⚠️ Document should be fetched with `for_update=True` to avoid
+        concurrent replays of the same webhook.
+        """
+        from razorpayx_integration.razorpayx_integration.utils.webhook import (
+            run_webhook_processor,
+        )
+
+        if self.status not in REPLAYABLE_STATUSES:
+            return False
+
+        values = {
+            "replay_count": self.replay_count + 1,
+            "last_replayed_on": now_datetime(),
+        }
+
+        try:
+            run_webhook_processor(
+                frappe.parse_json(self.payload), self.integration_request
+            )
+
+        except Exception as e:
+            frappe.db.rollback()
+
+            self.db_set(
+                {
+                    **values,
+                    "status": "Failed",
+                    "error_class": get_error_class(e),
+                    "error": frappe.get_traceback(),
+                }
+            )
+
+            return False
+
+        self.db_set({**values, "status": "Replayed"})
+        frappe.db.set_value(
+            "Integration Request", self.integration_request, "status", "Completed"
+        )
+
+        return True
+
+
+###### APIs ######
+@frappe.whitelist()
+def replay_failed_webhooks(
+    names: list[str] | str | None = None,
+    event: str | None = None,
+    error_class: str | None = None,
+    max_parallel_jobs: int = 8,
+) -> int:
+    """
+    Replay failed webhooks in background jobs.
+
+    - Webhooks of the same payout are replayed sequentially in status order.
+    - Different payouts are replayed concurrently in up to `max_parallel_jobs` jobs.
+
+    :param names: Failed webhooks to replay. If not given, all pending/failed are replayed.
+    :param event: Replay only given event (Ex. `payout.processed`).
+    :param error_class: Replay only webhooks failed with given error class.
+    :param max_parallel_jobs: Maximum number of jobs processing concurrently.
+
+    ---
+    Returns number of webhooks enqueued for the replay.
+    """
+    frappe.has_permission(RAZORPAYX_FAILED_WEBHOOK, "write", throw=True)
+
+    filters = {"status": ("in", REPLAYABLE_STATUSES)}
+
+    if names:
+        filters["name"] = ("in", frappe.parse_json(names))
+
+    if event:
+        filters["event"] = event
+
+    if error_class:
+        filters["error_class"] = error_class
+
+    failed_webhooks = frappe.get_all(
+        RAZORPAYX_FAILED_WEBHOOK,
+        filters=filters,
+        fields=["name", "reference_id"],
+        order_by="replay_order asc, creation asc",
+    )
+
+    if not failed_webhooks:
+        return 0
+
+    # group by payout to keep the order of events
+    groups = {}
+
+    for webhook in failed_webhooks:
+        groups.setdefault(webhook.reference_id or webhook.name, []).append(webhook.name)
+
+    chunks = [[] for _ in range(min(int(max_parallel_jobs) or 1, len(groups)))]
+
+    for idx, group in enumerate(groups.values()):
+        chunks[idx % len(chunks)].extend(group)
+
+    for chunk in chunks:
+        frappe.enqueue(
+            replay_webhooks,
+            queue="long",
+            timeout=len(chunk) * 60,
+            names=chunk,
+        )
+
+    return len(failed_webhooks)
+
+
+def replay_webhooks(names: list[str]):
+    """
+    Replay given failed webhooks sequentially.
+
+    :param names: Failed webhooks in order of replay.
+    """
+    frappe.set_user("Administrator")
+
+    for name in names:
+        doc = frappe.get_doc(RAZORPAYX_FAILED_WEBHOOK, name, for_update=True)
+        doc.replay()
+
+        frappe.db.commit()
+
+
+###### DEAD LETTER QUEUE ######
+def add_to_dead_letter_queue(
+    payload: dict, integration_request: str, error: Exception, config: str | None = None
+):
+    """
+    Store the failed webhook payload to replay it later.
+
+    :param payload: Webhook payload data.
+    :param integration_request: Integration Request docname.
+    :param error: Exception raised while processing the webhook.
+    :param config: RazorpayX Configuration name.
+    """
+    values = {
+        "status": "Pending",
+        "error_class": get_error_class(error),
+        "error": frappe.get_traceback(),
+    }
+
+    if name := frappe.db.exists(
+        RAZORPAYX_FAILED_WEBHOOK, {"integration_request": integration_request}
+    ):
+        frappe.db.set_value(RAZORPAYX_FAILED_WEBHOOK, name, values)
+        return
+
+    frappe.get_doc(
+        {
+            **values,
+            "doctype": RAZORPAYX_FAILED_WEBHOOK,
+            "integration_request": integration_request,
+            "event": payload.get("event"),
+            "razorpayx_config": config,
+            "reference_id": get_reference_id(payload),
+            "replay_order": get_replay_order(payload),
+            "payload": frappe.as_json(payload),
+        }
+    ).insert(ignore_permissions=True)
+
+
+###### UTILITIES ######
+def get_error_class(error: Exception) -> str:
+    error_class = type(error)
+
+    if error_class.__module__ == "builtins":
+        return error_class.__qualname__
+
+    return f"{error_class.__module__}.{error_class.__qualname__}"
+
+
+def get_payload_entity(payload: dict) -> tuple[str, dict]:
+    event_type = (payload.get("event") or "").split(".")[0]
+    entity = payload.get("payload", {}).get(event_type, {}).get("entity") or {}
+
+    return event_type, entity
+
+
+def get_reference_id(payload: dict) -> str | None:
+    """
+    Get the Payout ID or Payout Link ID of the webhook.
+    """
+    event_type, entity = get_payload_entity(payload)
+
+    if event_type == EVENTS_TYPE.TRANSACTION.value:
+        return (entity.get("source") or {}).get("payout_id")
+
+    return entity.get("id")
+
+
+def get_replay_order(payload: dict) -> int:
+    """
+    Get the order of the webhook to replay events of the same payout in sequence.
+    """
+    event_type, entity = get_payload_entity(payload)
+    status = entity.get("status")
+
+    if event_type == EVENTS_TYPE.TRANSACTION.value:
+        return PAYOUT_ORDERS[PAYOUT_STATUS.REVERSED.value]
+
+    if event_type == EVENTS_TYPE.PAYOUT_LINK.value:
+        return PAYOUT_LINK_ORDERS.get(status, 0)
+
+    return PAYOUT_ORDERS.get(status, 0)
@@ -0,0 +1,35 @@
+// Copyright (c) 2025, Resilient Tech and contributors
+// For license information, please see license.txt
+const REPLAY_METHOD =
+	"razorpayx_integration.razorpayx_integration.doctype.razorpayx_failed_webhook.razorpayx_failed_webhook.replay_failed_webhooks";
+
+frappe.listview_settings["RazorpayX Failed Webhook"] = {
+	onload: function (listview) {
+		listview.page.add_inner_button(__("Replay All"), () => replay_failed_webhooks(listview));
+
+		listview.page.add_actions_menu_item(__("Replay"), () => {
+			const names = listview.get_checked_items(true);
+			if (!names.length) return;
+
+			replay_failed_webhooks(listview, names);
+		});
+	},
+};
+
+function replay_failed_webhooks(listview, names = null) {
+	frappe.call({
+		method: REPLAY_METHOD,
+		args: { names },
+		freeze: true,
+		callback: function (r) {
+			if (r.exc) return;
+
+			frappe.show_alert({
+				message: __("{0} webhooks are queued for replay.", [r.message || 0]),
+				indicator: "blue",
+			});
+
+			listview.refresh();
+		},
+	});
+}
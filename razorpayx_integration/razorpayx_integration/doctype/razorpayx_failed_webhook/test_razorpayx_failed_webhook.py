@@ -0,0 +1,135 @@
+# Copyright (c) 2025, Resilient Tech and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from razorpayx_integration.constants import RAZORPAYX_FAILED_WEBHOOK
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_failed_webhook.razorpayx_failed_webhook import (
+    add_to_dead_letter_queue,
+    get_reference_id,
+    get_replay_order,
+    replay_failed_webhooks,
+    replay_webhooks,
+)
+
+
+def get_payload(event: str, entity: dict) -> dict:
+    event_type = event.split(".")[0]
+
+    return {
+        "entity": "event",
+        "account_id": "acc_test_failed_webhook",
+        "event": event,
+        "contains": [event_type],
+        "payload": {event_type: {"entity": entity}},
+    }
+
+
+def get_payout_payload(payout_id: str, status: str) -> dict:
+    # without source notes, so processing finds no Payment Entry to update
+    return get_payload(f"payout.{status}", {"id": payout_id, "status": status})
+
+
+class TestRazorpayXFailedWebhook(FrappeTestCase):
+    def tearDown(self):
+        frappe.db.delete(
+            RAZORPAYX_FAILED_WEBHOOK, {"reference_id": ("like", "pout_test_%")}
+        )
+        frappe.db.delete(
+            "Integration Request",
+            {"integration_request_service": "RazorpayX - Failed Webhook Test"},
+        )
+        frappe.db.commit()
+
+    def add_failed_webhook(self, payload: dict) -> str:
+        ir = frappe.get_doc(
+            {
+                "doctype": "Integration Request",
+                "integration_request_service": "RazorpayX - Failed Webhook Test",
+                "status": "Failed",
+                "data": frappe.as_json(payload),
+            }
+        ).insert(ignore_permissions=True)
+
+        add_to_dead_letter_queue(payload, ir.name, ValueError("Test Failure"))
+
+        return frappe.db.get_value(
+            RAZORPAYX_FAILED_WEBHOOK, {"integration_request": ir.name}, "name"
+        )
+
+    def test_replay_order(self):
+        statuses = ("pending", "queued", "processing", "processed", "reversed")
+        orders = [
+            get_replay_order(get_payout_payload("pout_test_1", status))
+            for status in statuses
+        ]
+
+        self.assertEqual(orders, sorted(orders))
+        self.assertEqual(len(set(orders)), len(statuses))
+
+        # reversal transaction is replayed with the reversed payout
+        transaction = get_payload(
+            "transaction.created",
+            {"id": "txn_test_1", "source": {"payout_id": "pout_test_1"}},
+        )
+
+        self.assertEqual(get_replay_order(transaction), orders[-1])
+        self.assertEqual(get_reference_id(transaction), "pout_test_1")
+
+        link_orders = [
+            get_replay_order(
+                get_payload(
+                    f"payout_link.{status}", {"id": "poutlk_test_1", "status": status}
+                )
+            )
+            for status in ("issued", "processing", "processed")
+        ]
+
+        self.assertEqual(link_orders, sorted(link_orders))
+
+        self.assertEqual(
+            get_replay_order(get_payout_payload("pout_test_1", "unknown")), 0
+        )
+
+    def test_replay_group(self):
+        # added out of order
+        processed = self.add_failed_webhook(
+            get_payout_payload("pout_test_1", "processed")
+        )
+        queued = self.add_failed_webhook(get_payout_payload("pout_test_1", "queued"))
+        other = self.add_failed_webhook(get_payout_payload("pout_test_2", "processed"))
+
+        with patch.object(frappe, "enqueue") as enqueue:
+            count = replay_failed_webhooks(
+                names=[processed, queued, other], max_parallel_jobs=2
+            )
+
+        self.assertEqual(count, 3)
+
+        chunks = [call.kwargs["names"] for call in enqueue.call_args_list]
+
+        # same payout in the same job, in the order of status
+        self.assertIn([queued, processed], chunks)
+        self.assertIn([other], chunks)
+
+        replay_webhooks([queued, processed])
+
+        for name in (queued, processed):
+            webhook = frappe.get_doc(RAZORPAYX_FAILED_WEBHOOK, name)
+
+            self.assertEqual(webhook.status, "Replayed")
+            self.assertEqual(webhook.replay_count, 1)
+            self.assertEqual(
+                frappe.db.get_value(
+                    "Integration Request", webhook.integration_request, "status"
+                ),
+                "Completed",
+            )
+
+        # replayed webhook is skipped
+        webhook = frappe.get_doc(RAZORPAYX_FAILED_WEBHOOK, queued, for_update=True)
+        self.assertFalse(webhook.replay())
+        self.assertEqual(webhook.replay_count, 1)
@@ -0,0 +1,259 @@
+# Copyright (c) 2025, Resilient Tech and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from payment_integration_utils.payment_integration_utils.constants.payments import (
+    TRANSFER_METHOD as PAYOUT_MODE,
+)
+
+from razorpayx_integration.constants import RAZORPAYX_PARTY_FUND_ACCOUNT
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    FUND_ACCOUNT_TYPE,
+)
+
+
+class RazorpayXPartyFundAccount(Document):
+    # begin: auto-generated types
+    # This code is auto-generated. Do not modify anything in this block.
+
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from frappe.types import DF
+
+        account_type: DF.Literal["bank_account", "vpa"]
+        bank_account: DF.Link | None
+        bank_account_no: DF.Data | None
+        bank_ifsc: DF.Data | None
+        contact_id: DF.Data | None
+        error: DF.SmallText | None
+        fund_account_id: DF.Data | None
+        fund_account_key: DF.Data | None
+        party: DF.DynamicLink
+        party_type: DF.Link
+        razorpayx_config: DF.Link
+        status: DF.Literal["Registered", "Failed"]
+        upi_id: DF.Data | None
+    # end: auto-generated types
+
+    pass
+
+
+###### APIs ######
+def get_fund_account_id(config: str, payout_details: dict) -> str | None:
+    """
+    Get the RazorpayX Fund Account ID of the party's bank account or UPI ID.
+
+    :param config: RazorpayX Configuration name.
+    :param payout_details: Payout details of the Payment Entry.
+    """
+    return frappe.db.get_value(
+        RAZORPAYX_PARTY_FUND_ACCOUNT,
+        get_fund_account_key(config, get_account_details(payout_details)),
+        "fund_account_id",
+    )
+
+
+def get_contact_id(config: str, party_type: str, party: str) -> str | None:
+    """
+    Get the RazorpayX Contact ID of the party.
+
+    :param config: RazorpayX Configuration name.
+    :param party_type: Party Type (Ex. `Supplier`, `Employee`).
+    :param party: Party name.
+    """
+    return frappe.db.get_value(
+        RAZORPAYX_PARTY_FUND_ACCOUNT,
+        {
+            "razorpayx_config": config,
+            "party_type": party_type,
+            "party": party,
+            "contact_id": ("is", "set"),
+        },
+        "contact_id",
+        order_by="modified desc",
+    )
+
+
+def save_fund_account(
+    config: str,
+    account_details: dict,
+    contact_id: str,
+    fund_account_id: str,
+    bank_account: str | None = None,
+):
+    """
+    Save the RazorpayX Contact ID and Fund Account ID of the party's account.
+
+    :param config: RazorpayX Configuration name.
+    :param account_details: Party's account details (see `get_account_details`).
+    :param contact_id: RazorpayX Contact ID.
+    :param fund_account_id: RazorpayX Fund Account ID.
+    :param bank_account: Party's Bank Account name.
+    """
+    if not contact_id or not fund_account_id:
+        return
+
+    values = {
+        "contact_id": contact_id,
+        "fund_account_id": fund_account_id,
+        "status": "Registered",
+        "error": "",
+    }
+
+    if bank_account:
+        values["bank_account"] = bank_account
+
+    set_fund_account(config, account_details, values)
+
+
+def save_fund_account_failure(
+    config: str,
+    account_details: dict,
+    error: str,
+    contact_id: str | None = None,
+    bank_account: str | None = None,
+):
+    """
+    Save the failure of registering the party's account in RazorpayX.
+
+    :param config: RazorpayX Configuration name.
+    :param account_details: Party's account details (see `get_account_details`).
+    :param error: Error message.
+    :param contact_id: RazorpayX Contact ID, if contact is created.
+    :param bank_account: Party's Bank Account name.
+    """
+    values = {"fund_account_id": "", "status": "Failed", "error": error}
+
+    if contact_id:
+        values["contact_id"] = contact_id
+
+    if bank_account:
+        values["bank_account"] = bank_account
+
+    set_fund_account(config, account_details, values)
+
+
+def set_fund_account(config: str, account_details: dict, values: dict):
+    key = get_fund_account_key(config, account_details)
+
+    if frappe.db.exists(RAZORPAYX_PARTY_FUND_ACCOUNT, key):
+        frappe.db.set_value(RAZORPAYX_PARTY_FUND_ACCOUNT, key, values)
+        return
+
+    frappe.get_doc(
+        {
+            **account_details,
+            **values,
+            "doctype": RAZORPAYX_PARTY_FUND_ACCOUNT,
+            "razorpayx_config": config,
+            "fund_account_key": key,
+        }
+    ).insert(ignore_permissions=True, ignore_if_duplicate=True)
+
+
+def save_fund_account_from_payout(config: str, payout_details: dict, response: dict):
+    """
+    Save the Contact ID and Fund Account ID created (or matched) by composite payout.
+
+    :param config: RazorpayX Configuration name.
+    :param payout_details: Payout details of the Payment Entry.
+    :param response: Composite Payout API response.
+    """
+    if not response:
+        return
+
+    fund_account = response.get("fund_account") or {}
+
+    save_fund_account(
+        config,
+        get_account_details(payout_details),
+        contact_id=fund_account.get("contact_id")
+        or (fund_account.get("contact") or {}).get("id"),
+        fund_account_id=response.get("fund_account_id") or fund_account.get("id"),
+    )
+
+
+def discard_fund_account(config: str, payout_details: dict):
+    """
+    Discard the mapping in background when RazorpayX rejects the Fund Account ID.
+
+    Fund Account may be deactivated in RazorpayX. Next payout will be made with
+    composite payout, which creates (or matches) the Fund Account again.
+
+    Note: Enqueued to be independent of the failed transaction.
+    """
+    frappe.enqueue(
+        delete_fund_account,
+        key=get_fund_account_key(config, get_account_details(payout_details)),
+    )
+
+
+def delete_fund_account(key: str):
+    frappe.db.delete(RAZORPAYX_PARTY_FUND_ACCOUNT, {"name": key})
+
+
+###### UTILITIES ######
+def get_account_details(payout_details: dict) -> dict:
+    """
+    Get normalized party's account details from the payout details.
+
+    :param payout_details: Payout details of the Payment Entry.
+    """
+    payment_details = payout_details.get("party_payment_details") or {}
+
+    return normalize_account_details(
+        party_type=payout_details["party_type"],
+        party=payout_details.get("party_id"),
+        account_type=(
+            FUND_ACCOUNT_TYPE.VPA.value
+            if payout_details["mode"] == PAYOUT_MODE.UPI.value
+            else FUND_ACCOUNT_TYPE.BANK_ACCOUNT.value
+        ),
+        bank_account_no=payment_details.get("bank_account_no"),
+        bank_ifsc=payment_details.get("bank_ifsc"),
+        upi_id=payment_details.get("upi_id"),
+    )
+
+
+def normalize_account_details(
+    party_type: str,
+    party: str | None,
+    account_type: str,
+    bank_account_no: str | None = None,
+    bank_ifsc: str | None = None,
+    upi_id: str | None = None,
+) -> dict:
+    """
+    Get the party's account details in the same format for mapping and lookup.
+    """
+    details = {"party_type": party_type, "party": party, "account_type": account_type}
+
+    if account_type == FUND_ACCOUNT_TYPE.VPA.value:
+        return {**details, "upi_id": (upi_id or "").strip().lower()}
+
+    return {
+        **details,
+        "bank_account_no": (bank_account_no or "").strip(),
+        "bank_ifsc": (bank_ifsc or "").strip().upper(),
+    }
+
+
+def get_fund_account_key(config: str, account_details: dict) -> str:
+    """
+    Get the unique key of the party's account for the given configuration.
+    """
+    values = (
+        config,
+        account_details["party_type"],
+        account_details["party"] or "",
+        account_details["account_type"],
+        account_details.get("bank_account_no") or "",
+        account_details.get("bank_ifsc") or "",
+        account_details.get("upi_id") or "",
+    )
+
+    return hashlib.sha256("|".join(values).encode()).hexdigest()[:32]
@@ -0,0 +1,322 @@
+# Copyright (c) 2025, Resilient Tech and contributors
+# For license information, please see license.txt
+
+import hashlib
+from functools import partial
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Count, IfNull, Sum
+from frappe.utils import getdate, now_datetime
+
+from razorpayx_integration.constants import (
+    RAZORPAYX_CONFIG,
+    RAZORPAYX_PAYOUT_SUMMARY,
+)
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_STATUS,
+)
+
+STALE_SUMMARIES_KEY = "razorpayx_stale_payout_summaries"
+STALE_SUMMARIES_BATCH_SIZE = 500
+
+# Payment Entry is cancelled on these statuses, still the payout is summarized
+CANCELLED_PE_STATUSES = (
+    PAYOUT_STATUS.CANCELLED.value.title(),
+    PAYOUT_STATUS.FAILED.value.title(),
+    PAYOUT_STATUS.REJECTED.value.title(),
+)
+
+SUMMARY_FIELDS = (
+    "company",
+    "razorpayx_config",
+    "posting_date",
+    "payout_status",
+    "payout_mode",
+    "payout_count",
+    "paid_amount",
+    "fees",
+)
+
+
+class RazorpayXPayoutSummary(Document):
+    # begin: auto-generated types
+    # This code is auto-generated. Do not modify anything in this block.
+
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from frappe.types import DF
+
+        company: DF.Link
+        fees: DF.Currency
+        paid_amount: DF.Currency
+        payout_count: DF.Int
+        payout_mode: DF.Data | None
+        payout_status: DF.Data | None
+        posting_date: DF.Date
+        razorpayx_config: DF.Link
+        summary_key: DF.Data | None
+    # end: auto-generated types
+
+    pass
+
+
+###### APIs ######
+def mark_payout_summary_stale(payment_entries: list[dict]):
+    """
+    Mark the summaries of the Payment Entries' days to be updated.
+
+    Called on payout creation and status transitions. Marked after the commit
+    and recomputed by `update_stale_payout_summaries` in the next scheduler tick.
+
+    :param payment_entries: Payment Entries (or dicts) with `company` and `posting_date`.
+    """
+    members = {
+        f"{pe.company}|{getdate(pe.posting_date)}"
+        for pe in payment_entries
+        if pe.company and pe.posting_date
+    }
+
+    if not members:
+        return
+
+    frappe.db.after_commit.add(partial(add_stale_summaries, members))
+
+
+def mark_payout_summary_stale_by_names(docnames: list[str]):
+    if not docnames:
+        return
+
+    mark_payout_summary_stale(
+        frappe.get_all(
+            "Payment Entry",
+            filters={"name": ("in", docnames)},
+            fields=["company", "posting_date"],
+        )
+    )
+
+
+def rebuild_payout_summary(
+    company: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+):
+    """
+    Recompute the payout summaries from Payment Entries.
+
+    All the summaries are rebuilt if no filters are given.
+
+    :param company: Company name.
+    :param from_date: Starting posting date.
+    :param to_date: Ending posting date.
+    """
+    PE = frappe.qb.DocType("Payment Entry")
+    Payout = frappe.qb.DocType("Payment Entry").as_("payout")
+    apply_filters = partial(
+        apply_payout_filters, company=company, from_date=from_date, to_date=to_date
+    )
+
+    fees = get_fees_query(
+        apply_filters(frappe.qb.from_(Payout), Payout).select(
+            Payout.razorpayx_payout_id
+        )
+    )
+
+    query = apply_filters(
+        frappe.qb.from_(PE)
+        .left_join(fees)
+        .on(fees.cheque_no == PE.razorpayx_payout_id)
+        .select(
+            PE.company,
+            PE.integration_docname.as_("razorpayx_config"),
+            PE.posting_date,
+            PE.razorpayx_payout_status.as_("payout_status"),
+            PE.payment_transfer_method.as_("payout_mode"),
+            Count(PE.name).as_("payout_count"),
+            Sum(PE.paid_amount).as_("paid_amount"),
+            Sum(IfNull(fees.fees, 0)).as_("fees"),
+        )
+        .groupby(
+            PE.company,
+            PE.integration_docname,
+            PE.posting_date,
+            PE.razorpayx_payout_status,
+            PE.payment_transfer_method,
+        ),
+        PE,
+    )
+
+    filters = {}
+
+    if company:
+        filters["company"] = company
+
+    if from_date:
+        filters["posting_date"] = (">=", getdate(from_date))
+
+    if to_date:
+        filters["posting_date"] = (
+            ("between", [getdate(from_date), getdate(to_date)])
+            if from_date
+            else ("<=", getdate(to_date))
+        )
+
+    summaries = query.run(as_dict=True)
+
+    frappe.db.delete(RAZORPAYX_PAYOUT_SUMMARY, filters)
+
+    if not summaries:
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+
+    frappe.db.bulk_insert(
+        RAZORPAYX_PAYOUT_SUMMARY,
+        fields=[
+            "name",
+            "summary_key",
+            *SUMMARY_FIELDS,
+            "creation",
+            "modified",
+            "owner",
+            "modified_by",
+        ],
+        values=[
+            (
+                (key := get_summary_key(summary)),
+                key,
+                *(summary[field] for field in SUMMARY_FIELDS),
+                now,
+                now,
+                user,
+                user,
+            )
+            for summary in summaries
+        ],
+    )
+
+
+def apply_payout_filters(
+    query,
+    PE,
+    company: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+):
+    """
+    Filter the query to the summarized RazorpayX payouts.
+
+    :param PE: Payment Entry table of the query.
+    """
+    query = (
+        query.where(PE.integration_doctype == RAZORPAYX_CONFIG)
+        .where(PE.make_bank_online_payment == 1)
+        .where(
+            (IfNull(PE.razorpayx_payout_id, "") != "")
+            | (IfNull(PE.razorpayx_payout_link_id, "") != "")
+        )
+        # cancelled and amended Payment Entries are not counted twice
+        .where(
+            (PE.docstatus == 1)
+            | (
+                (PE.docstatus == 2)
+                & PE.razorpayx_payout_status.isin(CANCELLED_PE_STATUSES)
+            )
+        )
+    )
+
+    if company:
+        query = query.where(PE.company == company)
+
+    if from_date:
+        query = query.where(PE.posting_date >= getdate(from_date))
+
+    if to_date:
+        query = query.where(PE.posting_date <= getdate(to_date))
+
+    return query
+
+
+def get_fees_query(payout_ids):
+    """
+    Fees of the payouts, one row per Payout ID.
+
+    - Fees JE has the Payout ID as cheque no (reversal JEs have the reversal ID).
+    - Reversed fees JEs (Ex. on payout reversal) are excluded.
+
+    :param payout_ids: Sub query of the Payout IDs to summarize.
+    """
+    JE = frappe.qb.DocType("Journal Entry")
+    Reversal = frappe.qb.DocType("Journal Entry").as_("reversal")
+
+    reversed_jes = (
+        frappe.qb.from_(Reversal)
+        .select(Reversal.reversal_of)
+        .where(Reversal.docstatus == 1)
+        .where(IfNull(Reversal.reversal_of, "") != "")
+    )
+
+    return (
+        frappe.qb.from_(JE)
+        .select(JE.cheque_no, Sum(JE.total_debit).as_("fees"))
+        .where(JE.cheque_no.isin(payout_ids))
+        .where(JE.docstatus == 1)
+        .where(JE.is_system_generated == 1)
+        .where(IfNull(JE.reversal_of, "") == "")
+        .where(JE.name.notin(reversed_jes))
+        .groupby(JE.cheque_no)
+    ).as_("fees")
+
+
+###### SCHEDULER ######
+def update_stale_payout_summaries():
+    """
+    Recompute the summaries of the days marked as stale.
+    """
+    pipe = frappe.cache.pipeline()
+    pipe.spop(get_stale_summaries_key(), STALE_SUMMARIES_BATCH_SIZE)
+    members = pipe.execute()[0]
+
+    for member in members or []:
+        company, posting_date = frappe.safe_decode(member).split("|", 1)
+
+        try:
+            rebuild_payout_summary(company, posting_date, posting_date)
+            frappe.db.commit()
+
+        except Exception:
+            frappe.db.rollback()
+
+            # retry in the next run
+            add_stale_summaries([member])
+            frappe.log_error(
+                title=f"RazorpayX Payout Summary Update Failed: {company} ({posting_date})"
+            )
+
+
+###### UTILITIES ######
+def get_stale_summaries_key() -> str:
+    return frappe.cache.make_key(STALE_SUMMARIES_KEY)
+
+
+def add_stale_summaries(members: list | set):
+    """
+    Note: Raw redis commands are used (via pipeline) to pop members in batches.
+    """
+    pipe = frappe.cache.pipeline()
+    pipe.sadd(get_stale_summaries_key(), *members)
+    pipe.execute()
+
+
+def get_summary_key(summary: dict) -> str:
+    values = (
+        summary["company"],
+        summary["razorpayx_config"] or "",
+        str(getdate(summary["posting_date"])),
+        summary["payout_status"] or "",
+        summary["payout_mode"] or "",
+    )
+
+    return hashlib.sha256("|".join(values).encode()).hexdigest()[:32]
@@ -0,0 +1,88 @@
+# Copyright (c) 2025, Resilient Tech and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG, RAZORPAYX_PAYOUT_SUMMARY
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    rebuild_payout_summary,
+)
+
+COMPANY = "_Test RazorpayX Summary Company"
+POSTING_DATE = "2001-01-01"
+
+
+def insert_payment_entry(name: str, payout_id: str, paid_amount: float):
+    # rows only, the summary is computed from the tables
+    frappe.get_doc(
+        {
+            "doctype": "Payment Entry",
+            "name": name,
+            "company": COMPANY,
+            "posting_date": POSTING_DATE,
+            "paid_amount": paid_amount,
+            "docstatus": 1,
+            "make_bank_online_payment": 1,
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "integration_docname": "_Test RazorpayX Config",
+            "razorpayx_payout_id": payout_id,
+            "razorpayx_payout_status": "Processed",
+            "payment_transfer_method": "NEFT",
+        }
+    ).db_insert()
+
+
+def insert_journal_entry(name: str, cheque_no: str, total_debit: float, **kwargs):
+    frappe.get_doc(
+        {
+            "doctype": "Journal Entry",
+            "name": name,
+            "company": COMPANY,
+            "posting_date": POSTING_DATE,
+            "docstatus": 1,
+            "is_system_generated": 1,
+            "cheque_no": cheque_no,
+            "total_debit": total_debit,
+            **kwargs,
+        }
+    ).db_insert()
+
+
+class TestRazorpayXPayoutSummary(FrappeTestCase):
+    def test_rebuild_payout_summary(self):
+        insert_payment_entry("_Test Summary PE 1", "pout_test_summary_1", 100)
+        insert_payment_entry("_Test Summary PE 2", "pout_test_summary_2", 200)
+
+        # two fees JEs of the same payout are summed, PE is counted once
+        insert_journal_entry("_Test Summary JE 1", "pout_test_summary_1", 5)
+        insert_journal_entry("_Test Summary JE 2", "pout_test_summary_1", 5)
+
+        # reversed fees are not counted
+        insert_journal_entry("_Test Summary JE 3", "pout_test_summary_2", 7)
+        insert_journal_entry(
+            "_Test Summary JE 4",
+            "rvrsl_test_summary_2",
+            7,
+            reversal_of="_Test Summary JE 3",
+        )
+
+        rebuild_payout_summary(COMPANY, POSTING_DATE, POSTING_DATE)
+
+        summaries = frappe.get_all(
+            RAZORPAYX_PAYOUT_SUMMARY,
+            filters={"company": COMPANY},
+            fields=["payout_count", "paid_amount", "fees"],
+        )
+
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].payout_count, 2)
+        self.assertEqual(summaries[0].paid_amount, 300)
+        self.assertEqual(summaries[0].fees, 10)
+
+        # rebuild replaces the existing summaries
+        rebuild_payout_summary(COMPANY, POSTING_DATE, POSTING_DATE)
+
+        self.assertEqual(
+            frappe.db.count(RAZORPAYX_PAYOUT_SUMMARY, {"company": COMPANY}), 1
+        )
@@ -19,10 +19,13 @@ const TIMESPANS = [
 
 const UTR_PLACEHOLDER = "*** UTR WILL BE SET AUTOMATICALLY ***";
 
+const PAGE_LENGTH = 500;
+
 frappe.query_reports["RazorpayX Payout Status"] = {
 	filters: [
 		{
 			fieldname: "company",
+			on_change: reset_cursor,
 			label: __("Company"),
 			fieldtype: "Link",
 			options: "Company",
@@ -43,11 +46,12 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 					date_range.set_required(1);
 				}
 
-				report.refresh();
+				reset_cursor(report);
 			},
 		},
 		{
 			fieldname: "date_range",
+			on_change: reset_cursor,
 			fieldtype: "DateRange",
 			label: __("Posting Date Range"),
 			depends_on: "eval: doc.date_time_span === 'Select Date Range'",
@@ -55,6 +59,7 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 		},
 		{
 			fieldname: "party_type",
+			on_change: reset_cursor,
 			label: __("Party Type"),
 			fieldtype: "Link",
 			options: "Party Type",
@@ -68,24 +73,28 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 		},
 		{
 			fieldname: "party",
+			on_change: reset_cursor,
 			label: __("Party"),
 			fieldtype: "Dynamic Link",
 			options: "party_type",
 		},
 		{
 			fieldname: "docstatus",
+			on_change: reset_cursor,
 			label: __("Document Status"),
 			fieldtype: "MultiSelectList",
 			get_data: () => get_multiselect_options(Object.keys(DOC_STATUS)),
 		},
 		{
 			fieldname: "payout_status",
+			on_change: reset_cursor,
 			label: __("Payout Status"),
 			fieldtype: "MultiSelectList",
 			get_data: () => get_multiselect_options(Object.keys(razorpayx.PAYOUT_STATUS)),
 		},
 		{
 			fieldname: "payout_mode",
+			on_change: reset_cursor,
 			label: __("Payout Mode"),
 			fieldtype: "MultiSelectList",
 			get_data: () =>
@@ -93,6 +102,7 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 		},
 		{
 			fieldname: "razorpayx_config",
+			on_change: reset_cursor,
 			label: __("RazorpayX Configuration"),
 			fieldtype: "Link",
 			options: "RazorpayX Configuration",
@@ -104,10 +114,34 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 		},
 		{
 			fieldname: "payout_made_by",
+			on_change: reset_cursor,
 			label: __("Payout Made By"),
 			fieldtype: "Link",
 			options: "User",
 		},
+		{
+			fieldname: "view",
+			label: __("View"),
+			fieldtype: "Select",
+			options: ["Detailed", "Summary"],
+			default: "Detailed",
+			on_change: reset_cursor,
+		},
+		{
+			fieldname: "page_length",
+			on_change: reset_cursor,
+			label: __("Page Length"),
+			fieldtype: "Int",
+			default: PAGE_LENGTH,
+			depends_on: "eval: doc.view !== 'Summary'",
+		},
+		{
+			// `posting_date|name` of the last row of the previous page
+			fieldname: "cursor",
+			label: __("Cursor"),
+			fieldtype: "Data",
+			hidden: 1,
+		},
 	],
 
 	onload: function (report) {
@@ -116,6 +150,18 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 		if (docstatus && (!docstatus.get_value() || docstatus.get_value().length === 0)) {
 			docstatus.set_value("Submitted");
 		}
+
+		report.page.add_inner_button(__("Next Page"), () => {
+			const last_row = report.data?.[report.data.length - 1];
+
+			if (report.get_filter_value("view") === "Summary" || !last_row?.payment_entry) return;
+
+			report.set_filter_value("cursor", `${last_row.posting_date}|${last_row.payment_entry}`);
+		});
+
+		report.page.add_inner_button(__("First Page"), () => {
+			report.set_filter_value("cursor", "");
+		});
 	},
 
 	formatter: function (value, row, column, data, default_formatter) {
@@ -149,6 +195,15 @@ frappe.query_reports["RazorpayX Payout Status"] = {
 	},
 };
 
+// changed filters start from the first page
+function reset_cursor(report) {
+	if (report.get_filter_value("cursor")) {
+		report.set_filter_value("cursor", "");
+	} else {
+		report.refresh();
+	}
+}
+
 function get_multiselect_options(values) {
 	const options = [];
 	for (const option of values) {
@@ -3,22 +3,34 @@
 
 import frappe
 from frappe import _
-from frappe.query_builder.functions import Date
+from frappe.query_builder.functions import Count, Date, Sum
+from frappe.utils import cint, escape_html, getdate
 from frappe.utils.data import get_timespan_date_range
 
 from razorpayx_integration.constants import RAZORPAYX_CONFIG
 
+DEFAULT_PAGE_LENGTH = 500  # same as the report filter default
+
 
 def execute(filters=None):
+    filters = frappe._dict(filters or {})
+
+    if filters.view == "Summary":
+        return get_summary_columns(), get_summary_data(filters)
+
     return get_columns(), get_data(filters)
 
 
 def get_data(filters: dict | None = None) -> list[dict]:
-    from_date, to_date = parse_date_range(filters)
+    """
+    Get a page of payouts ordered by `posting_date` and `name` (latest first).
 
+    Keyset pagination: next page starts after the `cursor` (`posting_date|name`
+    of the last row of the previous page).
+    """
     PE = frappe.qb.DocType("Payment Entry")
 
-    base_query = (
+    query = (
         frappe.qb.from_(PE)
         .select(
             PE.name.as_("payment_entry"),
@@ -37,45 +49,105 @@ def get_data(filters: dict | None = None) -> list[dict]:
             PE.razorpayx_payout_id.as_("payout_id"),
             PE.razorpayx_payout_link_id.as_("payout_link_id"),
         )
-        .where(PE.company == filters.company)
-        .where(PE.posting_date >= Date(from_date))
-        .where(PE.posting_date <= Date(to_date))
+        .orderby(PE.posting_date, order=frappe.qb.desc)
+        .orderby(PE.name, order=frappe.qb.desc)
+        .limit(cint(filters.page_length) or DEFAULT_PAGE_LENGTH)
+    )
+
+    query = apply_filters(query, PE, filters)
+
+    if filters.cursor:
+        posting_date, name = parse_cursor(filters.cursor)
+
+        query = query.where(
+            (PE.posting_date < Date(posting_date))
+            | ((PE.posting_date == Date(posting_date)) & (PE.name < name))
+        )
+
+    return query.run(as_dict=True)
+
+
+def parse_cursor(cursor: str) -> tuple[str, str]:
+    posting_date, _sep, name = cursor.partition("|")
+
+    try:
+        posting_date = str(getdate(posting_date)) if posting_date else None
+    except Exception:
+        posting_date = None
+
+    if not posting_date or not name:
+        frappe.throw(
+            _(
+                "Invalid cursor {0}. Expected format is <code>posting_date|name</code>."
+            ).format(frappe.bold(escape_html(cursor))),
+            title=_("Invalid Cursor"),
+        )
+
+    return posting_date, name
+
+
+def get_summary_data(filters: dict) -> list[dict]:
+    """
+    Get count and amount of payouts grouped by configuration, status and mode.
+    """
+    PE = frappe.qb.DocType("Payment Entry")
+
+    query = (
+        frappe.qb.from_(PE)
+        .select(
+            PE.integration_docname.as_("razorpayx_config"),
+            PE.razorpayx_payout_status.as_("payout_status"),
+            PE.payment_transfer_method.as_("payout_mode"),
+            Count(PE.name).as_("payout_count"),
+            Sum(PE.paid_amount).as_("paid_amount"),
+        )
+        .groupby(
+            PE.integration_docname,
+            PE.razorpayx_payout_status,
+            PE.payment_transfer_method,
+        )
+        .orderby(PE.integration_docname)
+        .orderby(PE.razorpayx_payout_status)
+        .orderby(PE.payment_transfer_method)
+    )
+
+    return apply_filters(query, PE, filters).run(as_dict=True)
+
+
+def apply_filters(query, PE, filters: dict):
+    from_date, to_date = parse_date_range(filters)
+
+    query = (
+        query.where(PE.company == filters.company)
         .where(PE.integration_doctype == RAZORPAYX_CONFIG)
         .where(PE.make_bank_online_payment == 1)
-        .orderby(PE.posting_date, order=frappe.qb.desc)
+        .where(PE.posting_date >= Date(from_date))
+        .where(PE.posting_date <= Date(to_date))
     )
 
     # update the query based on filters
     if filters.party_type:
-        base_query = base_query.where(PE.party_type == filters.party_type)
+        query = query.where(PE.party_type == filters.party_type)
 
     if filters.party:
-        base_query = base_query.where(PE.party == filters.party)
+        query = query.where(PE.party == filters.party)
 
     if filters.docstatus:
-        base_query = base_query.where(PE.status.isin(filters.docstatus))
+        query = query.where(PE.status.isin(filters.docstatus))
 
     if filters.payout_status:
-        base_query = base_query.where(
-            PE.razorpayx_payout_status.isin(filters.payout_status)
-        )
+        query = query.where(PE.razorpayx_payout_status.isin(filters.payout_status))
 
     if filters.payout_mode:
-        base_query = base_query.where(
-            PE.payment_transfer_method.isin(filters.payout_mode)
-        )
+        query = query.where(PE.payment_transfer_method.isin(filters.payout_mode))
 
     if filters.razorpayx_config:
-        base_query = base_query.where(
-            PE.integration_docname == filters.razorpayx_config
-        )
+        query = query.where(PE.integration_docname == filters.razorpayx_config)
 
     if filters.payout_made_by:
-        base_query = base_query.where(
-            PE.payment_authorized_by == filters.payout_made_by
-        )
+        query = query.where(PE.payment_authorized_by == filters.payout_made_by)
 
-    return base_query.run(as_dict=True)
+    return query
 
 
 def parse_date_range(filters: dict) -> tuple[str, str]:
@@ -185,3 +257,40 @@ def get_columns() -> list[dict]:
             "width": 180,
         },
     ]
+
+
+def get_summary_columns() -> list[dict]:
+    return [
+        {
+            "label": _("RazorpayX Configuration"),
+            "fieldname": "razorpayx_config",
+            "fieldtype": "Link",
+            "options": "RazorpayX Configuration",
+            "width": 200,
+        },
+        {
+            "label": _("Payout Status"),
+            "fieldname": "payout_status",
+            "fieldtype": "Data",
+            "width": 150,
+        },
+        {
+            "label": _("Payout Mode"),
+            "fieldname": "payout_mode",
+            "fieldtype": "Data",
+            "width": 120,
+        },
+        {
+            "label": _("Payouts"),
+            "fieldname": "payout_count",
+            "fieldtype": "Int",
+            "width": 120,
+        },
+        {
+            "label": _("Paid Amount"),
+            "fieldname": "paid_amount",
+            "fieldtype": "Currency",
+            "options": "INR",
+            "width": 180,
+        },
+    ]
@@ -3,6 +3,7 @@ from typing import Literal
 import frappe
 from erpnext.accounts.doctype.payment_entry.payment_entry import PaymentEntry
 from frappe import _
+from frappe.utils import cint
 from payment_integration_utils.payment_integration_utils.constants.payments import (
     TRANSFER_METHOD,
 )
@@ -22,6 +23,12 @@ from razorpayx_integration.razorpayx_integration.utils import (
     is_auto_pay_enabled,
     is_payout_via_razorpayx,
 )
+from razorpayx_integration.razorpayx_integration.utils.bulk_cancel import (
+    cancel_bulk_payout,
+)
+from razorpayx_integration.razorpayx_integration.utils.bulk_payout import (
+    make_bulk_payout,
+)
 from razorpayx_integration.razorpayx_integration.utils.payout import (
     PayoutWithPaymentEntry,
 )
@@ -29,6 +36,7 @@ from razorpayx_integration.razorpayx_integration.utils.payout import (
 #### CONSTANTS ####
 TRANSFER_METHODS = Literal["NEFT", "RTGS", "IMPS", "UPI", "Link"]
 UTR_PLACEHOLDER = "*** UTR WILL BE SET AUTOMATICALLY ***"
+BULK_CANCEL_PAYOUT_MARK_TTL = 10 * 60  # seconds
 
 
 #### DOC EVENTS ####
@@ -92,7 +100,7 @@ def on_submit(doc: PaymentEntry, method=None):
     if not is_payout_via_razorpayx(doc):
         return
 
-    PayoutWithPaymentEntry(doc).make(get_auth_id(doc))
+    PayoutWithPaymentEntry(doc).make_after_commit(get_auth_id(doc))
 
 
 def before_cancel(doc: PaymentEntry, method=None):
@@ -240,6 +248,41 @@ def make_payout_with_razorpayx(
     PayoutWithPaymentEntry(doc).make(auth_id)
 
 
+@frappe.whitelist()
+def make_bulk_payout_with_razorpayx(auth_id: str, docnames: list[str] | str):
+    """
+    Make RazorpayX Payouts for multiple submitted Payment Entries in background.
+
+    :param auth_id: Authentication ID (after otp or password verification)
+    :param docnames: Payment Entry names
+
+    ---
+    Progress is published with `razorpayx_bulk_payout_progress` realtime event.
+    """
+    docnames = frappe.parse_json(docnames)
+
+    for docname in docnames:
+        has_payment_permissions(docname, throw=True)
+
+    return make_bulk_payout(auth_id, docnames)
+
+
+@frappe.whitelist()
+def cancel_bulk_payout_with_razorpayx(docnames: list[str] | str) -> int:
+    """
+    Cancel queued payouts and issued payout links with the Payment Entries in background.
+
+    :param docnames: Payment Entry names
+
+    ---
+    Result is published with `razorpayx_bulk_cancel_result` realtime event.
+    """
+    docnames = frappe.parse_json(docnames)
+    validate_cancellation_permissions(docnames)
+
+    return cancel_bulk_payout(docnames)
+
+
 @frappe.whitelist()
 def mark_payout_for_cancellation(docname: str, cancel: bool | int):
     """
@@ -250,13 +293,57 @@ def mark_payout_for_cancellation(docname: str, cancel: bool | int):
     :param docname: Payment Entry name.
     :param cancel: Cancel or not.
     """
+    validate_cancellation_permissions([docname])
 
-    frappe.has_permission("Payment Entry", "cancel", doc=docname, throw=True)
+    PayoutWithPaymentEntry.mark_cancel_payouts([docname], cancel)
 
-    config = frappe.db.get_value("Payment Entry", docname, "integration_docname")
-    frappe.has_permission(RAZORPAYX_CONFIG, doc=config, throw=True)
 
-    key = PayoutWithPaymentEntry.get_cancel_payout_key(docname)
-    value = "True" if cancel else "False"
+@frappe.whitelist()
+def mark_payouts_for_cancellation(docnames: list[str] | str, cancel: bool | int):
+    """
+    Marking payouts or payout links of multiple Payment Entries for cancellation.
+
+    Marks are kept longer than the single mark, as bulk cancellation may run
+    in background.
+
+    :param docnames: Payment Entry names.
+    :param cancel: Cancel or not.
+    """
+    docnames = frappe.parse_json(docnames)
+    validate_cancellation_permissions(docnames)
+
+    PayoutWithPaymentEntry.mark_cancel_payouts(
+        docnames, cint(cancel), ttl=BULK_CANCEL_PAYOUT_MARK_TTL
+    )
+
+
+@frappe.whitelist()
+def get_payout_cancellation_marks(docnames: list[str] | str) -> dict[str, bool]:
+    """
+    Get whether payouts of the Payment Entries are marked for cancellation.
+
+    :param docnames: Payment Entry names.
+    """
+    docnames = frappe.parse_json(docnames)
+    validate_cancellation_permissions(docnames)
+
+    return PayoutWithPaymentEntry.get_cancel_payout_marks(docnames)
+
+
+def validate_cancellation_permissions(docnames: list[str]):
+    for docname in docnames:
+        frappe.has_permission("Payment Entry", "cancel", doc=docname, throw=True)
+
+    configs = frappe.get_all(
+        "Payment Entry",
+        filters={
+            "name": ("in", docnames),
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "integration_docname": ("is", "set"),
+        },
+        pluck="integration_docname",
+        distinct=True,
+    )
 
-    frappe.cache.set(key, value, 100)
+    for config in configs:
+        frappe.has_permission(RAZORPAYX_CONFIG, doc=config, throw=True)
@@ -18,6 +18,9 @@ from razorpayx_integration.razorpayx_integration.constants.webhooks import (
     TRANSACTION_TYPE as ENTITY,
 )
 from razorpayx_integration.razorpayx_integration.utils import get_payouts_made_from
+from razorpayx_integration.razorpayx_integration.utils.profiling import (
+    OperationProfiler,
+)
 
 
 ######### PROCESSOR #########
@@ -59,18 +62,31 @@ class RazorpayXBankTransaction:
         self.bank_account = bank_account
 
     def sync(self):
-        transactions = self.fetch_transactions()
+        profiler = OperationProfiler(
+            "bank_transaction_sync",
+            self.razorpayx_config,
+            bank_account=self.bank_account,
+        )
 
-        if not transactions:
-            return
+        with profiler:
+            with profiler.stage("fetch"):
+                transactions = self.fetch_transactions()
+
+            if not transactions:
+                return
+
+            with profiler.stage("dedup"):
+                existing_transactions = self.get_existing_transactions(transactions)
 
-        existing_transactions = self.get_existing_transactions(transactions)
+            for transaction in transactions:
+                if transaction["id"] in existing_transactions:
+                    continue
 
-        for transaction in transactions:
-            if transaction["id"] in existing_transactions:
-                continue
+                with profiler.stage("map"):
+                    mapped_transaction = self.map(transaction)
 
-            self.create(self.map(transaction))
+                with profiler.stage("create"):
+                    self.create(mapped_transaction)
 
     def fetch_transactions(self) -> list[dict] | None:
         """
@@ -0,0 +1,284 @@
+"""
+Bulk cancellation of queued payouts and issued payout links with Payment Entries.
+
+Cancel calls are made concurrently with the async APIs (sequentially if `httpx`
+is not installed), then the Payment Entries are cancelled in batches.
+"""
+
+import asyncio
+
+import frappe
+from frappe import _
+from frappe.utils import strip_html
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.apis.async_api import (
+    AsyncRazorpayXLinkPayout,
+    AsyncRazorpayXPayout,
+    httpx,
+)
+from razorpayx_integration.razorpayx_integration.apis.payout import (
+    RazorpayXLinkPayout,
+    RazorpayXPayout,
+)
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_STATUS,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    mark_payout_summary_stale,
+)
+
+BULK_CANCEL_RESULT_EVENT = "razorpayx_bulk_cancel_result"
+
+MAX_CONCURRENT_CANCELS = 10
+CANCEL_BATCH_SIZE = 20
+
+CANCELLABLE_STATUSES = (
+    PAYOUT_STATUS.QUEUED.value.title(),
+    PAYOUT_STATUS.NOT_INITIATED.value.title(),
+)
+
+
+###### APIs ######
+def cancel_bulk_payout(docnames: list[str]) -> int:
+    """
+    Cancel payouts and payout links of the given Payment Entries in background.
+
+    Result is published to the user with `razorpayx_bulk_cancel_result` realtime event.
+
+    :param docnames: Payment Entry names.
+
+    ---
+    Returns number of Payment Entries queued for the cancellation.
+    """
+    docnames = list(dict.fromkeys(docnames))
+
+    if not docnames:
+        frappe.throw(
+            msg=_("Please select Payment Entries to cancel payout."),
+            title=_("No Payment Entries Selected"),
+        )
+
+    frappe.enqueue(
+        cancel_payouts,
+        queue="long",
+        timeout=len(docnames) * 30,
+        enqueue_after_commit=True,
+        docnames=docnames,
+        user=frappe.session.user,
+    )
+
+    return len(docnames)
+
+
+def get_cancellable_payouts(docnames: list[str]) -> list[dict]:
+    """
+    Get Payment Entries whose payout or payout link can be cancelled.
+
+    Same conditions as `PayoutWithPaymentEntry._can_cancel_payout_or_link`.
+    """
+    return frappe.get_all(
+        "Payment Entry",
+        filters={
+            "name": ("in", docnames),
+            "docstatus": 1,
+            "make_bank_online_payment": 1,
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "integration_docname": ("is", "set"),
+            "razorpayx_payout_status": ("in", CANCELLABLE_STATUSES),
+        },
+        fields=[
+            "name",
+            "integration_docname",
+            "razorpayx_payout_id",
+            "razorpayx_payout_link_id",
+        ],
+    )
+
+
+###### BACKGROUND JOB ######
+def cancel_payouts(docnames: list[str], user: str) -> dict:
+    """
+    Cancel payouts and payout links, then cancel the Payment Entries.
+
+    - Payment Entries which cannot be cancelled are skipped.
+    - Payment Entries are cancelled in batches of `CANCEL_BATCH_SIZE`.
+
+    :param docnames: Payment Entry names.
+    :param user: User who initiated the bulk cancellation.
+
+    ---
+    Returns `cancelled`, `failed` and `skipped` Payment Entry names.
+    """
+    frappe.set_user(user)
+
+    entries = get_cancellable_payouts(docnames)
+    results = cancel_payouts_in_razorpayx(entries)
+
+    cancelled_in_razorpayx, failed = [], []
+
+    for pe in entries:
+        if not isinstance(results[pe.name], Exception):
+            cancelled_in_razorpayx.append(pe.name)
+            continue
+
+        failed.append(pe.name)
+        frappe.log_error(
+            title=f"RazorpayX Bulk Payout Cancellation Failed: {pe.name}",
+            message=strip_html(str(results[pe.name])),
+            reference_doctype="Payment Entry",
+            reference_name=pe.name,
+        )
+
+    cancelled = []
+
+    for idx in range(0, len(cancelled_in_razorpayx), CANCEL_BATCH_SIZE):
+        batch = cancelled_in_razorpayx[idx : idx + CANCEL_BATCH_SIZE]
+        batch_cancelled = cancel_payment_entries(batch, results)
+
+        cancelled.extend(batch_cancelled)
+        failed.extend(name for name in batch if name not in batch_cancelled)
+
+    result = {
+        "cancelled": cancelled,
+        "failed": failed,
+        "skipped": [name for name in docnames if name not in results],
+    }
+
+    frappe.publish_realtime(BULK_CANCEL_RESULT_EVENT, result, user=user)
+
+    return result
+
+
+def cancel_payouts_in_razorpayx(entries: list[dict]) -> dict[str, str | Exception]:
+    """
+    Cancel payouts and payout links in RazorpayX.
+
+    ---
+    Returns Payment Entry name with cancelled status or the exception.
+    """
+    if not entries:
+        return {}
+
+    if httpx is None:
+        return {pe.name: cancel_payout(pe) for pe in entries}
+
+    return asyncio.run(cancel_payouts_concurrently(entries))
+
+
+def cancel_payout(pe: dict) -> str | Exception:
+    try:
+        status = PAYOUT_STATUS.CANCELLED.value
+
+        if pe.razorpayx_payout_id:
+            response = RazorpayXPayout(pe.integration_docname).cancel(
+                pe.razorpayx_payout_id,
+                source_doctype="Payment Entry",
+                source_docname=pe.name,
+            )
+            status = response.get("status") or status
+
+        if pe.razorpayx_payout_link_id:
+            response = RazorpayXLinkPayout(pe.integration_docname).cancel(
+                pe.razorpayx_payout_link_id,
+                source_doctype="Payment Entry",
+                source_docname=pe.name,
+            )
+            status = response.get("status") or status
+
+        return status
+
+    except Exception as e:
+        return e
+
+
+async def cancel_payouts_concurrently(
+    entries: list[dict],
+) -> dict[str, str | Exception]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CANCELS)
+
+    async with httpx.AsyncClient() as client:
+        apis = {}
+
+        # API setup reads the configuration from DB, so it is done before the calls
+        for config in {pe.integration_docname for pe in entries}:
+            try:
+                apis[config] = (
+                    AsyncRazorpayXPayout(config, client=client),
+                    AsyncRazorpayXLinkPayout(config, client=client),
+                )
+            except Exception as e:
+                apis[config] = e
+
+        async def cancel(pe: dict) -> str | Exception:
+            if isinstance(apis[pe.integration_docname], Exception):
+                return apis[pe.integration_docname]
+
+            payout_api, link_api = apis[pe.integration_docname]
+            status = PAYOUT_STATUS.CANCELLED.value
+
+            async with semaphore:
+                try:
+                    if pe.razorpayx_payout_id:
+                        response = await payout_api.cancel(
+                            pe.razorpayx_payout_id,
+                            source_doctype="Payment Entry",
+                            source_docname=pe.name,
+                        )
+                        status = response.get("status") or status
+
+                    if pe.razorpayx_payout_link_id:
+                        response = await link_api.cancel(
+                            pe.razorpayx_payout_link_id,
+                            source_doctype="Payment Entry",
+                            source_docname=pe.name,
+                        )
+                        status = response.get("status") or status
+
+                    return status
+
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*(cancel(pe) for pe in entries))
+
+    return {pe.name: result for pe, result in zip(entries, results, strict=True)}
+
+
+def cancel_payment_entries(docnames: list[str], statuses: dict[str, str]) -> list[str]:
+    """
+    Update payout status and cancel the Payment Entries in a single transaction.
+
+    A failed Payment Entry is rolled back to its savepoint without affecting the others.
+
+    ---
+    Returns cancelled Payment Entry names.
+    """
+    cancelled = []
+
+    for docname in docnames:
+        savepoint = f"cancel_{frappe.generate_hash(length=8)}"
+        frappe.db.savepoint(savepoint)
+
+        try:
+            doc = frappe.get_doc("Payment Entry", docname)
+            doc.db_set("razorpayx_payout_status", statuses[docname].title())
+            mark_payout_summary_stale([doc])
+
+            # payout is already cancelled
+            doc.flags.__canceled_by_rpx = True
+            doc.cancel()
+
+            cancelled.append(docname)
+
+        except Exception:
+            frappe.db.rollback(save_point=savepoint)
+            frappe.log_error(
+                title=f"Payment Entry Cancellation Failed: {docname}",
+                reference_doctype="Payment Entry",
+                reference_name=docname,
+            )
+
+    frappe.db.commit()
+
+    return cancelled
@@ -0,0 +1,590 @@
+"""
+Bulk payouts with Payment Entries.
+
+Payment Entries are validated as a set in the request and payouts are made in
+background jobs with bounded parallelism. Progress is streamed to the user via
+realtime events.
+
+Only the payouts the account balance can cover are released to RazorpayX (by
+priority), the rest are held locally and released once the balance allows.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import (
+    add_days,
+    add_to_date,
+    cint,
+    flt,
+    get_datetime,
+    get_link_to_form,
+    now_datetime,
+    today,
+)
+from payment_integration_utils.payment_integration_utils.utils import (
+    is_already_paid,
+    paisa_to_rupees,
+)
+from payment_integration_utils.payment_integration_utils.utils.auth import (
+    Authenticate2FA,
+)
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.apis.transaction import (
+    RazorpayXTransaction,
+)
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_CURRENCY,
+    PAYOUT_STATUS,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    mark_payout_summary_stale_by_names,
+)
+from razorpayx_integration.razorpayx_integration.utils.payout import (
+    PayoutWithPaymentEntry,
+)
+
+BULK_PAYOUT_PROGRESS_EVENT = "razorpayx_bulk_payout_progress"
+BULK_PAYOUT_PROGRESS_KEY = "razorpayx_bulk_payout_progress"
+BULK_PAYOUT_PROGRESS_TTL = 24 * 60 * 60  # 1 day
+
+DEFAULT_MAX_PARALLEL_JOBS = 4
+
+# balance of the latest transaction within this period is the account balance
+BALANCE_LOOKBACK_DAYS = 365
+
+# reserved per payout for the fees and taxes (in rupees), which are debited separately
+FEE_RESERVE_PER_PAYOUT = 25
+
+# payouts made but not debited from the account balance yet
+UNDEBITED_STATUSES = (
+    PAYOUT_STATUS.PENDING.value.title(),
+    PAYOUT_STATUS.SCHEDULED.value.title(),
+    PAYOUT_STATUS.QUEUED.value.title(),
+)
+
+# held payouts are checked against the balance once in this interval
+RELEASE_HELD_PAYOUTS_KEY = "razorpayx_release_held_payouts_next_run"
+RELEASE_HELD_PAYOUTS_INTERVAL = 15  # minutes
+
+# lower is released first
+PARTY_TYPE_PRIORITY = {"Employee": 0}
+DEFAULT_PARTY_PRIORITY = 1
+
+
+###### APIs ######
+def make_bulk_payout(
+    auth_id: str,
+    docnames: list[str],
+    max_parallel_jobs: int = DEFAULT_MAX_PARALLEL_JOBS,
+) -> dict:
+    """
+    Make payouts for the given Payment Entries in background jobs.
+
+    - All Payment Entries are validated before any payout is made.
+    - Payouts are made concurrently in up to `max_parallel_jobs` jobs.
+    - Payment Entry name is used as the idempotency key, so retrying a
+      Payment Entry never creates a duplicate payout.
+    - Payouts the account balance cannot cover are held (see `plan_payouts`).
+
+    :param auth_id: Authentication ID (after otp or password verification).
+    :param docnames: Payment Entry names.
+    :param max_parallel_jobs: Maximum number of jobs making payouts concurrently.
+
+    ---
+    Returns `bulk_id` to track the progress, `total` Payment Entries queued
+    and `held` Payment Entries.
+    """
+    docnames = list(dict.fromkeys(docnames))  # remove duplicates, keep the order
+
+    validate_bulk_payout(auth_id, docnames)
+
+    released, held = plan_payouts(docnames)
+
+    set_payouts_held(held, frappe.session.user)
+
+    if not released:
+        return {"bulk_id": None, "total": 0, "held": len(held)}
+
+    bulk_id = enqueue_payouts(released, frappe.session.user, max_parallel_jobs)
+
+    return {"bulk_id": bulk_id, "total": len(released), "held": len(held)}
+
+
+def enqueue_payouts(
+    docnames: list[str],
+    user: str,
+    max_parallel_jobs: int = DEFAULT_MAX_PARALLEL_JOBS,
+) -> str:
+    """
+    Enqueue jobs to make payouts for the given Payment Entries.
+
+    ---
+    Returns `bulk_id` to track the progress.
+    """
+    bulk_id = frappe.generate_hash(length=10)
+    job_count = min(int(max_parallel_jobs) or 1, len(docnames))
+
+    set_progress(bulk_id, total=len(docnames))
+
+    for idx in range(job_count):
+        chunk = docnames[idx::job_count]
+
+        frappe.enqueue(
+            make_payouts,
+            queue="long",
+            timeout=len(chunk) * 60,
+            job_id=f"{BULK_PAYOUT_PROGRESS_KEY}_{bulk_id}_{idx}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            docnames=chunk,
+            bulk_id=bulk_id,
+            user=user,
+        )
+
+    return bulk_id
+
+
+def validate_bulk_payout(auth_id: str, docnames: list[str]):
+    """
+    Validate Payment Entries as a set before making bulk payout.
+
+    :param auth_id: Authentication ID.
+    :param docnames: Payment Entry names.
+    """
+    if not docnames:
+        frappe.throw(
+            msg=_("Please select Payment Entries to make payout."),
+            title=_("No Payment Entries Selected"),
+        )
+
+    if not auth_id or not Authenticate2FA.is_authenticated(auth_id):
+        frappe.throw(
+            title=_("Unauthorized Access"),
+            msg=_("You are not authorized to make payouts."),
+            exc=frappe.AuthenticationError,
+        )
+
+    authenticated = set(Authenticate2FA.get_payment_entries(auth_id) or [])
+
+    if unauthenticated := [name for name in docnames if name not in authenticated]:
+        frappe.throw(
+            title=_("Unauthorized Access"),
+            msg=_("Following Payment Entries are not authenticated for payment:")
+            + get_docnames_html(unauthenticated),
+            exc=frappe.AuthenticationError,
+        )
+
+    entries = frappe.get_all(
+        "Payment Entry",
+        filters={"name": ("in", docnames)},
+        fields=[
+            "name",
+            "docstatus",
+            "payment_type",
+            "paid_from_account_currency",
+            "make_bank_online_payment",
+            "integration_doctype",
+            "integration_docname",
+            "razorpayx_payout_status",
+            "razorpayx_payout_id",
+            "razorpayx_payout_link_id",
+            "amended_from",
+        ],
+    )
+
+    disabled_configs = set(
+        frappe.get_all(
+            RAZORPAYX_CONFIG,
+            filters={
+                "disabled": 1,
+                "name": ("in", {pe.integration_docname for pe in entries}),
+            },
+            pluck="name",
+        )
+    )
+
+    valid = {pe.name for pe in entries if can_make_payout(pe, disabled_configs)}
+
+    if invalid := [name for name in docnames if name not in valid]:
+        frappe.throw(
+            title=_("Invalid Payment Entries"),
+            msg=_("Payout cannot be made for following Payment Entries:")
+            + get_docnames_html(invalid),
+        )
+
+
+def can_make_payout(pe: dict, disabled_configs: set[str]) -> bool:
+    return bool(
+        pe.docstatus == 1
+        and pe.payment_type == "Pay"
+        and pe.paid_from_account_currency == PAYOUT_CURRENCY.INR.value
+        and pe.make_bank_online_payment
+        and pe.integration_doctype == RAZORPAYX_CONFIG
+        and pe.integration_docname
+        and pe.integration_docname not in disabled_configs
+        and pe.razorpayx_payout_status == PAYOUT_STATUS.NOT_INITIATED.value.title()
+        and not pe.razorpayx_payout_id
+        and not pe.razorpayx_payout_link_id
+        and not is_already_paid(pe.amended_from)
+    )
+
+
+###### BACKGROUND JOB ######
+def make_payouts(docnames: list[str], bulk_id: str, user: str):
+    """
+    Make payouts for the given Payment Entries sequentially.
+
+    - A failed payout does not stop the other payouts.
+    - Payment Entry is updated and committed right after its payout is made, so
+      a killed job never loses the made payouts.
+
+    :param docnames: Payment Entry names.
+    :param bulk_id: Bulk payout ID to track the progress.
+    :param user: User who initiated the bulk payout.
+    """
+    frappe.set_user(user)
+
+    authorized_by = (
+        frappe.get_cached_value("User", "Administrator", "email")
+        if user == "Administrator"
+        else user
+    )
+
+    for docname in docnames:
+        try:
+            doc = frappe.get_doc("Payment Entry", docname)
+
+            # already made by the previous (retried) job
+            if doc.razorpayx_payout_id or doc.razorpayx_payout_link_id:
+                update_progress(bulk_id, user, docname, succeeded=1)
+                continue
+
+            response = PayoutWithPaymentEntry(doc)._make_payout()
+
+            values = PayoutWithPaymentEntry.get_values_after_making(response)
+
+            # status is left to the webhooks, they may arrive before the update
+            values.pop("razorpayx_payout_status", None)
+
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                title=f"RazorpayX Bulk Payout Failed: {docname}",
+                reference_doctype="Payment Entry",
+                reference_name=docname,
+            )
+
+            update_progress(bulk_id, user, docname, failed=1)
+            continue
+
+        try:
+            save_payout(
+                docname,
+                {
+                    "payment_authorized_by": authorized_by,
+                    "razorpayx_payout_held": 0,
+                    **values,
+                },
+            )
+
+        except Exception:
+            # payout is made, so it is not reported as failed
+            frappe.db.rollback()
+            frappe.log_error(
+                title=f"RazorpayX Bulk Payout Made, Update Pending: {docname}",
+                message=frappe.as_json(values),
+                reference_doctype="Payment Entry",
+                reference_name=docname,
+            )
+
+        update_progress(bulk_id, user, docname, succeeded=1)
+
+
+def save_payout(docname: str, values: dict):
+    """
+    Update and commit the Payment Entry right after its payout is made.
+    """
+    frappe.db.set_value("Payment Entry", docname, values)
+    mark_payout_summary_stale_by_names([docname])
+    frappe.db.commit()
+
+
+###### BALANCE FORECASTING ######
+def plan_payouts(docnames: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Split the Payment Entries into payouts to release now and payouts to hold.
+
+    Per configuration, payouts are released by priority (see `get_payout_priority`)
+    till the available balance covers them. Remaining ones are held to avoid
+    low-balance queueing in RazorpayX.
+
+    Note: If the balance cannot be fetched, all the payouts are released.
+
+    ---
+    Returns tuple of released and held Payment Entry names.
+    """
+    entries = frappe.get_all(
+        "Payment Entry",
+        filters={"name": ("in", docnames)},
+        fields=[
+            "name",
+            "integration_docname",
+            "party_type",
+            "posting_date",
+            "paid_amount",
+        ],
+    )
+
+    by_config = {}
+
+    for pe in entries:
+        by_config.setdefault(pe.integration_docname, []).append(pe)
+
+    released, held = [], []
+
+    for config, payment_entries in by_config.items():
+        available = get_available_balance(config)
+
+        if available is None:
+            released.extend(pe.name for pe in payment_entries)
+            continue
+
+        payment_entries.sort(key=get_payout_priority)
+
+        for idx, pe in enumerate(payment_entries):
+            required = flt(pe.paid_amount) + FEE_RESERVE_PER_PAYOUT
+
+            # keep the priority; lower priority payouts are not released before
+            if required > available:
+                held.extend(entry.name for entry in payment_entries[idx:])
+                break
+
+            available -= required
+            released.append(pe.name)
+
+    return released, held
+
+
+def get_payout_priority(pe: dict) -> tuple:
+    """
+    Employees first, then older and smaller payouts.
+    """
+    return (
+        PARTY_TYPE_PRIORITY.get(pe.party_type, DEFAULT_PARTY_PRIORITY),
+        pe.posting_date,
+        flt(pe.paid_amount),
+    )
+
+
+def get_available_balance(config: str) -> float | None:
+    """
+    Get the balance available for new payouts of the configuration (in rupees).
+
+    Account balance less the payouts made but not debited yet.
+
+    :param config: RazorpayX Configuration name.
+    """
+    balance = get_account_balance(config)
+
+    if balance is None:
+        return None
+
+    undebited = frappe.get_all(
+        "Payment Entry",
+        filters={
+            "docstatus": 1,
+            "make_bank_online_payment": 1,
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "integration_docname": config,
+            "razorpayx_payout_id": ("is", "set"),
+            "razorpayx_payout_status": ("in", UNDEBITED_STATUSES),
+        },
+        fields=["count(name) as count", "sum(paid_amount) as amount"],
+    )[0]
+
+    return (
+        balance - flt(undebited.amount) - cint(undebited.count) * FEE_RESERVE_PER_PAYOUT
+    )
+
+
+def get_account_balance(config: str) -> float | None:
+    """
+    Get the account balance (in rupees) from the latest transaction.
+
+    :param config: RazorpayX Configuration name.
+    """
+    try:
+        transactions = RazorpayXTransaction(config).get_all(
+            from_date=add_days(today(), -BALANCE_LOOKBACK_DAYS),
+            count=1,
+            source_doctype=RAZORPAYX_CONFIG,
+            source_docname=config,
+        )
+    except Exception:
+        frappe.log_error(
+            title=f"RazorpayX Balance Fetch Failed: {config}",
+            reference_doctype=RAZORPAYX_CONFIG,
+            reference_name=config,
+        )
+        return None
+
+    if not transactions or transactions[0].get("balance") is None:
+        return None
+
+    return paisa_to_rupees(transactions[0]["balance"])
+
+
+def set_payouts_held(docnames: list[str], user: str):
+    if not docnames:
+        return
+
+    frappe.db.set_value(
+        "Payment Entry",
+        {"name": ("in", docnames)},
+        {"razorpayx_payout_held": 1, "payment_authorized_by": user},
+    )
+
+
+###### SCHEDULER ######
+def release_held_payouts():
+    """
+    Release the held payouts which the account balance can cover now.
+
+    Released payouts are made with the user who authorized them.
+
+    Runs with every scheduler tick, but the balance is fetched only once in
+    `RELEASE_HELD_PAYOUTS_INTERVAL` minutes.
+    """
+    next_run = frappe.cache.get_value(RELEASE_HELD_PAYOUTS_KEY)
+
+    if next_run and now_datetime() < get_datetime(next_run):
+        return
+
+    held = frappe.get_all(
+        "Payment Entry",
+        filters={
+            "docstatus": 1,
+            "make_bank_online_payment": 1,
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "razorpayx_payout_held": 1,
+            "razorpayx_payout_status": PAYOUT_STATUS.NOT_INITIATED.value.title(),
+        },
+        fields=["name", "payment_authorized_by"],
+    )
+
+    if not held:
+        return
+
+    frappe.cache.set_value(
+        RELEASE_HELD_PAYOUTS_KEY,
+        add_to_date(now_datetime(), minutes=RELEASE_HELD_PAYOUTS_INTERVAL),
+    )
+
+    released, _held = plan_payouts([pe.name for pe in held])
+
+    if not released:
+        return
+
+    frappe.db.set_value(
+        "Payment Entry", {"name": ("in", released)}, "razorpayx_payout_held", 0
+    )
+
+    released = set(released)
+    by_user = {}
+
+    for pe in held:
+        if pe.name in released:
+            by_user.setdefault(get_user(pe.payment_authorized_by), []).append(pe.name)
+
+    for user, docnames in by_user.items():
+        enqueue_payouts(docnames, user)
+
+    frappe.db.commit()
+
+
+def get_user(authorized_by: str | None) -> str:
+    if not authorized_by or authorized_by == frappe.get_cached_value(
+        "User", "Administrator", "email"
+    ):
+        return "Administrator"
+
+    return authorized_by
+
+
+###### PROGRESS ######
+def get_progress_key(bulk_id: str) -> str:
+    return frappe.cache.make_key(f"{BULK_PAYOUT_PROGRESS_KEY}:{bulk_id}")
+
+
+def set_progress(bulk_id: str, total: int):
+    """
+    Initialize the progress counters.
+
+    Note: Raw redis commands are used (via pipeline) to increment counters atomically.
+    """
+    key = get_progress_key(bulk_id)
+
+    pipe = frappe.cache.pipeline()
+    pipe.hset(key, mapping={"total": total, "succeeded": 0, "failed": 0})
+    pipe.expire(key, BULK_PAYOUT_PROGRESS_TTL)
+    pipe.execute()
+
+
+@frappe.whitelist()
+def get_progress(bulk_id: str) -> dict:
+    """
+    Get the progress of the bulk payout.
+
+    :param bulk_id: Bulk payout ID.
+    """
+    frappe.has_permission("Payment Entry", "read", throw=True)
+
+    pipe = frappe.cache.pipeline()
+    pipe.hgetall(get_progress_key(bulk_id))
+    progress = pipe.execute()[0] or {}
+
+    return {
+        "bulk_id": bulk_id,
+        **{frappe.safe_decode(k): cint(v) for k, v in progress.items()},
+    }
+
+
+def update_progress(
+    bulk_id: str, user: str, docname: str, succeeded: int = 0, failed: int = 0
+):
+    """
+    Increment the counters and publish the progress to the user.
+    """
+    key = get_progress_key(bulk_id)
+
+    pipe = frappe.cache.pipeline()
+    pipe.hincrby(key, "succeeded", succeeded)
+    pipe.hincrby(key, "failed", failed)
+    pipe.hget(key, "total")
+    total_succeeded, total_failed, total = pipe.execute()
+
+    total = cint(total)
+
+    frappe.publish_realtime(
+        BULK_PAYOUT_PROGRESS_EVENT,
+        {
+            "bulk_id": bulk_id,
+            "docname": docname,
+            "status": "Failed" if failed else "Success",
+            "succeeded": total_succeeded,
+            "failed": total_failed,
+            "total": total,
+            "completed": total_succeeded + total_failed >= total,
+        },
+        user=user,
+    )
+
+
+###### UTILITIES ######
+def get_docnames_html(docnames: list[str]) -> str:
+    return "<br><ul>{}</ul>".format(
+        "".join(
+            f"<li>{get_link_to_form('Payment Entry', name)}</li>" for name in docnames
+        )
+    )
@@ -0,0 +1,340 @@
+"""
+Deferred creation of Journal Entries for the payout fees and tax.
+
+Webhooks only queue the Journal Entry values (keyed by Payout ID, so duplicate
+events are merged) and the JEs are created in batches by a background job.
+
+- Queued JEs are created in one transaction per batch.
+- Payment Entries are locked before the existence check, so a JE created by
+  a webhook (Ex. on reversal) is never created twice.
+- JE is skipped if the payout is not `Processing` or `Processed` anymore.
+- Failed JEs are retried with backoff and moved to the failed entries after
+  `FEE_JE_MAX_ATTEMPTS` attempts (See `retry_failed_fee_journal_entries`).
+"""
+
+import time
+
+import frappe
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_STATUS,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    mark_payout_summary_stale,
+)
+
+PENDING_FEE_JES_KEY = "razorpayx_pending_fee_journal_entries"
+FEE_JE_JOB_ID = "razorpayx_create_fee_journal_entries"
+FEE_JE_BATCH_SIZE = 100
+
+FAILED_FEE_JES_KEY = "razorpayx_failed_fee_journal_entries"
+FEE_JE_MAX_ATTEMPTS = 5
+FEE_JE_RETRY_BACKOFF = 5 * 60  # seconds, doubled per attempt
+
+FEE_JE_STATUSES = (
+    PAYOUT_STATUS.PROCESSING.value.title(),
+    PAYOUT_STATUS.PROCESSED.value.title(),
+)
+
+
+###### APIs ######
+def defer_fee_journal_entry(payout_id: str, payment_entry: str, values: dict):
+    """
+    Queue the fees JE of the payout after the commit.
+
+    :param payout_id: RazorpayX Payout ID (`cheque_no` of the JE).
+    :param payment_entry: Payment Entry name of the payout.
+    :param values: Journal Entry values.
+    """
+    entry = frappe.as_json(
+        {"payment_entry": payment_entry, "values": values}, indent=None
+    )
+
+    frappe.db.after_commit.add(lambda: add_pending_fee_journal_entry(payout_id, entry))
+    enqueue_fee_journal_entries(enqueue_after_commit=True)
+
+
+def get_fee_journal_entry(payout_id: str) -> str | None:
+    """
+    Get the submitted fees JE of the payout, creating it if it is queued.
+
+    Note: ⚠️ Call with the Payment Entry locked.
+    """
+    if fees_je := get_fee_journal_entry_name(payout_id):
+        return fees_je
+
+    if not (entry := get_pending_fee_journal_entry(payout_id)):
+        return
+
+    je = submit_journal_entry(entry["values"])
+    frappe.db.after_commit.add(lambda: remove_pending_fee_journal_entries([payout_id]))
+
+    return je.name
+
+
+def discard_fee_journal_entry(payout_id: str):
+    """
+    Remove the queued fees JE of the payout after the commit (Ex. on failure).
+    """
+    frappe.db.after_commit.add(lambda: remove_pending_fee_journal_entries([payout_id]))
+
+
+@frappe.whitelist()
+def retry_failed_fee_journal_entries() -> int:
+    """
+    Queue the failed fees JEs again (Ex. after fixing the fees account).
+
+    Also run daily by the scheduler.
+
+    :returns: Number of JEs queued.
+    """
+    frappe.has_permission(RAZORPAYX_CONFIG, "write", throw=True)
+
+    failed = get_fee_journal_entries(FAILED_FEE_JES_KEY)
+
+    if not failed:
+        return 0
+
+    set_fee_journal_entries(
+        PENDING_FEE_JES_KEY,
+        {
+            payout_id: {
+                "payment_entry": entry["payment_entry"],
+                "values": entry["values"],
+            }
+            for payout_id, entry in failed.items()
+        },
+    )
+    remove_fee_journal_entries(FAILED_FEE_JES_KEY, list(failed))
+
+    enqueue_fee_journal_entries()
+
+    return len(failed)
+
+
+def enqueue_fee_journal_entries(enqueue_after_commit: bool = False):
+    frappe.enqueue(
+        create_pending_fee_journal_entries,
+        queue="short",
+        job_id=FEE_JE_JOB_ID,
+        deduplicate=True,
+        enqueue_after_commit=enqueue_after_commit,
+    )
+
+
+###### BACKGROUND JOB ######
+def create_pending_fee_journal_entries():
+    """
+    Create the queued fees JEs in batches of `FEE_JE_BATCH_SIZE`.
+
+    Also called by the scheduler to retry the failed ones after their backoff.
+    """
+    now = time.time()
+    pending = {
+        payout_id: entry
+        for payout_id, entry in get_pending_fee_journal_entries().items()
+        if entry.get("retry_after", 0) <= now
+    }
+
+    if not pending:
+        return
+
+    batch = dict(list(pending.items())[:FEE_JE_BATCH_SIZE])
+
+    # new transaction to see the JEs committed before acquiring the locks
+    frappe.db.commit()
+
+    payment_entries = lock_payment_entries(
+        {entry["payment_entry"] for entry in batch.values()}
+    )
+    existing = get_existing_fee_journal_entries(list(batch))
+
+    processed, created_for = [], []
+    retries, failed = {}, {}
+
+    for payout_id, entry in batch.items():
+        pe = payment_entries.get(entry["payment_entry"])
+
+        if (
+            payout_id in existing
+            or not pe
+            or pe.docstatus != 1
+            or pe.razorpayx_payout_status not in FEE_JE_STATUSES
+        ):
+            processed.append(payout_id)
+            continue
+
+        savepoint = f"fee_je_{frappe.generate_hash(length=8)}"
+        frappe.db.savepoint(savepoint)
+
+        try:
+            submit_journal_entry(entry["values"])
+
+            processed.append(payout_id)
+            created_for.append(pe)
+
+        except Exception:
+            frappe.db.rollback(save_point=savepoint)
+
+            attempts = entry.get("attempts", 0) + 1
+
+            if attempts < FEE_JE_MAX_ATTEMPTS:
+                retries[payout_id] = {
+                    **entry,
+                    "attempts": attempts,
+                    "retry_after": now + FEE_JE_RETRY_BACKOFF * 2 ** (attempts - 1),
+                }
+                continue
+
+            # logged once, when giving up
+            frappe.log_error(
+                title=f"RazorpayX Fees Journal Entry Creation Failed: {payout_id}",
+                reference_doctype="Payment Entry",
+                reference_name=pe.name,
+            )
+            failed[payout_id] = {**entry, "attempts": attempts, "failed_at": now}
+
+    mark_payout_summary_stale(created_for)
+    frappe.db.commit()
+
+    remove_pending_fee_journal_entries([*processed, *failed])
+    set_fee_journal_entries(PENDING_FEE_JES_KEY, retries)
+    set_fee_journal_entries(FAILED_FEE_JES_KEY, failed)
+
+    if len(pending) > len(batch):
+        enqueue_fee_journal_entries()
+
+
+###### UTILITIES ######
+def submit_journal_entry(values: dict):
+    je = frappe.new_doc("Journal Entry")
+    je.update(
+        {
+            "voucher_type": "Journal Entry",
+            "is_system_generated": 1,
+            **values,
+        }
+    )
+
+    je.flags.skip_remarks_creation = True
+    je.submit()
+
+    return je
+
+
+def lock_payment_entries(names: set[str]) -> dict[str, dict]:
+    PE = frappe.qb.DocType("Payment Entry")
+
+    # sorted to lock in the same order in concurrent jobs
+    payment_entries = (
+        frappe.qb.from_(PE)
+        .select(
+            PE.name,
+            PE.docstatus,
+            PE.company,
+            PE.posting_date,
+            PE.razorpayx_payout_status,
+        )
+        .where(PE.name.isin(list(names)))
+        .orderby(PE.name)
+        .for_update()
+        .run(as_dict=True)
+    )
+
+    return {pe.name: pe for pe in payment_entries}
+
+
+def get_existing_fee_journal_entries(payout_ids: list[str]) -> set[str]:
+    return set(
+        frappe.get_all(
+            "Journal Entry",
+            filters={
+                "docstatus": 1,
+                "is_system_generated": 1,
+                "reversal_of": ("is", "not set"),
+                "cheque_no": ("in", payout_ids),
+            },
+            pluck="cheque_no",
+        )
+    )
+
+
+def get_fee_journal_entry_name(payout_id: str) -> str | None:
+    """
+    Note: Locking read to see the JE committed by the background job.
+    """
+    return frappe.db.get_value(
+        "Journal Entry",
+        {
+            "docstatus": 1,
+            "is_system_generated": 1,
+            "reversal_of": ("is", "not set"),
+            "cheque_no": payout_id,
+        },
+        "name",
+        for_update=True,
+    )
+
+
+def get_pending_fee_journal_entries_key() -> str:
+    return frappe.cache.make_key(PENDING_FEE_JES_KEY)
+
+
+def get_pending_fee_journal_entries() -> dict[str, dict]:
+    return get_fee_journal_entries(PENDING_FEE_JES_KEY)
+
+
+def get_fee_journal_entries(key: str) -> dict[str, dict]:
+    """
+    Note: Raw redis commands are used (via pipeline) to update fields in batches.
+    """
+    pipe = frappe.cache.pipeline()
+    pipe.hgetall(frappe.cache.make_key(key))
+
+    return {
+        frappe.safe_decode(payout_id): frappe.parse_json(frappe.safe_decode(entry))
+        for payout_id, entry in (pipe.execute()[0] or {}).items()
+    }
+
+
+def set_fee_journal_entries(key: str, entries: dict[str, dict]):
+    if not entries:
+        return
+
+    pipe = frappe.cache.pipeline()
+    pipe.hset(
+        frappe.cache.make_key(key),
+        mapping={
+            payout_id: frappe.as_json(entry, indent=None)
+            for payout_id, entry in entries.items()
+        },
+    )
+    pipe.execute()
+
+
+def get_pending_fee_journal_entry(payout_id: str) -> dict | None:
+    pipe = frappe.cache.pipeline()
+    pipe.hget(get_pending_fee_journal_entries_key(), payout_id)
+    entry = pipe.execute()[0]
+
+    return frappe.parse_json(frappe.safe_decode(entry)) if entry else None
+
+
+def add_pending_fee_journal_entry(payout_id: str, entry: str):
+    pipe = frappe.cache.pipeline()
+    pipe.hset(get_pending_fee_journal_entries_key(), payout_id, entry)
+    pipe.execute()
+
+
+def remove_pending_fee_journal_entries(payout_ids: list[str]):
+    remove_fee_journal_entries(PENDING_FEE_JES_KEY, payout_ids)
+
+
+def remove_fee_journal_entries(key: str, payout_ids: list[str]):
+    if not payout_ids:
+        return
+
+    pipe = frappe.cache.pipeline()
+    pipe.hdel(frappe.cache.make_key(key), *payout_ids)
+    pipe.execute()
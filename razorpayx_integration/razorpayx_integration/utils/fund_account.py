@@ -0,0 +1,660 @@
+"""
+Pre-registration of parties' contacts and fund accounts in RazorpayX.
+
+Registering ahead of the payout run surfaces validation failures (Ex. invalid IFSC
+or VPA) early and lets the payouts use the lightweight `fund_account_id` payouts.
+
+Contacts and fund accounts already in RazorpayX (Ex. created by composite payouts
+or from the dashboard) are synced to the same mapping, so they are reused instead
+of being created again.
+"""
+
+import asyncio
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import DateTimeLikeObject, getdate, now_datetime, strip_html
+
+from razorpayx_integration.constants import (
+    RAZORPAYX_CONFIG,
+    RAZORPAYX_PARTY_FUND_ACCOUNT,
+)
+from razorpayx_integration.razorpayx_integration.apis.async_api import (
+    AsyncRazorpayXContact,
+    AsyncRazorpayXFundAccount,
+    httpx,
+)
+from razorpayx_integration.razorpayx_integration.apis.contact import (
+    RazorpayXContact,
+)
+from razorpayx_integration.razorpayx_integration.apis.fund_account import (
+    RazorpayXFundAccount,
+)
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    FUND_ACCOUNT_TYPE,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_party_fund_account.razorpayx_party_fund_account import (
+    get_contact_id,
+    get_fund_account_key,
+    normalize_account_details,
+    save_fund_account,
+    save_fund_account_failure,
+)
+
+DEFAULT_PARTY_TYPES = ("Supplier", "Employee")
+DEFAULT_MAX_PARALLEL_JOBS = 4
+DEFAULT_REQUESTS_PER_SECOND = 10
+SYNC_FUND_ACCOUNTS_JOB_ID = "razorpayx_sync_fund_accounts::{0}"
+
+MIRRORED_FIELDS = (
+    "party_type",
+    "party",
+    "account_type",
+    "bank_account_no",
+    "bank_ifsc",
+    "upi_id",
+    "contact_id",
+    "fund_account_id",
+)
+
+
+class RateLimiter:
+    """
+    Allow at most `rate` calls per second.
+
+    :param rate: Calls per second. If `0`, calls are not limited.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_call = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+
+        if self.next_call > now:
+            time.sleep(self.next_call - now)
+
+        self.next_call = max(now, self.next_call) + self.interval
+
+
+###### APIs ######
+@frappe.whitelist()
+def register_party_fund_accounts(
+    config: str,
+    party_types: list[str] | str | None = None,
+    max_parallel_jobs: int = DEFAULT_MAX_PARALLEL_JOBS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+) -> int:
+    """
+    Register contacts and fund accounts of parties' bank accounts in background jobs.
+
+    - Already registered accounts are skipped.
+    - Accounts of the same party are registered in the same job to create a single contact.
+    - Requests of all the jobs together are limited to `requests_per_second`.
+
+    :param config: RazorpayX Configuration name.
+    :param party_types: Party Types to register (Default: `Supplier` and `Employee`).
+    :param max_parallel_jobs: Maximum number of jobs registering concurrently.
+    :param requests_per_second: Maximum RazorpayX API requests per second.
+
+    ---
+    Returns number of accounts queued for the registration.
+    """
+    frappe.has_permission(RAZORPAYX_CONFIG, "write", doc=config, throw=True)
+
+    party_types = frappe.parse_json(party_types) if party_types else DEFAULT_PARTY_TYPES
+    parties = get_unregistered_parties(config, party_types)
+
+    if not parties:
+        return 0
+
+    chunks = [[] for _ in range(min(int(max_parallel_jobs) or 1, len(parties)))]
+
+    for idx, party in enumerate(parties):
+        chunks[idx % len(chunks)].append(party)
+
+    for chunk in chunks:
+        frappe.enqueue(
+            register_fund_accounts,
+            queue="long",
+            timeout=sum(len(party["accounts"]) for party in chunk) * 60,
+            config=config,
+            parties=chunk,
+            requests_per_second=float(requests_per_second) / len(chunks),
+        )
+
+    return sum(len(party["accounts"]) for party in parties)
+
+
+def get_unregistered_parties(config: str, party_types: list[str]) -> list[dict]:
+    """
+    Get parties with their bank accounts and UPI IDs not registered in RazorpayX yet.
+
+    ---
+    Example:
+    ```py
+    [
+        {
+            "party_type": "Supplier",
+            "party": "SUP-0001",
+            "party_name": "Gaurav Kumar",
+            "accounts": [
+                {
+                    "bank_account": "Gaurav Kumar - HDFC",
+                    "account_type": "bank_account",
+                    "bank_account_no": "7654321234567890",
+                    "bank_ifsc": "HDFC0000053",
+                },
+                {
+                    "bank_account": "Gaurav Kumar - HDFC",
+                    "account_type": "vpa",
+                    "upi_id": "gauravkumar@exampleupi",
+                },
+            ],
+        }
+    ]
+    ```
+    """
+    fields = ["name", "party_type", "party", "bank_account_no", "branch_code"]
+
+    # UPI ID is available only if it is set up by payment integration utils
+    if has_upi_id := frappe.get_meta("Bank Account").has_field("upi_id"):
+        fields.append("upi_id")
+
+    bank_accounts = frappe.get_all(
+        "Bank Account",
+        filters={
+            "party_type": ("in", party_types),
+            "party": ("is", "set"),
+            "is_company_account": 0,
+            "disabled": 0,
+        },
+        fields=fields,
+        order_by="party_type, party",
+    )
+
+    registered = set(
+        frappe.get_all(
+            RAZORPAYX_PARTY_FUND_ACCOUNT,
+            filters={"razorpayx_config": config, "status": "Registered"},
+            pluck="name",
+        )
+    )
+
+    parties = {}
+
+    for bank_account in bank_accounts:
+        accounts = []
+
+        if bank_account.bank_account_no and bank_account.branch_code:
+            accounts.append(
+                normalize_account_details(
+                    bank_account.party_type,
+                    bank_account.party,
+                    FUND_ACCOUNT_TYPE.BANK_ACCOUNT.value,
+                    bank_account_no=bank_account.bank_account_no,
+                    bank_ifsc=bank_account.branch_code,
+                )
+            )
+
+        if has_upi_id and bank_account.upi_id:
+            accounts.append(
+                normalize_account_details(
+                    bank_account.party_type,
+                    bank_account.party,
+                    FUND_ACCOUNT_TYPE.VPA.value,
+                    upi_id=bank_account.upi_id,
+                )
+            )
+
+        for account in accounts:
+            if get_fund_account_key(config, account) in registered:
+                continue
+
+            party = parties.setdefault(
+                (bank_account.party_type, bank_account.party),
+                {
+                    "party_type": bank_account.party_type,
+                    "party": bank_account.party,
+                    "accounts": [],
+                },
+            )
+
+            party["accounts"].append({**account, "bank_account": bank_account.name})
+
+    set_party_names(parties)
+
+    return list(parties.values())
+
+
+def set_party_names(parties: dict[tuple[str, str], dict]):
+    party_names = {}
+
+    for party_type, party in parties:
+        party_names.setdefault(party_type, []).append(party)
+
+    for party_type, names in party_names.items():
+        title_field = frappe.get_meta(party_type).get_title_field()
+
+        titles = dict(
+            frappe.get_all(
+                party_type,
+                filters={"name": ("in", names)},
+                fields=["name", title_field],
+                as_list=True,
+            )
+        )
+
+        for name in names:
+            parties[(party_type, name)]["party_name"] = titles.get(name) or name
+
+
+###### BACKGROUND JOB ######
+def register_fund_accounts(
+    config: str,
+    parties: list[dict],
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+):
+    """
+    Register contacts and fund accounts of the given parties.
+
+    Result of each account is committed separately.
+
+    :param config: RazorpayX Configuration name.
+    :param parties: Parties with accounts (see `get_unregistered_parties`).
+    :param requests_per_second: Maximum RazorpayX API requests per second of this job.
+    """
+    registration = FundAccountRegistration(config, requests_per_second)
+
+    for party in parties:
+        registration.register_party(party)
+
+
+class FundAccountRegistration:
+    """
+    Register the contacts and fund accounts in RazorpayX.
+
+    :param config: RazorpayX Configuration name.
+    :param requests_per_second: Maximum RazorpayX API requests per second.
+    """
+
+    def __init__(self, config: str, requests_per_second: float):
+        self.config = config
+        self.limiter = RateLimiter(requests_per_second)
+        self.contact_api = RazorpayXContact(config)
+        self.fund_account_api = RazorpayXFundAccount(config)
+
+    def register_party(self, party: dict):
+        contact_id = get_contact_id(self.config, party["party_type"], party["party"])
+        party_name = self.contact_api.sanitize_party_name(party["party_name"])
+
+        for account in party["accounts"]:
+            bank_account = account.pop("bank_account", None)
+
+            try:
+                if not contact_id:
+                    contact_id = self.create_contact(party, party_name)
+
+                fund_account_id = self.create_fund_account(
+                    contact_id, party_name, account
+                )
+
+                save_fund_account(
+                    self.config,
+                    account,
+                    contact_id,
+                    fund_account_id,
+                    bank_account=bank_account,
+                )
+
+            except Exception as e:
+                frappe.db.rollback()
+
+                save_fund_account_failure(
+                    self.config,
+                    account,
+                    error=strip_html(str(e)) or _("Unknown Error"),
+                    contact_id=contact_id,
+                    bank_account=bank_account,
+                )
+
+            frappe.db.commit()
+
+    def create_contact(self, party: dict, party_name: str) -> str:
+        self.limiter.wait()
+
+        response = self.contact_api.create(
+            name=party_name,
+            type=party["party_type"],
+            id=f"{party['party_type']}: {party['party']}",
+        )
+
+        return response["id"]
+
+    def create_fund_account(
+        self, contact_id: str, party_name: str, account: dict
+    ) -> str:
+        self.limiter.wait()
+
+        if account["account_type"] == FUND_ACCOUNT_TYPE.VPA.value:
+            response = self.fund_account_api.create_with_vpa(
+                contact_id, account["upi_id"]
+            )
+        else:
+            response = self.fund_account_api.create_with_bank_account(
+                contact_id,
+                party_name,
+                account["bank_ifsc"],
+                account["bank_account_no"],
+            )
+
+        return response["id"]
+
+
+###### SYNC ######
+@frappe.whitelist()
+def sync_party_fund_accounts(
+    config: str,
+    from_date: DateTimeLikeObject | None = None,
+    to_date: DateTimeLikeObject | None = None,
+):
+    """
+    Sync the RazorpayX contacts and fund accounts to RazorpayX Party Fund Accounts
+    in a background job.
+
+    :param config: RazorpayX Configuration name.
+    :param from_date: Sync the ones created on or after this date
+        (Default: creation of the configuration).
+    :param to_date: Sync the ones created on or before this date (Default: today).
+    """
+    frappe.has_permission(RAZORPAYX_CONFIG, "write", doc=config, throw=True)
+
+    frappe.enqueue(
+        sync_fund_accounts,
+        queue="long",
+        job_id=SYNC_FUND_ACCOUNTS_JOB_ID.format(config),
+        deduplicate=True,
+        config=config,
+        from_date=from_date,
+        to_date=to_date,
+    )
+
+
+def sync_fund_accounts(
+    config: str,
+    from_date: DateTimeLikeObject | None = None,
+    to_date: DateTimeLikeObject | None = None,
+) -> dict:
+    """
+    Sync the RazorpayX contacts and fund accounts of the parties.
+
+    - Contacts are mapped to the party by their reference id (Ex. `Supplier: SUP-0001`).
+    - The same party account registered more than once in RazorpayX is mapped
+      to the latest fund account and reported as duplicate.
+    - Mappings of the deactivated fund accounts are removed.
+
+    ---
+    Returns counts of the synced, inserted, updated, removed and duplicate accounts.
+    """
+    from_date = getdate(
+        from_date or frappe.db.get_value(RAZORPAYX_CONFIG, config, "creation")
+    )
+    to_date = getdate(to_date)
+
+    contacts, fund_accounts = fetch_contacts_and_fund_accounts(
+        config, from_date, to_date
+    )
+
+    parties = get_contact_parties(config, contacts, fund_accounts)
+    mappings, inactive, duplicates = {}, [], []
+
+    for fund_account in fund_accounts:
+        if not fund_account.get("active"):
+            inactive.append(fund_account["id"])
+            continue
+
+        if not (party := parties.get(fund_account.get("contact_id"))):
+            continue
+
+        details = get_fund_account_details(*party, fund_account)
+
+        if not details:
+            continue
+
+        key = get_fund_account_key(config, details)
+
+        # listed latest first
+        if key in mappings:
+            duplicates.append(fund_account["id"])
+            continue
+
+        mappings[key] = {
+            **details,
+            "contact_id": fund_account["contact_id"],
+            "fund_account_id": fund_account["id"],
+        }
+
+    result = save_fund_account_mappings(config, mappings)
+    result["removed"] = remove_fund_account_mappings(config, inactive)
+    frappe.db.commit()
+
+    return {
+        "contacts": len(contacts),
+        "fund_accounts": len(fund_accounts),
+        **result,
+        "duplicates": duplicates,
+    }
+
+
+def fetch_contacts_and_fund_accounts(
+    config: str, from_date: DateTimeLikeObject, to_date: DateTimeLikeObject
+) -> tuple[list[dict], list[dict]]:
+    """
+    Fetch in concurrent date windows if `httpx` is installed, else sequentially.
+    """
+    if httpx is None:
+        filters = {"from": str(from_date), "to": str(to_date)}
+
+        return (
+            RazorpayXContact(config).get_all(dict(filters)),
+            RazorpayXFundAccount(config).get_all(dict(filters)),
+        )
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await asyncio.gather(
+                AsyncRazorpayXContact(config, client=client).get_all_in_windows(
+                    from_date, to_date
+                ),
+                AsyncRazorpayXFundAccount(config, client=client).get_all_in_windows(
+                    from_date, to_date
+                ),
+            )
+
+    return tuple(asyncio.run(fetch()))
+
+
+def get_contact_parties(
+    config: str, contacts: list[dict], fund_accounts: list[dict]
+) -> dict[str, tuple[str, str]]:
+    """
+    Get the existing parties of the contacts by their reference id.
+
+    Contacts created before `from_date` are resolved from the existing mappings.
+
+    ---
+    Example: `{"cont_00HjGh1": ("Supplier", "SUP-0001")}`
+    """
+    parties = {}
+
+    for contact in contacts:
+        party_type, _sep, party = (contact.get("reference_id") or "").partition(": ")
+
+        if party_type and party:
+            parties[contact["id"]] = (party_type, party)
+
+    missing = {fund_account.get("contact_id") for fund_account in fund_accounts}
+    missing -= {None, *parties}
+
+    if missing:
+        parties.update(
+            {
+                contact_id: (party_type, party)
+                for contact_id, party_type, party in frappe.get_all(
+                    RAZORPAYX_PARTY_FUND_ACCOUNT,
+                    filters={
+                        "razorpayx_config": config,
+                        "contact_id": ("in", list(missing)),
+                    },
+                    fields=["contact_id", "party_type", "party"],
+                    distinct=True,
+                    as_list=True,
+                )
+            }
+        )
+
+    party_names = {}
+
+    for party_type, party in parties.values():
+        party_names.setdefault(party_type, set()).add(party)
+
+    existing = set()
+
+    for party_type, names in party_names.items():
+        if not frappe.db.exists("DocType", party_type):
+            continue
+
+        existing.update(
+            (party_type, name)
+            for name in frappe.get_all(
+                party_type, filters={"name": ("in", list(names))}, pluck="name"
+            )
+        )
+
+    return {
+        contact_id: party for contact_id, party in parties.items() if party in existing
+    }
+
+
+def get_fund_account_details(
+    party_type: str, party: str, fund_account: dict
+) -> dict | None:
+    account_type = fund_account.get("account_type")
+
+    if account_type == FUND_ACCOUNT_TYPE.VPA.value:
+        return normalize_account_details(
+            party_type,
+            party,
+            account_type,
+            upi_id=(fund_account.get("vpa") or {}).get("address"),
+        )
+
+    if account_type == FUND_ACCOUNT_TYPE.BANK_ACCOUNT.value:
+        bank_account = fund_account.get("bank_account") or {}
+
+        return normalize_account_details(
+            party_type,
+            party,
+            account_type,
+            bank_account_no=bank_account.get("account_number"),
+            bank_ifsc=bank_account.get("ifsc"),
+        )
+
+
+def save_fund_account_mappings(config: str, mappings: dict[str, dict]) -> dict:
+    """
+    Insert the new mappings and update the changed ones in bulk.
+    """
+    existing = {
+        mapping.name: mapping
+        for mapping in frappe.get_all(
+            RAZORPAYX_PARTY_FUND_ACCOUNT,
+            filters={"razorpayx_config": config},
+            fields=["name", "contact_id", "fund_account_id", "status"],
+        )
+    }
+
+    to_update = {
+        key: {
+            "contact_id": mapping["contact_id"],
+            "fund_account_id": mapping["fund_account_id"],
+            "status": "Registered",
+            "error": "",
+        }
+        for key, mapping in mappings.items()
+        if key in existing
+        and (
+            existing[key].status != "Registered"
+            or existing[key].contact_id != mapping["contact_id"]
+            or existing[key].fund_account_id != mapping["fund_account_id"]
+        )
+    }
+
+    to_insert = [key for key in mappings if key not in existing]
+
+    if to_update:
+        frappe.db.bulk_update(RAZORPAYX_PARTY_FUND_ACCOUNT, to_update)
+
+    if to_insert:
+        now = now_datetime()
+        user = frappe.session.user
+
+        frappe.db.bulk_insert(
+            RAZORPAYX_PARTY_FUND_ACCOUNT,
+            fields=[
+                "name",
+                "fund_account_key",
+                "razorpayx_config",
+                *MIRRORED_FIELDS,
+                "status",
+                "creation",
+                "modified",
+                "owner",
+                "modified_by",
+            ],
+            values=[
+                (
+                    key,
+                    key,
+                    config,
+                    *(mappings[key].get(field) for field in MIRRORED_FIELDS),
+                    "Registered",
+                    now,
+                    now,
+                    user,
+                    user,
+                )
+                for key in to_insert
+            ],
+        )
+
+    return {
+        "synced": len(mappings),
+        "inserted": len(to_insert),
+        "updated": len(to_update),
+    }
+
+
+def remove_fund_account_mappings(config: str, fund_account_ids: list[str]) -> int:
+    """
+    Remove mappings of the deactivated fund accounts, so next payout is made
+    with composite payout.
+    """
+    if not fund_account_ids:
+        return 0
+
+    names = frappe.get_all(
+        RAZORPAYX_PARTY_FUND_ACCOUNT,
+        filters={
+            "razorpayx_config": config,
+            "fund_account_id": ("in", fund_account_ids),
+        },
+        pluck="name",
+    )
+
+    if names:
+        frappe.db.delete(RAZORPAYX_PARTY_FUND_ACCOUNT, {"name": ("in", names)})
+
+    return len(names)
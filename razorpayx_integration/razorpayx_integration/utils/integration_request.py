@@ -0,0 +1,263 @@
+"""
+Retention of RazorpayX Integration Requests.
+
+- Successful logs are compacted to the essential fields after `compact_after` days.
+- Logs are archived to gzipped JSONL files and deleted after their service's TTL.
+- Rows are processed in chunks, committing after each chunk to keep locks short.
+
+Retention days can be overridden with `razorpayx_integration_request_retention`
+site config. Service names support `*` wildcards and the first match is used.
+
+Example: `{"compact_after": 3, "default": 60, "RazorpayX - Make Payout*": 730}`
+"""
+
+import gzip
+import json
+import os
+from fnmatch import fnmatch
+
+import frappe
+from frappe.utils import add_days, today
+
+# in days
+DEFAULT_RETENTION = {
+    "compact_after": 7,
+    "default": 90,
+    # payouts and their webhooks are kept for the audit
+    "RazorpayX - Make Payout*": 365,
+    "RazorpayX - Cancel Payout*": 365,
+    "RazorpayX - payout*": 365,
+    "RazorpayX - transaction.*": 365,
+    # listings and lookups
+    "RazorpayX - Fetch *": 30,
+    "RazorpayX - Get *": 30,
+    "RazorpayX - Validate API Credentials": 30,
+}
+
+ARCHIVE_FOLDER = "razorpayx_integration_requests"
+CHUNK_SIZE = 500
+MAX_CHUNKS_PER_RUN = 200
+
+ARCHIVED_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "integration_request_service",
+    "status",
+    "request_id",
+    "is_remote_request",
+    "reference_doctype",
+    "reference_docname",
+    "url",
+    "request_headers",
+    "data",
+    "output",
+    "error",
+)
+
+# kept on compaction
+ESSENTIAL_KEYS = ("id", "entity", "event", "status", "count", "error")
+
+
+###### SCHEDULER ######
+def apply_integration_request_retention():
+    """
+    Compact, archive and delete the RazorpayX Integration Requests.
+
+    Continued in the next run if more than `MAX_CHUNKS_PER_RUN` chunks are pending.
+    """
+    retention = get_retention()
+    chunks = MAX_CHUNKS_PER_RUN
+
+    for service in get_services():
+        days = get_retention_days(service, retention)
+
+        chunks -= archive_integration_requests(service, days, chunks)
+        chunks -= compact_integration_requests(
+            service, retention["compact_after"], chunks
+        )
+
+        if chunks <= 0:
+            return
+
+
+###### APIs ######
+def archive_integration_requests(service: str, days: int, max_chunks: int) -> int:
+    """
+    Archive and delete the Integration Requests older than `days`.
+
+    Integration Requests of the failed webhooks (to be replayed or replayed) are
+    kept, as the failed webhook requires the link.
+
+    ---
+    Returns number of processed chunks.
+    """
+    IR = frappe.qb.DocType("Integration Request")
+    FW = frappe.qb.DocType("RazorpayX Failed Webhook")
+
+    failed_webhooks = (
+        frappe.qb.from_(FW)
+        .select(FW.integration_request)
+        .where(FW.integration_request.isnotnull())
+    )
+
+    query = (
+        frappe.qb.from_(IR)
+        .select(*(IR[field] for field in ARCHIVED_FIELDS))
+        .where(IR.integration_request_service == service)
+        .where(IR.creation < add_days(today(), -days))
+        .where(IR.name.notin(failed_webhooks))
+        .orderby(IR.creation)
+        .limit(CHUNK_SIZE)
+    )
+
+    chunks = 0
+
+    while chunks < max_chunks:
+        logs = query.run(as_dict=True)
+
+        if not logs:
+            break
+
+        write_archive(logs)
+        frappe.db.delete(
+            "Integration Request", {"name": ("in", [log.name for log in logs])}
+        )
+        frappe.db.commit()
+
+        chunks += 1
+
+        if len(logs) < CHUNK_SIZE:
+            break
+
+    return chunks
+
+
+def compact_integration_requests(service: str, days: int, max_chunks: int) -> int:
+    """
+    Compact the successful Integration Requests older than `days`.
+
+    Request headers are removed and data/output are reduced to `ESSENTIAL_KEYS`.
+
+    ---
+    Returns number of processed chunks.
+    """
+    IR = frappe.qb.DocType("Integration Request")
+
+    query = (
+        frappe.qb.from_(IR)
+        .select(IR.name, IR.data, IR.output)
+        .where(IR.integration_request_service == service)
+        .where(IR.status == "Completed")
+        .where(IR.creation < add_days(today(), -days))
+        # compacted logs have no request headers
+        .where(IR.request_headers.isnotnull() & (IR.request_headers != ""))
+        .limit(CHUNK_SIZE)
+    )
+
+    chunks = 0
+
+    while chunks < max_chunks:
+        logs = query.run(as_dict=True)
+
+        if not logs:
+            break
+
+        frappe.db.bulk_update(
+            "Integration Request",
+            {
+                log.name: {
+                    "request_headers": None,
+                    "data": compact_json(log.data),
+                    "output": compact_json(log.output),
+                }
+                for log in logs
+            },
+            update_modified=False,
+        )
+        frappe.db.commit()
+
+        chunks += 1
+
+        if len(logs) < CHUNK_SIZE:
+            break
+
+    return chunks
+
+
+###### UTILITIES ######
+def get_retention() -> dict:
+    return {
+        **DEFAULT_RETENTION,
+        **(frappe.conf.get("razorpayx_integration_request_retention") or {}),
+    }
+
+
+def get_retention_days(service: str, retention: dict) -> int:
+    for pattern, days in retention.items():
+        if pattern not in ("compact_after", "default") and fnmatch(service, pattern):
+            return days
+
+    return retention["default"]
+
+
+def get_services() -> list[str]:
+    return frappe.get_all(
+        "Integration Request",
+        filters={"integration_request_service": ("like", "RazorpayX%")},
+        pluck="integration_request_service",
+        distinct=True,
+    )
+
+
+def compact_json(value: str | None) -> str | None:
+    """
+    Reduce the JSON to the essential keys.
+
+    - Webhook payload: entity's `id` and `status` are kept.
+    - Listing: `count` and item ids are kept.
+    """
+    if not value:
+        return value
+
+    try:
+        value = json.loads(value)
+    except ValueError:
+        return
+
+    if not isinstance(value, dict):
+        return
+
+    compacted = {key: value[key] for key in ESSENTIAL_KEYS if key in value}
+
+    if isinstance(value.get("payload"), dict):
+        for event_type, payload in value["payload"].items():
+            entity = payload.get("entity") if isinstance(payload, dict) else None
+
+            if isinstance(entity, dict):
+                compacted[event_type] = {
+                    key: entity[key] for key in ("id", "status") if key in entity
+                }
+
+    if isinstance(value.get("items"), list):
+        compacted["items"] = [
+            item["id"]
+            for item in value["items"]
+            if isinstance(item, dict) and "id" in item
+        ]
+
+    return json.dumps(compacted)
+
+
+def write_archive(logs: list[dict]):
+    """
+    Append the Integration Requests to the archive file of the day.
+
+    Archive: `sites/{site}/private/razorpayx_integration_requests/{date}.jsonl.gz`
+    """
+    folder = frappe.get_site_path("private", ARCHIVE_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+
+    with gzip.open(os.path.join(folder, f"{today()}.jsonl.gz"), "at") as f:
+        for log in logs:
+            f.write(json.dumps(log, default=str) + "\n")
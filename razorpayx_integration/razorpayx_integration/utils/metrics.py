@@ -0,0 +1,206 @@
+"""
+Metrics of RazorpayX API calls and webhook processing.
+
+Metrics are aggregated in Redis (shared by all workers) and exported in
+Prometheus text format.
+
+Reference: https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+from contextlib import contextmanager
+
+import frappe
+from werkzeug.wrappers import Response
+
+METRICS_KEY = "razorpayx_metrics"
+
+# seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PAGE_BUCKETS = (1, 2, 5, 10, 25, 50, 100)
+
+# name: (type, help, buckets)
+METRICS = {
+    "razorpayx_api_request_duration_seconds": (
+        "histogram",
+        "RazorpayX API request latency.",
+        LATENCY_BUCKETS,
+    ),
+    "razorpayx_api_requests_total": (
+        "counter",
+        "RazorpayX API requests by status code.",
+        None,
+    ),
+    "razorpayx_api_response_bytes_total": (
+        "counter",
+        "Size of RazorpayX API responses.",
+        None,
+    ),
+    "razorpayx_api_pages_fetched": (
+        "histogram",
+        "Pages fetched per get_all call.",
+        PAGE_BUCKETS,
+    ),
+    "razorpayx_webhook_processing_seconds": (
+        "histogram",
+        "RazorpayX webhook processing time.",
+        LATENCY_BUCKETS,
+    ),
+}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+###### RECORDING ######
+def record_api_request(
+    api: str,
+    service: str | None,
+    method: str,
+    status_code: int | None,
+    duration: float,
+    response_bytes: int = 0,
+):
+    """
+    Record latency, status code and response size of the API request.
+
+    :param api: API class name (Ex. `RazorpayXPayout`).
+    :param service: Integration Request service name (Ex. `RazorpayX - Make Payout`).
+    :param method: HTTP method.
+    :param status_code: HTTP status code (`None` if request is not completed).
+    :param duration: Request duration in seconds.
+    :param response_bytes: Response size in bytes.
+    """
+    labels = {"api": api, "service": service or "", "method": method}
+
+    with metrics_pipeline() as pipe:
+        observe(pipe, "razorpayx_api_request_duration_seconds", duration, labels)
+        increment(
+            pipe,
+            "razorpayx_api_requests_total",
+            {**labels, "status_code": str(status_code or "error")},
+        )
+        increment(pipe, "razorpayx_api_response_bytes_total", labels, response_bytes)
+
+
+def record_pages_fetched(api: str, pages: int):
+    with metrics_pipeline() as pipe:
+        observe(pipe, "razorpayx_api_pages_fetched", pages, {"api": api})
+
+
+def record_webhook_processing(event: str, outcome: str, duration: float):
+    """
+    :param event: Webhook event (Ex. `payout.processed`).
+    :param outcome: `success` or `error`.
+    :param duration: Processing time in seconds.
+    """
+    with metrics_pipeline() as pipe:
+        observe(
+            pipe,
+            "razorpayx_webhook_processing_seconds",
+            duration,
+            {"event": event, "outcome": outcome},
+        )
+
+
+###### EXPORT ######
+@frappe.whitelist()
+def export_metrics():
+    """
+    Export the metrics in Prometheus text format.
+
+    Scrape with API key and secret of a user having one of the roles below.
+    """
+    frappe.only_for(("System Manager", "RazorpayX Integration Manager"))
+
+    return Response(get_metrics_text(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def get_metrics_text() -> str:
+    pipe = frappe.cache.pipeline()
+
+    for name in METRICS:
+        pipe.hgetall(get_metric_key(name))
+
+    lines = []
+
+    for (name, (metric_type, help_text, buckets)), values in zip(
+        METRICS.items(), pipe.execute(), strict=True
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+        samples = {
+            frappe.safe_decode(field): frappe.safe_decode(value)
+            for field, value in (values or {}).items()
+        }
+
+        for field in sorted(
+            samples, key=lambda field: get_sample_sort_key(field, buckets)
+        ):
+            lines.append(f"{field} {samples[field]}")
+
+    return "\n".join(lines) + "\n"
+
+
+###### UTILITIES ######
+@contextmanager
+def metrics_pipeline():
+    """
+    Pipeline to record metrics in a single round trip.
+
+    Note: Metrics are best effort, write failures are ignored to never break the caller.
+    """
+    pipe = frappe.cache.pipeline()
+
+    yield pipe
+
+    try:
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def observe(pipe, name: str, value: float, labels: dict):
+    key = get_metric_key(name)
+    buckets = METRICS[name][2]
+
+    for bucket in buckets:
+        if value <= bucket:
+            pipe.hincrby(key, get_sample_name(f"{name}_bucket", labels, le=bucket), 1)
+
+    pipe.hincrby(key, get_sample_name(f"{name}_bucket", labels, le="+Inf"), 1)
+    pipe.hincrbyfloat(key, get_sample_name(f"{name}_sum", labels), value)
+    pipe.hincrby(key, get_sample_name(f"{name}_count", labels), 1)
+
+
+def increment(pipe, name: str, labels: dict, value: int = 1):
+    pipe.hincrby(get_metric_key(name), get_sample_name(name, labels), value)
+
+
+def get_metric_key(name: str) -> str:
+    return frappe.cache.make_key(f"{METRICS_KEY}:{name}")
+
+
+def get_sample_name(name: str, labels: dict, le: float | str | None = None) -> str:
+    labels = {**labels, "le": str(le)} if le is not None else labels
+    label_str = ",".join(
+        f'{key}="{escape_label_value(value)}"' for key, value in labels.items()
+    )
+
+    return f"{name}{{{label_str}}}"
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def get_sample_sort_key(field: str, buckets: tuple | None) -> tuple:
+    """
+    Keep the samples of the same labels together and buckets in ascending order.
+    """
+    if not buckets or 'le="' not in field:
+        return (field, 0)
+
+    le = field.split('le="', 1)[1].split('"', 1)[0]
+    series = field.replace(f'le="{le}"', "")
+
+    return (series, float("inf") if le == "+Inf" else float(le))
@@ -16,18 +16,34 @@ from payment_integration_utils.payment_integration_utils.utils.auth import (
 from razorpayx_integration.razorpayx_integration.apis.payout import (
     RazorpayXCompositePayout,
     RazorpayXLinkPayout,
+    RazorpayXPayout,
 )
 from razorpayx_integration.razorpayx_integration.constants.payouts import (
     PAYOUT_CURRENCY,
     PAYOUT_FROM,
     PAYOUT_STATUS,
 )
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_party_fund_account.razorpayx_party_fund_account import (
+    discard_fund_account,
+    get_contact_id,
+    get_fund_account_id,
+    save_fund_account_from_payout,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    mark_payout_summary_stale,
+    mark_payout_summary_stale_by_names,
+)
 from razorpayx_integration.razorpayx_integration.utils import (
     get_fees_accounting_config,
     is_auto_cancel_payout_enabled,
     is_payout_via_razorpayx,
 )
 
+PAYOUT_RESULT_EVENT = "razorpayx_payout_result"
+
+# seconds; marks are set right before cancelling the Payment Entry
+CANCEL_PAYOUT_MARK_TTL = 100
+
 
 class PayoutWithPaymentEntry:
     """
@@ -53,6 +69,42 @@ class PayoutWithPaymentEntry:
         if is_already_paid(self.doc.amended_from):
             return
 
+        self._validate_payout(auth_id)
+
+        response = self._make_payout()
+        self._update_after_making(response)
+
+        return response
+
+    def make_after_commit(self, auth_id: str | None = None):
+        """
+        Validate now and make payout in background after the transaction is committed.
+
+        RazorpayX API is not called while Payment Entry and GL Entries are locked.
+        Result is published with `razorpayx_payout_result` realtime event.
+
+        :param auth_id: Authentication ID for making payout.
+        """
+        if is_already_paid(self.doc.amended_from):
+            return
+
+        self._validate_payout(auth_id)
+
+        frappe.enqueue(
+            make_payout_in_background,
+            enqueue_after_commit=True,
+            docname=self.doc.name,
+            initiated_by_payment_processor=bool(
+                frappe.flags.initiated_by_payment_processor
+            ),
+        )
+
+    def _validate_payout(self, auth_id: str | None = None):
+        """
+        Validate Payment Entry and authentication before making payout.
+
+        :param auth_id: Authentication ID for making payout.
+        """
         if not self._can_make_payout():
             frappe.throw(
                 msg=_(
@@ -63,17 +115,52 @@ class PayoutWithPaymentEntry:
 
         self._is_authenticated_payout(auth_id)
 
+    def _make_payout(self) -> dict:
+        """
+        Make payout or payout link via RazorpayX API.
+
+        Caution: ⚠️ Payment Entry must be validated before calling this method.
+        """
         payout_details = self._get_payout_details()
 
         if self.doc.payment_transfer_method == PAYOUT_MODE.LINK.value:
-            response = RazorpayXLinkPayout(self.config_name).pay(payout_details)
-        else:
-            response = RazorpayXCompositePayout(self.config_name).pay(payout_details)
+            return RazorpayXLinkPayout(self.config_name).pay(payout_details)
 
-        self._update_after_making(response)
+        if fund_account_id := get_fund_account_id(self.config_name, payout_details):
+            return self._make_payout_with_fund_account(payout_details, fund_account_id)
+
+        if contact_id := get_contact_id(
+            self.config_name, self.doc.party_type, self.doc.party
+        ):
+            payout_details["razorpayx_contact_id"] = contact_id
+
+        response = RazorpayXCompositePayout(self.config_name).pay(payout_details)
+        save_fund_account_from_payout(self.config_name, payout_details, response)
 
         return response
 
+    def _make_payout_with_fund_account(
+        self, payout_details: dict, fund_account_id: str
+    ) -> dict:
+        """
+        Make payout with the party's already created RazorpayX Fund Account.
+
+        :param payout_details: Payout details of the Payment Entry.
+        :param fund_account_id: RazorpayX Fund Account ID.
+        """
+        payout_details["fund_account_id"] = fund_account_id
+        api = RazorpayXPayout(self.config_name)
+
+        try:
+            return api.pay(payout_details)
+        except Exception:
+            # transient errors are retried with the same fund account, as a composite
+            # payout with the same idempotency key would be rejected
+            if is_invalid_fund_account_error(api.last_error):
+                discard_fund_account(self.config_name, payout_details)
+
+            raise
+
     def _is_authenticated_payout(self, auth_id: str | None = None) -> bool:
         """
         Check if the Payout (Payment Entry) is authenticated or not.
@@ -154,31 +241,54 @@ class PayoutWithPaymentEntry:
         if user:
             self.doc.db_set("payment_authorized_by", user, notify=notify)
 
-        if not response:
+        values = PayoutWithPaymentEntry.get_values_after_making(response)
+
+        if not values:
             return
 
-        values = {}
+        status = values.pop("razorpayx_payout_status", None)
+
+        if values:
+            self.doc.db_set(values, notify=notify)
+            mark_payout_summary_stale([self.doc])
+
+        # webhook may have updated the status before (payout made in background)
+        if (
+            status
+            and self.doc.razorpayx_payout_status
+            == PAYOUT_STATUS.NOT_INITIATED.value.title()
+        ):
+            self.doc.update({"razorpayx_payout_status": status}).save()
+
+    @staticmethod
+    def get_values_after_making(response: dict | None = None) -> dict:
+        """
+        Get Payment Entry values to be updated from payout or payout link response.
+
+        :param response: Payout | Payout Link API response.
+        """
+        if not response:
+            return {}
 
         entity = response.get("entity")
         id = response.get("id")
 
         if not entity or not id:
-            return
+            return {}
 
-        if entity == "payout":
-            values["razorpayx_payout_id"] = id
-        elif entity == "payout_link":
-            values["razorpayx_payout_link_id"] = id
+        if entity == "payout_link":
+            return {"razorpayx_payout_link_id": id}
 
-        if values:
-            self.doc.db_set(values, notify=notify)
+        if entity != "payout":
+            return {}
 
-        # updating status for better UX instead of waiting for webhook
-        if entity == "payout_link":
-            return
+        values = {"razorpayx_payout_id": id}
 
+        # updating status for better UX instead of waiting for webhook
         if status := response.get("status"):
-            self.doc.update({"razorpayx_payout_status": status.title()}).save()
+            values["razorpayx_payout_status"] = status.title()
+
+        return values
 
     #### Cancel Payout | Payout Link ####
     def cancel(self, cancel_pe: bool = False):
@@ -273,6 +383,8 @@ class PayoutWithPaymentEntry:
             (response.get("status") or PAYOUT_STATUS.CANCELLED.value).title(),
         )
 
+        mark_payout_summary_stale([self.doc])
+
         if cancel_pe and self.doc.docstatus == 1:
             self.doc.flags.__canceled_by_rpx = True
             self.doc.cancel()
@@ -283,9 +395,167 @@ class PayoutWithPaymentEntry:
 
     @staticmethod
     def is_cancel_payout_marked(docname: str) -> bool:
-        key = PayoutWithPaymentEntry.get_cancel_payout_key(docname)
+        return PayoutWithPaymentEntry.get_cancel_payout_marks([docname])[docname]
+
+    @staticmethod
+    def mark_cancel_payouts(
+        docnames: list[str], cancel: bool | int, ttl: int = CANCEL_PAYOUT_MARK_TTL
+    ):
+        """
+        Mark payouts of the Payment Entries for cancellation in a single round trip.
+
+        :param docnames: Payment Entry names.
+        :param cancel: Cancel or not.
+        :param ttl: Seconds to remember the marks.
+        """
+        if not docnames:
+            return
+
+        value = "True" if cancel else "False"
+
+        pipe = frappe.cache.pipeline()
+
+        for docname in docnames:
+            pipe.set(PayoutWithPaymentEntry.get_cancel_payout_key(docname), value, ttl)
+
+        pipe.execute()
+
+    @staticmethod
+    def get_cancel_payout_marks(docnames: list[str]) -> dict[str, bool]:
+        """
+        Get the cancellation marks of the Payment Entries in a single round trip.
+
+        :param docnames: Payment Entry names.
+        """
+        if not docnames:
+            return {}
+
+        flags = frappe.cache.mget(
+            [PayoutWithPaymentEntry.get_cancel_payout_key(name) for name in docnames]
+        )
+
+        return {
+            docname: bool(flag) and flag.decode("utf-8") == "True"
+            for docname, flag in zip(docnames, flags, strict=True)
+        }
 
-        if flag := frappe.cache.get(key):
-            return flag.decode("utf-8") == "True"
 
+def is_invalid_fund_account_error(error: dict | None) -> bool:
+    """
+    Check if RazorpayX rejected the Fund Account itself (Ex. deactivated or deleted).
+
+    :param error: `error` of the failed RazorpayX API response.
+    """
+    if not error or error.get("code") != "BAD_REQUEST_ERROR":
         return False
+
+    return error.get("field") == "fund_account_id" or "fund account" in (
+        error.get("description") or ""
+    ).lower().replace("_", " ")
+
+
+def make_payout_in_background(
+    docname: str, initiated_by_payment_processor: bool = False
+):
+    """
+    Make payout for the submitted Payment Entry.
+
+    - Payment Entry is locked only to update it after the API call.
+    - If the API call fails, `make_bank_online_payment` is reset so payout can be
+      made manually.
+    - If the payout is made but updating the Payment Entry fails, the payout (link)
+      ID is saved in a new transaction and the user is not asked to pay again.
+
+    :param docname: Payment Entry name.
+    :param initiated_by_payment_processor: Payment Entry is submitted by payments processor.
+    """
+    frappe.flags.initiated_by_payment_processor = initiated_by_payment_processor
+
+    doc = frappe.get_doc("Payment Entry", docname)
+
+    if doc.docstatus != 1 or doc.razorpayx_payout_id or doc.razorpayx_payout_link_id:
+        return
+
+    try:
+        response = PayoutWithPaymentEntry(doc)._make_payout()
+
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(
+            title=f"RazorpayX Payout Failed: {docname}",
+            reference_doctype="Payment Entry",
+            reference_name=docname,
+        )
+
+        frappe.db.set_value("Payment Entry", docname, "make_bank_online_payment", 0)
+        frappe.db.commit()
+
+        publish_payout_result(docname, success=False)
+        return
+
+    try:
+        doc = frappe.get_doc("Payment Entry", docname, for_update=True)
+        PayoutWithPaymentEntry(doc)._update_after_making(response)
+        frappe.db.commit()
+
+    except Exception:
+        frappe.db.rollback()
+        save_payout_ids(docname, response)
+
+        publish_payout_result(docname, success=True, update_pending=True)
+        return
+
+    publish_payout_result(docname, success=True)
+
+
+def save_payout_ids(docname: str, response: dict | None):
+    """
+    Save the payout (link) ID when updating the Payment Entry failed after making
+    the payout. Status is left to the webhooks.
+    """
+    frappe.log_error(
+        title=f"RazorpayX Payout Made, Update Pending: {docname}",
+        message=frappe.as_json(response),
+        reference_doctype="Payment Entry",
+        reference_name=docname,
+    )
+    frappe.db.commit()
+
+    values = PayoutWithPaymentEntry.get_values_after_making(response)
+    values.pop("razorpayx_payout_status", None)
+
+    if not values:
+        return
+
+    try:
+        frappe.db.set_value("Payment Entry", docname, values)
+        mark_payout_summary_stale_by_names([docname])
+        frappe.db.commit()
+
+    except Exception:
+        # IDs are available in the logged response
+        frappe.db.rollback()
+
+
+def publish_payout_result(docname: str, success: bool, update_pending: bool = False):
+    if not success:
+        message = _(
+            "Payout for {0} could not be made. Please check Error Log and make payout manually."
+        ).format(docname)
+    elif update_pending:
+        message = _(
+            "Payout for {0} has been made, but updating the Payment Entry is pending. Please check Error Log."
+        ).format(docname)
+    else:
+        message = _("Payout has been made successfully.")
+
+    frappe.publish_realtime(
+        PAYOUT_RESULT_EVENT,
+        {
+            "docname": docname,
+            "success": success,
+            "update_pending": update_pending,
+            "message": message,
+        },
+        user=frappe.session.user,
+    )
@@ -0,0 +1,228 @@
+"""
+Reconcile payout status of Payment Entries whose webhooks are missed.
+
+Recent in-flight payouts are fetched in a single listing (by time window) per
+RazorpayX Configuration, older ones are fetched individually. The updates are
+processed as payout webhooks.
+"""
+
+import frappe
+from frappe.utils import (
+    add_days,
+    add_to_date,
+    get_datetime,
+    getdate,
+    now_datetime,
+    today,
+)
+from payment_integration_utils.payment_integration_utils.utils import (
+    log_integration_request,
+)
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+from razorpayx_integration.razorpayx_integration.apis.payout import RazorpayXPayout
+from razorpayx_integration.razorpayx_integration.constants.payouts import (
+    PAYOUT_STATUS,
+)
+from razorpayx_integration.razorpayx_integration.constants.webhooks import (
+    EVENTS_TYPE,
+)
+from razorpayx_integration.razorpayx_integration.utils.webhook import (
+    process_webhook,
+)
+
+IN_FLIGHT_STATUSES = (
+    PAYOUT_STATUS.PENDING.value.title(),
+    PAYOUT_STATUS.SCHEDULED.value.title(),
+    PAYOUT_STATUS.QUEUED.value.title(),
+    PAYOUT_STATUS.PROCESSING.value.title(),
+)
+
+# webhooks are expected within this time
+STALE_AFTER_MINUTES = 15
+
+# payouts created within these days are listed, older ones are fetched by ID
+LISTING_WINDOW_DAYS = 3
+
+NEXT_RUN_KEY = "razorpayx_payout_reconciliation_next_run"
+
+# (minimum in-flight payouts, poll interval in minutes)
+POLL_INTERVALS = (
+    (200, 5),
+    (20, 15),
+    (1, 30),
+    (0, 120),
+)
+
+
+###### SCHEDULER ######
+def reconcile_payouts_periodically():
+    """
+    Reconcile stale payouts, polling more often when more payouts are in flight.
+
+    Runs with every scheduler tick and skips the run until the next poll time.
+    """
+    next_run = frappe.cache.get_value(NEXT_RUN_KEY)
+
+    if next_run and now_datetime() < get_datetime(next_run):
+        return
+
+    in_flight = reconcile_payouts()
+
+    frappe.cache.set_value(
+        NEXT_RUN_KEY,
+        add_to_date(now_datetime(), minutes=get_poll_interval(in_flight)),
+    )
+
+
+def get_poll_interval(in_flight: int) -> int:
+    for min_in_flight, interval in POLL_INTERVALS:
+        if in_flight >= min_in_flight:
+            return interval
+
+    return POLL_INTERVALS[-1][1]
+
+
+###### APIs ######
+def reconcile_payouts() -> int:
+    """
+    Reconcile payout status of all stale in-flight payouts.
+
+    ---
+    Returns number of in-flight payouts.
+    """
+    in_flight = get_in_flight_payouts()
+    stale_before = add_to_date(now_datetime(), minutes=-STALE_AFTER_MINUTES)
+
+    stale_payouts = {}
+
+    for pe in in_flight:
+        if get_datetime(pe.modified) <= stale_before:
+            stale_payouts.setdefault(pe.integration_docname, []).append(pe)
+
+    for config, payment_entries in stale_payouts.items():
+        try:
+            reconcile_config_payouts(config, payment_entries)
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                title=f"RazorpayX Payout Reconciliation Failed: {config}",
+                reference_doctype=RAZORPAYX_CONFIG,
+                reference_name=config,
+            )
+
+    return len(in_flight)
+
+
+def get_in_flight_payouts() -> list[dict]:
+    return frappe.get_all(
+        "Payment Entry",
+        filters={
+            "docstatus": 1,
+            "make_bank_online_payment": 1,
+            "integration_doctype": RAZORPAYX_CONFIG,
+            "razorpayx_payout_id": ("is", "set"),
+            "razorpayx_payout_status": ("in", IN_FLIGHT_STATUSES),
+        },
+        fields=[
+            "name",
+            "creation",
+            "modified",
+            "integration_docname",
+            "razorpayx_payout_id",
+            "razorpayx_payout_status",
+        ],
+    )
+
+
+def reconcile_config_payouts(config: str, payment_entries: list[dict]):
+    """
+    Fetch the payouts of the configuration and process the changed ones as
+    payout webhooks.
+
+    - Payouts created in the last `LISTING_WINDOW_DAYS` are fetched in a single
+      time window.
+    - Older ones are fetched by ID, so a payout stuck for weeks does not make
+      every poll list all the payouts since then.
+
+    :param config: RazorpayX Configuration name.
+    :param payment_entries: Stale in-flight Payment Entries of the configuration.
+    """
+    account_id = frappe.db.get_value(RAZORPAYX_CONFIG, config, "account_id")
+
+    if not account_id:
+        return
+
+    window_start = getdate(add_days(today(), -LISTING_WINDOW_DAYS))
+    recent, older = [], []
+
+    for pe in payment_entries:
+        (recent if getdate(pe.creation) >= window_start else older).append(pe)
+
+    payouts = {}
+
+    if recent:
+        listed = RazorpayXPayout(config).get_all(
+            from_date=min(getdate(pe.creation) for pe in recent),
+            to_date=today(),
+        )
+
+        payouts.update({payout.get("id"): payout for payout in listed or []})
+
+    for pe in older:
+        try:
+            payout = RazorpayXPayout(config).get_by_id(
+                pe.razorpayx_payout_id,
+                data=None,
+                source_doctype="Payment Entry",
+                source_docname=pe.name,
+            )
+        except Exception:
+            # logged in the Integration Request, retried in the next poll
+            continue
+
+        if payout:
+            payouts[pe.razorpayx_payout_id] = payout
+
+    if not payouts:
+        return
+
+    for pe in payment_entries:
+        payout = payouts.get(pe.razorpayx_payout_id)
+
+        if not payout or not payout.get("status"):
+            continue
+
+        if payout["status"] == pe.razorpayx_payout_status.lower():
+            continue
+
+        payload = get_payout_payload(account_id, payout)
+        ir = log_integration_request(
+            status="Completed",
+            integration_request_service="RazorpayX - Payout Reconciliation",
+            data=payload,
+        )
+
+        # `process_webhook` rolls back on failure, so the Integration Request is
+        # committed to be linked from the dead-letter queue
+        frappe.db.commit()
+
+        # same path as webhooks; failures are logged and added to dead-letter queue
+        process_webhook(payload, ir.name)
+        frappe.db.commit()
+
+
+def get_payout_payload(account_id: str, payout: dict) -> dict:
+    """
+    Get the payout webhook payload for the fetched payout.
+
+    Reference: https://razorpay.com/docs/webhooks/payloads/x/payouts/
+    """
+    return {
+        "entity": "event",
+        "account_id": f"acc_{account_id.removeprefix('acc_')}",
+        "event": f"{EVENTS_TYPE.PAYOUT.value}.{payout['status']}",
+        "contains": [EVENTS_TYPE.PAYOUT.value],
+        "payload": {EVENTS_TYPE.PAYOUT.value: {"entity": payout}},
+        "created_at": payout.get("created_at"),
+    }
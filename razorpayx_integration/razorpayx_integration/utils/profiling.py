@@ -0,0 +1,131 @@
+"""
+Opt-in stage-wise profiling of webhook processing and transaction syncs.
+
+Enabled for all the configurations with `razorpayx_profiling` site config or
+per configuration with `Enable Profiling` in RazorpayX Configuration.
+
+Operations taking longer than `razorpayx_slow_operation_threshold` (ms) are
+logged to `razorpayx_integration.slow_operations` log with the stage breakdown.
+
+---
+Example Usage:
+```py
+profiler = OperationProfiler("bank_transaction_sync", RAZORPAYX_CONFIG_NAME)
+
+with profiler:
+    with profiler.stage("fetch"):
+        transactions = fetch_transactions()
+```
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+import frappe
+from frappe.utils import cint
+
+from razorpayx_integration.constants import RAZORPAYX_CONFIG
+
+SLOW_OPERATION_LOGGER = "razorpayx_integration.slow_operations"
+DEFAULT_SLOW_OPERATION_THRESHOLD = 1000  # ms
+
+
+class OperationProfiler:
+    """
+    Time the stages of an operation and log it if slow.
+
+    - Repeated stages are accumulated with the number of calls.
+    - Does nothing if profiling is not enabled.
+
+    :param operation: Operation name (Ex. `webhook:payout.processed`).
+    :param razorpayx_config: RazorpayX Configuration name.
+    :param context: Extra details to log (Ex. source docname).
+    """
+
+    def __init__(self, operation: str, razorpayx_config: str | None = None, **context):
+        self.operation = operation
+        self.razorpayx_config = razorpayx_config
+        self.context = context
+
+        self.enabled = is_profiling_enabled(razorpayx_config)
+        self.stages = {}
+        self.start = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(failed=exc_type is not None)
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+
+        return self._time_stage(name)
+
+    @contextmanager
+    def _time_stage(self, name: str):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {"duration": 0, "calls": 0})
+            stage["duration"] += (time.perf_counter() - start) * 1000
+            stage["calls"] += 1
+
+    def finish(self, failed: bool = False):
+        """
+        Log the operation if it took longer than the threshold.
+        """
+        if not self.enabled:
+            return
+
+        duration = (time.perf_counter() - self.start) * 1000
+
+        if duration < get_slow_operation_threshold():
+            return
+
+        stages = {
+            name: {"duration": round(stage["duration"], 2), "calls": stage["calls"]}
+            for name, stage in self.stages.items()
+        }
+
+        frappe.logger(SLOW_OPERATION_LOGGER, allow_site=True).warning(
+            json.dumps(
+                {
+                    "operation": self.operation,
+                    "razorpayx_config": self.razorpayx_config,
+                    "duration": round(duration, 2),
+                    # time not covered by the stages
+                    "untracked": round(
+                        duration - sum(stage["duration"] for stage in stages.values()),
+                        2,
+                    ),
+                    "stages": stages,
+                    "failed": failed,
+                    **self.context,
+                },
+                default=str,
+            )
+        )
+
+
+def is_profiling_enabled(razorpayx_config: str | None = None) -> bool:
+    if frappe.conf.get("razorpayx_profiling"):
+        return True
+
+    if not razorpayx_config:
+        return False
+
+    return bool(
+        frappe.get_cached_value(RAZORPAYX_CONFIG, razorpayx_config, "enable_profiling")
+    )
+
+
+def get_slow_operation_threshold() -> int:
+    return cint(
+        frappe.conf.get("razorpayx_slow_operation_threshold")
+        or DEFAULT_SLOW_OPERATION_THRESHOLD
+    )
@@ -1,4 +1,6 @@
 import json
+import time
+from hmac import compare_digest
 from hmac import new as hmac
 
 import frappe
@@ -12,7 +14,13 @@ from erpnext.accounts.doctype.unreconcile_payment.unreconcile_payment import (
 )
 from frappe import _
 from frappe.rate_limiter import rate_limit
-from frappe.utils import fmt_money, get_link_to_form, get_url_to_form, today
+from frappe.utils import (
+    fmt_money,
+    get_link_to_form,
+    get_table_name,
+    get_url_to_form,
+    today,
+)
 from frappe.utils.password import get_decrypted_password
 from payment_integration_utils.payment_integration_utils.constants.enums import BaseEnum
 from payment_integration_utils.payment_integration_utils.utils import (
@@ -37,11 +45,36 @@ from razorpayx_integration.razorpayx_integration.constants.webhooks import (
     SUPPORTED_EVENTS,
     SUPPORTED_TRANSACTION_TYPES,
     TRANSACTION_TYPE,
+    WEBHOOK_LOG_HEADERS,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_failed_webhook.razorpayx_failed_webhook import (
+    add_to_dead_letter_queue,
+)
+from razorpayx_integration.razorpayx_integration.doctype.razorpayx_payout_summary.razorpayx_payout_summary import (
+    mark_payout_summary_stale,
 )
 from razorpayx_integration.razorpayx_integration.utils import (
     get_fees_accounting_config,
     is_create_je_on_reversal_enabled,
 )
+from razorpayx_integration.razorpayx_integration.utils.fee_journal_entry import (
+    defer_fee_journal_entry,
+    discard_fee_journal_entry,
+    get_fee_journal_entry,
+    get_fee_journal_entry_name,
+    submit_journal_entry,
+)
+from razorpayx_integration.razorpayx_integration.utils.metrics import (
+    record_webhook_processing,
+)
+from razorpayx_integration.razorpayx_integration.utils.profiling import (
+    OperationProfiler,
+)
+
+try:
+    from orjson import loads as parse_json
+except ImportError:
+    from json import loads as parse_json
 
 
 ###### WEBHOOK PROCESSORS ######
@@ -73,15 +106,25 @@ class RazorpayXWebhook:
         self.id = ""  # Payout ID / Payout Link ID
         self.reversal_id = ""
 
-        self.source_doc = frappe._dict()
+        self.source_doctype = ""
+        self.source_docname = ""
+        self.source_doc = frappe._dict()  # locked doc, set only if state will change
+        self.source_doc_state = frappe._dict()  # unlocked values for pre-checks
         self.amended_docnames = []
         self.notes = {}
 
         self.set_config_name()
-        self.set_common_payload_attributes()
-        self.setup_respective_webhook_payload()
-        self.set_id_field_name()
-        self.set_source_doc()
+        self.profiler = OperationProfiler(
+            f"webhook:{self.payload['event']}",
+            self.config_name,
+            integration_request=integration_request,
+        )
+
+        with self.profiler.stage("setup"):
+            self.set_common_payload_attributes()
+            self.setup_respective_webhook_payload()
+            self.set_id_field_name()
+            self.set_source_docnames()
 
     def set_config_name(self):
         """
@@ -150,9 +193,9 @@ class RazorpayXWebhook:
 
         self.id_field = field_mapper[self.event_type]
 
-    def set_source_doc(self):
+    def set_source_docnames(self):
         """
-        Set the source doc.
+        Set the source docname without locking the doc.
 
         - Fetch last created Doc based on the id fields.
         - If not fetched by ID, find by source doctype and docname.
@@ -189,10 +232,70 @@ class RazorpayXWebhook:
         if not docnames:
             return
 
-        self.source_doc = frappe.get_doc(source_doctype, docnames[0], for_update=True)
+        self.set_source_doc_state(source_doctype, docnames[0])
         self.amended_docnames = docnames[1:]  # to avoid updating the same doc
 
+    def set_source_doc_state(self, doctype: str, docname: str):
+        """
+        Set the source docname and its current state (without lock).
+
+        :param doctype: Source Doctype.
+        :param docname: Source Docname.
+        """
+        fields = ["docstatus"]
+
+        if doctype == "Payment Entry":
+            fields.append("razorpayx_payout_status")
+
+        self.source_doctype = doctype
+        self.source_docname = docname
+        self.source_doc_state = (
+            frappe.db.get_value(doctype, docname, fields, as_dict=True)
+            or frappe._dict()
+        )
+
+    def set_source_doc(self):
+        """
+        Load and lock the source doc.
+
+        Note: ⚠️ Call only if the state of the doc will be changed.
+        """
+        if not self.source_docname:
+            return
+
+        self.source_doc = frappe.get_doc(
+            self.source_doctype, self.source_docname, for_update=True
+        )
+
     ### APIs ###
+    def process(self):
+        """
+        Process RazorpayX Webhook.
+
+        It is entry point for the webhook processing.
+
+        - Stale or duplicate events are dropped without locking the source doc.
+        - Source doc is locked and loaded only if the state will change.
+        """
+        with self.profiler:
+            if not self.has_state_change():
+                return
+
+            # includes the lock wait
+            with self.profiler.stage("set_source_doc"):
+                self.set_source_doc()
+
+            self.profiler.context["source_docname"] = self.source_docname
+            self.process_webhook()
+
+    def has_state_change(self) -> bool:
+        """
+        Cheap pre-check (without lock) whether the webhook will change the state.
+
+        Note: 🟢 Override this method in the sub class for custom pre-checks.
+        """
+        return bool(self.source_docname and self.source_doc_state)
+
     def process_webhook(self, *args, **kwargs):
         """
         Process RazorpayX Webhook.
@@ -226,18 +329,6 @@ class RazorpayXWebhook:
             },
         )
 
-    @staticmethod
-    def get_je(cheque_no: str, **filters) -> JournalEntry:
-        return frappe.get_doc(
-            "Journal Entry",
-            {
-                "is_system_generated": 1,
-                "docstatus": 1,
-                "cheque_no": cheque_no,
-                **filters,
-            },
-        )
-
     @staticmethod
     def get_formlink(doctype: str, docname: str, html: bool = False) -> str:
         return (
@@ -248,21 +339,14 @@ class RazorpayXWebhook:
 
     ### UTILITIES ###
     def create_je(self, **kwargs):
-        je = frappe.new_doc("Journal Entry")
-        je.update(
-            {
-                "voucher_type": "Journal Entry",
-                "is_system_generated": 1,
-                "company": self.source_doc.company,
-                "posting_date": self.get_posting_date(),
-                **kwargs,
-            }
-        )
+        return submit_journal_entry(self.get_je_values(**kwargs))
 
-        je.flags.skip_remarks_creation = True
-        je.submit()
-
-        return je
+    def get_je_values(self, **kwargs) -> dict:
+        return {
+            "company": self.source_doc.company,
+            "posting_date": self.get_posting_date(),
+            **kwargs,
+        }
 
     def get_posting_date(self):
         if created_at := self.payload_entity.get("created_at"):
@@ -343,12 +427,25 @@ class PayoutWebhook(RazorpayXWebhook):
     """
 
     ### APIs ###
+    def has_state_change(self) -> bool:
+        """
+        Payout status will move forward or fees JE is not created yet.
+        """
+        return bool(
+            super().has_state_change()
+            and self.source_doctype == "Payment Entry"
+            and (self.is_order_maintained() or self.is_fees_je_required())
+        )
+
     def process_webhook(self, *args, **kwargs):
         """
         Process RazorpayX Payout Related Webhooks.
         """
-        self.update_payment_entry()
-        self.create_journal_entry_for_fees()
+        with self.profiler.stage("update_payment_entry"):
+            self.update_payment_entry()
+
+        with self.profiler.stage("create_journal_entry_for_fees"):
+            self.create_journal_entry_for_fees()
 
     def update_payment_entry(self):
         """
@@ -396,6 +493,8 @@ class PayoutWebhook(RazorpayXWebhook):
         else:
             self.source_doc.update(value).save()
 
+        mark_payout_summary_stale([self.source_doc])
+
     def update_amended_pes(self, values: dict, status: str | None = None):
         """
         Update the amended payment entries.
@@ -444,25 +543,14 @@ class PayoutWebhook(RazorpayXWebhook):
 
             return fees_config.payable_account
 
-        if (
-            not self.source_doc
-            or not self.id
-            or self.status
-            not in [
-                PAYOUT_STATUS.PROCESSED.value,
-                PAYOUT_STATUS.PROCESSING.value,
-            ]
-        ):
+        # conditions to create JE
+        if not self.source_doc or not self.is_fees_je_required():
             return
 
-        fees = self.payload_entity.get("fees") or 0
+        fees = self.payload_entity["fees"]
         # !Note: fees is inclusive of tax and it is in paisa
         # Example: fees = 236 (2.36 INR) and tax = 36 (0.36 INR) => Charge = 200 (2 INR) | Tax = 36 (0.36 INR)
 
-        # conditions to create JE
-        if not fees or RazorpayXWebhook.je_exists(self.id):
-            return
-
         fees_config = get_fees_accounting_config(self.config_name)
 
         if not fees_config.automate_fees_accounting:
@@ -482,23 +570,28 @@ class PayoutWebhook(RazorpayXWebhook):
 
         fees = paisa_to_rupees(fees)
 
-        self.create_je(
-            accounts=[
-                {
-                    "account": fees_config.creditors_account,
-                    "party_type": "Supplier",
-                    "party": fees_config.supplier,
-                    "debit_in_account_currency": fees,
-                    "credit_in_account_currency": 0,
-                },
-                {
-                    "account": get_credit_account(fees_config),
-                    "debit_in_account_currency": 0,
-                    "credit_in_account_currency": fees,
-                },
-            ],
-            user_remark=self.get_je_remark(fees),
-            cheque_no=self.id,
+        # created in batches by the background job
+        defer_fee_journal_entry(
+            self.id,
+            self.source_doc.name,
+            self.get_je_values(
+                accounts=[
+                    {
+                        "account": fees_config.creditors_account,
+                        "party_type": "Supplier",
+                        "party": fees_config.supplier,
+                        "debit_in_account_currency": fees,
+                        "credit_in_account_currency": 0,
+                    },
+                    {
+                        "account": get_credit_account(fees_config),
+                        "debit_in_account_currency": 0,
+                        "credit_in_account_currency": fees,
+                    },
+                ],
+                user_remark=self.get_je_remark(fees),
+                cheque_no=self.id,
+            ),
         )
 
     ### UTILITIES ###
@@ -528,11 +621,31 @@ class PayoutWebhook(RazorpayXWebhook):
             and PAYOUT_ORDERS[self.status] > PAYOUT_ORDERS[self.get_pe_rpx_status()]
         )
 
+    def is_fees_je_required(self) -> bool:
+        """
+        Check if the fees JE can be created for the payout or not.
+
+        Note: Accounting configurations are checked while creating the JE.
+        """
+        return bool(
+            self.id
+            and self.status
+            in [
+                PAYOUT_STATUS.PROCESSED.value,
+                PAYOUT_STATUS.PROCESSING.value,
+            ]
+            and self.payload_entity.get("fees")
+            and not RazorpayXWebhook.je_exists(self.id)
+        )
+
     def get_pe_rpx_status(self) -> str:
         """
         Get the Payment Entry's RazorpayX Payout Status.
+
+        Note: Before locking, it is taken from the unlocked state of the doc.
         """
-        return self.source_doc.razorpayx_payout_status.lower()
+        source = self.source_doc or self.source_doc_state
+        return source.razorpayx_payout_status.lower()
 
     def get_utr_based_reference(self) -> dict:
         """
@@ -566,8 +679,10 @@ class PayoutWebhook(RazorpayXWebhook):
         if not self.id:
             return
 
-        if fees_je := RazorpayXWebhook.get_je(self.id):
-            fees_je.cancel()
+        discard_fee_journal_entry(self.id)
+
+        if fees_je := get_fee_journal_entry_name(self.id):
+            frappe.get_doc("Journal Entry", fees_je).cancel()
 
     def cancel_payout_link(self):
         """
@@ -610,11 +725,26 @@ class PayoutLinkWebhook(PayoutWebhook):
     """
 
     ### APIs ###
+    def has_state_change(self) -> bool:
+        """
+        Payout link is failed and Payment Entry is not marked failed or cancelled yet.
+        """
+        return bool(
+            RazorpayXWebhook.has_state_change(self)
+            and self.status
+            and is_payout_link_failed(self.status)
+            and (
+                self.get_pe_rpx_status() != PAYOUT_STATUS.FAILED.value
+                or self.source_doc_state.docstatus == 1
+            )
+        )
+
     def process_webhook(self, *args, **kwargs):
         """
         Process RazorpayX Payout Link Related Webhooks.
         """
-        self.handle_payout_link_failure()
+        with self.profiler.stage("handle_payout_link_failure"):
+            self.handle_payout_link_failure()
 
     def handle_payout_link_failure(self):
         """
@@ -676,7 +806,7 @@ class TransactionWebhook(PayoutWebhook):
             self.id = self.transaction_source.get("payout_id")
             self.status = PAYOUT_STATUS.REVERSED.value
 
-    def set_source_doc(self):
+    def set_source_docnames(self):
         """
         In transaction webhook `source_doctype` and `source_docname` are not available.
         """
@@ -697,9 +827,20 @@ class TransactionWebhook(PayoutWebhook):
         if not docnames:
             return
 
-        self.source_doc = frappe.get_doc(source_doctype, docnames[0], for_update=True)
+        self.set_source_doc_state(source_doctype, docnames[0])
 
     ### APIs ###
+    def has_state_change(self) -> bool:
+        """
+        Payout is reversed and reversal is not processed yet.
+        """
+        return bool(
+            RazorpayXWebhook.has_state_change(self)
+            and self.transaction_type == TRANSACTION_TYPE.REVERSAL.value
+            and self.status == PAYOUT_STATUS.REVERSED.value
+            and not RazorpayXWebhook.je_exists(self.reversal_id)
+        )
+
     def process_webhook(self, *args, **kwargs):
         """
         Process RazorpayX Payout Related Webhooks.
@@ -707,7 +848,8 @@ class TransactionWebhook(PayoutWebhook):
         if self.transaction_type != TRANSACTION_TYPE.REVERSAL.value:
             return
 
-        self.handle_payout_reversal()
+        with self.profiler.stage("handle_payout_reversal"):
+            self.handle_payout_reversal()
 
     def handle_payout_reversal(self):
         if not self.source_doc or self.status != PAYOUT_STATUS.REVERSED.value:
@@ -795,7 +937,7 @@ class TransactionWebhook(PayoutWebhook):
 
     def reverse_fees_je(self):
         # self.id is payout_id
-        fees_je = RazorpayXWebhook.je_exists(self.id)
+        fees_je = get_fee_journal_entry(self.id)
 
         if not fees_je:
             return
@@ -849,23 +991,12 @@ def webhook_listener():
     if not frappe.flags.razorpayx_webhook_authenticated:
         return
 
-    payload = frappe.local.form_dict
-    payload.pop("cmd")
+    payload = get_webhook_payload()
 
     if is_unsupported_event(payload):
         return
 
-    ## Log the webhook request ##
-    ir_log = {
-        "request_id": frappe.get_request_header("X-Razorpay-Event-Id"),
-        "status": "Completed",
-        "integration_request_service": f"RazorpayX - {payload.get('event')}",
-        "request_headers": dict(frappe.request.headers),
-        "data": payload,
-        "is_remote_request": True,
-    }
-
-    ir = log_integration_request(**ir_log)
+    ir = log_webhook_request(payload)
 
     ## Process the webhook ##
     frappe.enqueue(
@@ -879,22 +1010,79 @@ def process_webhook(payload: dict, integration_request: str):
     """
     Process the RazorpayX Webhook.
 
+    On failure, the transaction is rolled back (including the after-commit
+    callbacks of the processor) and the webhook is added to the dead-letter queue.
+
     :param payload: Webhook payload data.
     :param integration_request: Integration Request docname.
+
+    ---
+    Note: ⚠️ Commit the Integration Request (and any other work) before calling,
+    as the rollback discards all the uncommitted changes.
     """
 
     frappe.set_user("Administrator")
 
+    start = time.perf_counter()
+
     try:
-        # Getting the webhook processor based on the event type.
-        event_type = payload["event"].split(".")[0]  # `event` must exist in the payload
-        processor = WEBHOOK_PROCESSORS_MAP[event_type](payload, integration_request)
-        processor.process_webhook()
-    except Exception:
+        run_webhook_processor(payload, integration_request)
+        record_webhook_processing(
+            payload.get("event") or "", "success", time.perf_counter() - start
+        )
+    except Exception as e:
+        record_webhook_processing(
+            payload.get("event") or "", "error", time.perf_counter() - start
+        )
+
+        # partial changes are discarded to replay the webhook from a clean state
+        frappe.db.rollback()
+
         log_webhook_failure(integration_request, frappe.get_traceback())
+        add_to_dead_letter_queue(
+            payload,
+            integration_request,
+            e,
+            config=get_razorpayx_config(payload.get("account_id") or ""),
+        )
+
+
+def run_webhook_processor(payload: dict, integration_request: str):
+    """
+    Run the respective webhook processor based on the event type.
+
+    :param payload: Webhook payload data.
+    :param integration_request: Integration Request docname.
+
+    ---
+    Note: Errors are raised, use `process_webhook` to log the failures.
+    """
+    event_type = payload["event"].split(".")[0]  # `event` must exist in the payload
+    processor = WEBHOOK_PROCESSORS_MAP[event_type](payload, integration_request)
+    processor.process()
 
 
 ###### UTILITIES ######
+def log_webhook_request(payload: dict):
+    """
+    Log the webhook request in the Integration Request.
+
+    :param payload: Webhook payload data.
+    """
+    return log_integration_request(
+        request_id=frappe.get_request_header("X-Razorpay-Event-Id"),
+        status="Completed",
+        integration_request_service=f"RazorpayX - {payload.get('event')}",
+        request_headers={
+            header: frappe.get_request_header(header)
+            for header in WEBHOOK_LOG_HEADERS
+            if frappe.get_request_header(header)
+        },
+        data=payload,
+        is_remote_request=True,
+    )
+
+
 def is_unsupported_event(payload: dict) -> bool:
     if payload.get("event") not in SUPPORTED_EVENTS:
         return True
@@ -926,7 +1114,11 @@ def authenticate_webhook_request():
         log_webhook_authentication_failure("Signature Not Found")
         return
 
-    payload = frappe.local.form_dict
+    payload = get_webhook_payload()
+    if payload is None:
+        log_webhook_authentication_failure("Invalid Payload")
+        return
+
     if not payload.account_id:
         log_webhook_authentication_failure("Account ID Not Found in Payload")
         return
@@ -943,17 +1135,39 @@ def authenticate_webhook_request():
         log_webhook_authentication_failure("Webhook Secret Not Configured")
         return
 
-    if signature != get_expected_signature(secret):
+    # bytes, as `compare_digest` raises TypeError for non-ASCII strings
+    if not compare_digest(signature.encode(), get_expected_signature(secret).encode()):
         log_webhook_authentication_failure("Webhook Signature Mismatch")
         return
 
     return True
 
 
-def log_webhook_authentication_failure(reason: str):
-    payload = frappe.local.form_dict
-    payload.pop("cmd")
+def get_webhook_payload() -> frappe._dict | None:
+    """
+    Get the webhook payload parsed from the raw request body.
+
+    - Raw body is parsed only once per request and shared by authentication,
+    logging and processing.
+    - Returns `None` if the body is not a valid JSON object.
+    """
+    if frappe.flags.razorpayx_webhook_payload is not None:
+        return frappe.flags.razorpayx_webhook_payload or None
+
+    try:
+        payload = parse_json(frappe.request.data)
+    except ValueError:
+        payload = None
+
+    if not isinstance(payload, dict):
+        frappe.flags.razorpayx_webhook_payload = False
+        return
+
+    frappe.flags.razorpayx_webhook_payload = frappe._dict(payload)
+    return frappe.flags.razorpayx_webhook_payload
+
 
+def log_webhook_authentication_failure(reason: str):
     divider = f"\n\n{'-' * 25}\n\n"
     message = f"Reason: {reason}"
     message += divider
@@ -961,7 +1175,8 @@ def log_webhook_authentication_failure(reason: str):
         f"Request Headers:\n{frappe.as_json(dict(frappe.request.headers), indent=2)}"
     )
     message += divider
-    message += f"Request Body:\n{frappe.as_json(payload, indent=2) if payload else frappe.request.data}"
+    # raw body is logged as received, no need to parse and serialize it again
+    message += f"Request Body:\n{frappe.safe_decode(frappe.request.data)}"
 
     frappe.log_error(
         title=f"RazorpayX Webhook Authentication Failed: {reason}",
@@ -997,41 +1212,44 @@ def get_amended_docnames(doctype: str, docname: str) -> list[str] | None:
 
     :param doctype: Source Doctype.
     :param docname: Source Docname.
+
+    ---
+    Note: Whole amendment chain is resolved with a single recursive query,
+    so the cost is constant whatever the amendment depth.
     """
-    docstatus = frappe.db.get_value(
-        doctype,
-        docname,
-        "docstatus",
+    chain = frappe.db.sql(
+        f"""
+        WITH RECURSIVE amended_chain (name, docstatus, depth) AS (
+            SELECT name, docstatus, 0
+            FROM {get_table_name(doctype, wrap_in_backticks=True)}
+            WHERE name = %(docname)s
+
+            UNION ALL
+
+            SELECT amended.name, amended.docstatus, amended_chain.depth + 1
+            FROM {get_table_name(doctype, wrap_in_backticks=True)} amended
+            INNER JOIN amended_chain ON amended.amended_from = amended_chain.name
+            WHERE amended_chain.docstatus = 2
+        )
+        SELECT name, docstatus FROM amended_chain ORDER BY depth
+        """,
+        {"docname": docname},
+        as_dict=True,
     )
 
     # document does not exist
-    if docstatus is None:
+    if not chain:
         return
 
-    if docstatus != 2 or not frappe.db.exists(doctype, {"amended_from": docname}):
-        return [docname]
+    docnames = []
 
-    docnames = [docname]
+    # chain is walked until the first non cancelled (latest) document
+    for doc in chain:
+        docnames.insert(0, doc.name)
 
-    # document is cancelled and amended
-    while True:
-        amended = frappe.db.get_value(
-            doctype,
-            {"amended_from": docname},
-            ["name", "docstatus"],
-            as_dict=True,
-        )
-
-        if not amended:
-            break
-
-        if amended.docstatus != 2:
-            docnames.insert(0, amended.name)
+        if doc.docstatus != 2:
             break
 
-        docname = amended.name
-        docnames.insert(0, docname)
-
     return docnames
 
 
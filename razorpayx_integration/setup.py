@@ -15,6 +15,7 @@ from razorpayx_integration.razorpayx_integration.constants.custom_fields import
     CUSTOM_FIELDS,
     PROCESSOR_FIELDS,
 )
+from razorpayx_integration.razorpayx_integration.constants.indexes import INDEXES
 from razorpayx_integration.razorpayx_integration.constants.property_setters import (
     PROPERTY_SETTERS,
 )
@@ -39,6 +40,9 @@ def setup_customizations():
     click.secho("Creating Property Setters...", fg="blue")
     create_property_setters()
 
+    click.secho("Creating Indexes...", fg="blue")
+    create_indexes()
+
 
 # Note: separate functions are required to use in patches
 def create_roles_and_permissions():
@@ -58,6 +62,12 @@ def create_payments_processor_custom_fields():
     make_custom_fields(PROCESSOR_FIELDS)
 
 
+def create_indexes():
+    for doctype, indexes in INDEXES.items():
+        for index_name, fields in indexes.items():
+            frappe.db.add_index(doctype, fields, index_name)
+
+
 ################### Before Uninstall ###################
 def delete_customizations():
     click.secho("Deleting Custom Fields...", fg="blue")
@@ -72,6 +82,9 @@ def delete_customizations():
     click.secho("Deleting Property Setters...", fg="blue")
     delete_property_setters(PROPERTY_SETTERS)
 
+    click.secho("Deleting Indexes...", fg="blue")
+    delete_indexes()
+
     click.secho("Deleting Roles and Permissions...", fg="blue")
     delete_roles_and_permissions(ROLES)
 
@@ -79,3 +92,17 @@ def delete_customizations():
 # Note: separate functions are required to use in patches
 def delete_payments_processor_custom_fields():
     delete_custom_fields(PROCESSOR_FIELDS)
+
+
+def delete_indexes():
+    for doctype, indexes in INDEXES.items():
+        table = f"tab{doctype}"
+
+        for index_name in indexes:
+            if not frappe.db.has_index(table, index_name):
+                continue
+
+            if frappe.db.db_type == "postgres":
+                frappe.db.sql_ddl(f'DROP INDEX IF EXISTS "{index_name}"')
+            else:
+                frappe.db.sql_ddl(f"ALTER TABLE `{table}` DROP INDEX `{index_name}`")